@@ -1,8 +1,8 @@
-from sqlalchemy import Table, Column, Integer, String, func, MetaData
+from sqlalchemy import Table, Column, Index, Integer, String, func, MetaData
 from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import registry
 
-from app.domain.auth.models import User
+from app.domain.auth.models import User, RevokedToken
 
 metadata = MetaData()
 mapper_registry = registry(metadata=metadata)
@@ -26,13 +26,31 @@ users = Table(
         server_default=func.now(),
         nullable=False,
     ),
-    Column("email", String, index=True, nullable=False),
+    Column("email", String, nullable=False),
     Column("password", String, nullable=False),
     Column("username", String(50), nullable=False),
     Column("last_name", String(30), nullable=False),
     Column("first_name", String(30), nullable=False),
 )
+# Emails are matched case-insensitively, and signup relies on this index for ON CONFLICT
+Index("ix_users_email_lower", func.lower(users.c.email), unique=True)
+
+revoked_tokens = Table(
+    "revoked_tokens",
+    mapper_registry.metadata,
+    Column("jti", String(32), primary_key=True),
+    Column("expires_at", sqlite.TIMESTAMP(timezone=True), nullable=False, index=True),
+    Column(
+        "revoked_at",
+        sqlite.TIMESTAMP(timezone=True),
+        default=func.now(),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    ),
+)
 
 
 def start_mappers():
     mapper_registry.map_imperatively(User, users)
+    mapper_registry.map_imperatively(RevokedToken, revoked_tokens)
@@ -1,8 +1,10 @@
+import datetime
 from abc import ABCMeta, abstractmethod
-from typing import TypeVar
-from sqlalchemy import select
+from typing import TypeVar, Sequence
+from sqlalchemy import select, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.adapters import dialect
 from app.domain.auth import models as auth_models
 
 
@@ -39,7 +41,7 @@ class UserRepository(AbstractRepository):
         return await self._get_user_by_email(email)
     
     async def _get_user_by_email(self, email: str) -> auth_models.User:
-        stmt = select(auth_models.User).where(auth_models.User.email == email)
+        stmt = select(auth_models.User).where(func.lower(auth_models.User.email) == email.lower())
         q = await self.session.execute(stmt)
         return q.scalar()
 
@@ -49,4 +51,70 @@ class UserRepository(AbstractRepository):
     async def _create_user(self, user: auth_models.User) -> auth_models.User:
         self.session.add(user)
         await self.session.commit()
-        return user
\ No newline at end of file
+        return user
+
+    async def create_user_if_email_not_exists(self, user: auth_models.User) -> auth_models.User | None:
+        return await self._create_user_if_email_not_exists(user)
+
+    async def _create_user_if_email_not_exists(self, user: auth_models.User) -> auth_models.User | None:
+        insert = dialect.get_insert(self.session)
+        stmt = (
+            insert(auth_models.User)
+            .values(
+                email=user.email,
+                password=user.password,
+                username=user.username,
+                last_name=user.last_name,
+                first_name=user.first_name,
+            )
+            .on_conflict_do_nothing(index_elements=[func.lower(auth_models.User.email)])
+            .returning(auth_models.User)
+        )
+        q = await self.session.execute(stmt)
+        created_user = q.scalar()
+        await self.session.commit()
+        return created_user
+
+
+class RevokedTokenRepository(AbstractRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _add(self, model):
+        self.session.add(model)
+
+    def _add_all(self, models):
+        self.session.add_all(models)
+
+    async def is_revoked(self, jti: str) -> bool:
+        return await self._is_revoked(jti)
+
+    async def _is_revoked(self, jti: str) -> bool:
+        q = await self.session.execute(
+            select(auth_models.RevokedToken.jti).where(auth_models.RevokedToken.jti == jti)
+        )
+        return q.scalar() is not None
+
+    async def revoke_tokens(self, revoked_tokens: Sequence[auth_models.RevokedToken]) -> None:
+        return await self._revoke_tokens(revoked_tokens)
+
+    async def _revoke_tokens(self, revoked_tokens: Sequence[auth_models.RevokedToken]) -> None:
+        for revoked_token in revoked_tokens:
+            await self.session.merge(revoked_token)
+        await self.session.commit()
+
+    async def get_revoked_tokens_since(
+        self, revoked_at: datetime.datetime | None
+    ) -> Sequence[auth_models.RevokedToken]:
+        stmt = select(auth_models.RevokedToken).where(auth_models.RevokedToken.expires_at > func.now())
+        if revoked_at:
+            stmt = stmt.where(auth_models.RevokedToken.revoked_at > revoked_at)
+        q = await self.session.execute(stmt)
+        return q.scalars().all()
+
+    async def delete_expired_revoked_tokens(self) -> int:
+        q = await self.session.execute(
+            delete(auth_models.RevokedToken).where(auth_models.RevokedToken.expires_at <= func.now())
+        )
+        await self.session.commit()
+        return q.rowcount
@@ -0,0 +1,90 @@
+import asyncio
+import datetime
+import time
+from collections import OrderedDict
+from functools import cache
+
+from app import settings
+from app.adapters.auth.repository import RevokedTokenRepository
+from app.utils.bloom_filter import BloomFilter
+
+
+class RevocationFilter:
+    """Per-worker mirror of the `revoked_tokens` table
+
+    A token that misses the Bloom filter is known not to be revoked without touching the database.
+    Hits are confirmed against the exact set of recent revocations and, failing that, the database.
+    """
+
+    # Rows committed out of revoked_at order are still picked up by re-reading a short window
+    SYNC_OVERLAP = datetime.timedelta(seconds=5)
+
+    def __init__(self, capacity: int, error_rate: float, recent_size: int, sync_interval: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.recent_size = recent_size
+        self.sync_interval = sync_interval
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._watermark: datetime.datetime | None = None
+        self._synced_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def add(self, jti: str) -> None:
+        if jti in self._recent:
+            self._recent.move_to_end(jti)
+            return
+
+        self._bloom.add(jti)
+        self._recent[jti] = None
+        while len(self._recent) > self.recent_size:
+            self._recent.popitem(last=False)
+
+    def _is_stale(self) -> bool:
+        return self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_interval
+
+    def _reset(self, capacity: int) -> None:
+        self._bloom = BloomFilter(max(self.capacity, capacity), self.error_rate)
+        self._recent.clear()
+        self._watermark = None
+
+    async def sync(self, repository: RevokedTokenRepository, force: bool = False) -> None:
+        if not (force or self._is_stale()):
+            return
+
+        async with self._lock:
+            if not (force or self._is_stale()):
+                return
+
+            if self._bloom.is_saturated:
+                # Expired revocations are not in the full reload, so rebuilding also drops them
+                self._reset(capacity=self._bloom.count * 2)
+
+            since = self._watermark - self.SYNC_OVERLAP if self._watermark else None
+            for revoked_token in await repository.get_revoked_tokens_since(since):
+                self.add(revoked_token.jti)
+                if self._watermark is None or revoked_token.revoked_at > self._watermark:
+                    self._watermark = revoked_token.revoked_at
+
+            self._synced_at = time.monotonic()
+
+    async def is_revoked(self, jti: str, repository: RevokedTokenRepository) -> bool:
+        await self.sync(repository)
+
+        if jti not in self._bloom:
+            return False
+        if jti in self._recent:
+            return True
+
+        return await repository.is_revoked(jti)
+
+
+@cache
+def get_revocation_filter() -> RevocationFilter:
+    auth_settings = settings.AUTH_SETTINGS
+    return RevocationFilter(
+        capacity=auth_settings.REVOCATION_FILTER_CAPACITY,
+        error_rate=auth_settings.REVOCATION_FILTER_ERROR_RATE,
+        recent_size=auth_settings.REVOCATION_RECENT_SIZE,
+        sync_interval=auth_settings.REVOCATION_SYNC_INTERVAL,
+    )
@@ -0,0 +1,39 @@
+from sqlalchemy import text, literal, any_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def get_insert(session: AsyncSession):
+    """`insert` of the session's dialect, for ON CONFLICT support on both Postgres and SQLite"""
+    return postgresql.insert if session.bind.dialect.name == "postgresql" else sqlite.insert
+
+
+def get_in_condition(session: AsyncSession, column, values: list):
+    """`column IN values`, bound as a single array parameter on Postgres
+
+    `= ANY(:values)` keeps one statement text whatever the number of values, so its prepared plan is reused;
+    SQLite has no arrays and gets an expanding IN instead.
+    """
+    if session.bind.dialect.name == "postgresql":
+        return column == any_(literal(list(values), postgresql.ARRAY(column.type)))
+    return column.in_(values)
+
+
+async def get_estimated_row_count(session: AsyncSession, table: str) -> int:
+    """Planner estimate of the rows of `table` (summed over its partitions), without scanning it
+
+    Postgres keeps `reltuples` current through VACUUM/ANALYZE; SQLite has no equivalent, so it counts.
+    """
+    if session.bind.dialect.name != "postgresql":
+        q = await session.execute(text(f"SELECT count(*) FROM {table}"))
+        return q.scalar()
+
+    q = await session.execute(
+        text(
+            "SELECT coalesce(sum(greatest(c.reltuples, 0)), 0)::bigint FROM pg_class c "
+            "WHERE c.oid = to_regclass(:table) "
+            "OR c.oid IN (SELECT i.inhrelid FROM pg_inherits i WHERE i.inhparent = to_regclass(:table))"
+        ),
+        dict(table=table),
+    )
+    return q.scalar()
@@ -0,0 +1,30 @@
+from sqlalchemy import Table, Column, Integer, LargeBinary, String, func, MetaData
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import registry
+
+from app.domain.idempotency.models import IdempotencyKey
+
+metadata = MetaData()
+mapper_registry = registry(metadata=metadata)
+
+idempotency_keys = Table(
+    "idempotency_keys",
+    mapper_registry.metadata,
+    Column("user_id", Integer, primary_key=True, autoincrement=False),
+    Column("key", String(255), primary_key=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("status_code", Integer, nullable=True),
+    Column("body", LargeBinary, nullable=True),
+    Column("expires_at", sqlite.TIMESTAMP(timezone=True), nullable=False, index=True),
+    Column(
+        "created_at",
+        sqlite.TIMESTAMP(timezone=True),
+        default=func.now(),
+        server_default=func.now(),
+        nullable=False,
+    ),
+)
+
+
+def start_mappers():
+    mapper_registry.map_imperatively(IdempotencyKey, idempotency_keys)
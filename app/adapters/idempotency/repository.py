@@ -0,0 +1,104 @@
+import datetime
+from abc import ABCMeta, abstractmethod
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters import dialect
+from app.domain.idempotency import models as idempotency_models
+
+
+class AbstractRepository(metaclass=ABCMeta):
+    def add(self, model):
+        self._add(model)
+
+    def add_all(self, models):
+        self._add_all(models)
+
+    @abstractmethod
+    def _add(self, model):
+        ...
+
+    @abstractmethod
+    def _add_all(self, models):
+        ...
+
+
+class IdempotencyKeyRepository(AbstractRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _add(self, model):
+        self.session.add(model)
+
+    def _add_all(self, models):
+        self.session.add_all(models)
+
+    async def claim(
+        self, user_id: int, key: str, fingerprint: str, expires_at: datetime.datetime, now: datetime.datetime
+    ) -> bool:
+        """Holds the key for a request until `expires_at`; False while another request holds or completed it
+
+        A key whose record expired, whether completed or abandoned by a lost worker, is claimed again.
+        """
+        IdempotencyKey = idempotency_models.IdempotencyKey
+        insert = dialect.get_insert(self.session)
+        stmt = insert(IdempotencyKey).values(
+            user_id=user_id, key=key, fingerprint=fingerprint, expires_at=expires_at
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "key"],
+            set_=dict(
+                fingerprint=stmt.excluded.fingerprint,
+                status_code=None,
+                body=None,
+                expires_at=stmt.excluded.expires_at,
+            ),
+            where=IdempotencyKey.expires_at <= now,
+        )
+        q = await self.session.execute(stmt.returning(IdempotencyKey.user_id))
+        claimed = q.first() is not None
+        await self.session.commit()
+        return claimed
+
+    async def get(self, user_id: int, key: str) -> idempotency_models.IdempotencyKey | None:
+        IdempotencyKey = idempotency_models.IdempotencyKey
+        q = await self.session.execute(
+            select(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .execution_options(populate_existing=True)
+        )
+        return q.scalar()
+
+    async def complete(
+        self, user_id: int, key: str, status_code: int, body: bytes, expires_at: datetime.datetime
+    ) -> None:
+        IdempotencyKey = idempotency_models.IdempotencyKey
+        await self.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            .values(status_code=status_code, body=body, expires_at=expires_at)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+    async def release(self, user_id: int, key: str) -> None:
+        # Failed requests leave no record, so that they can be retried with the same key
+        IdempotencyKey = idempotency_models.IdempotencyKey
+        await self.session.execute(
+            delete(IdempotencyKey)
+            .where(
+                IdempotencyKey.user_id == user_id, IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+    async def delete_expired_idempotency_keys(self, now: datetime.datetime) -> int:
+        IdempotencyKey = idempotency_models.IdempotencyKey
+        q = await self.session.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.expires_at <= now)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return q.rowcount
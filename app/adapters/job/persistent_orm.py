@@ -0,0 +1,47 @@
+from sqlalchemy import Table, Column, Index, Integer, String, Text, func, MetaData
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import registry
+
+from app.domain.job.models import Job
+
+metadata = MetaData()
+mapper_registry = registry(metadata=metadata)
+
+jobs = Table(
+    "jobs",
+    mapper_registry.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column(
+        "created_at",
+        postgresql.TIMESTAMP(timezone=True),
+        default=func.now(),
+        server_default=func.now(),
+        nullable=False,
+    ),
+    Column(
+        "updated_at",
+        postgresql.TIMESTAMP(timezone=True),
+        default=func.now(),
+        onupdate=func.current_timestamp(),
+        server_default=func.now(),
+        nullable=False,
+    ),
+    Column("name", String(128), nullable=False),
+    Column("payload", postgresql.JSONB, nullable=False),
+    Column("queue", String(64), nullable=False),
+    Column("status", String(16), nullable=False),
+    Column("attempts", Integer, nullable=False),
+    Column("max_attempts", Integer, nullable=False),
+    Column("run_at", postgresql.TIMESTAMP(timezone=True), nullable=False),
+    Column("locked_at", postgresql.TIMESTAMP(timezone=True), nullable=True),
+    Column("last_error", Text, nullable=True),
+    Column("schedule_key", String(192), nullable=True),
+)
+# Dequeueing scans the jobs of one queue and status in run_at order
+Index("ix_jobs_queue_status_run_at", jobs.c.queue, jobs.c.status, jobs.c.run_at)
+# Workers all queue the recurring jobs; the key lets one insert of each run land
+Index("ux_jobs_schedule_key", jobs.c.schedule_key, unique=True)
+
+
+def start_mappers():
+    mapper_registry.map_imperatively(Job, jobs)
@@ -0,0 +1,135 @@
+import datetime
+from abc import ABCMeta, abstractmethod
+from typing import Sequence
+from sqlalchemy import select, update, delete, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters import dialect
+from app.domain.job import models as job_models
+from app.domain.job.models import JobStatus
+
+
+class AbstractRepository(metaclass=ABCMeta):
+    def add(self, model):
+        self._add(model)
+
+    def add_all(self, models):
+        self._add_all(models)
+
+    @abstractmethod
+    def _add(self, model):
+        ...
+
+    @abstractmethod
+    def _add_all(self, models):
+        ...
+
+
+class JobRepository(AbstractRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _add(self, model):
+        # Jobs added without `enqueue` are committed with the caller's own changes, or not at all
+        self.session.add(model)
+
+    def _add_all(self, models):
+        self.session.add_all(models)
+
+    async def get(self, id: int) -> job_models.Job:
+        q = await self.session.execute(select(job_models.Job).where(job_models.Job.id == id))
+        return q.scalar()
+
+    async def enqueue(self, job: job_models.Job) -> job_models.Job:
+        self.session.add(job)
+        await self.session.commit()
+        return job
+
+    async def schedule(self, jobs: Sequence[job_models.Job]) -> int:
+        """Queues the jobs whose schedule_key isn't taken yet; returns how many were queued"""
+        if not jobs:
+            return 0
+        insert = dialect.get_insert(self.session)
+        stmt = insert(job_models.Job).values(
+            [
+                dict(
+                    name=job.name,
+                    payload=job.payload,
+                    queue=job.queue,
+                    status=job.status,
+                    attempts=job.attempts,
+                    max_attempts=job.max_attempts,
+                    run_at=job.run_at,
+                    schedule_key=job.schedule_key,
+                )
+                for job in jobs
+            ]
+        )
+        q = await self.session.execute(stmt.on_conflict_do_nothing(index_elements=["schedule_key"]))
+        await self.session.commit()
+        return q.rowcount
+
+    async def dequeue(self, queue: str, limit: int, lock_timeout: int) -> Sequence[job_models.Job]:
+        return await self._dequeue(queue, limit, lock_timeout)
+
+    async def _dequeue(self, queue: str, limit: int, lock_timeout: int) -> Sequence[job_models.Job]:
+        # Claims due jobs in one statement. On Postgres, SKIP LOCKED lets concurrent workers claim disjoint rows
+        # without waiting on each other; SQLite ignores FOR UPDATE, but serializes writers anyway.
+        # Running jobs whose lock is older than `lock_timeout` are presumed lost with their worker and claimed again
+        Job = job_models.Job
+        now = job_models.utcnow()
+        candidates = (
+            select(Job.id)
+            .where(
+                Job.queue == queue,
+                or_(
+                    and_(Job.status == JobStatus.QUEUED.value, Job.run_at <= now),
+                    and_(
+                        Job.status == JobStatus.RUNNING.value,
+                        Job.locked_at < now - datetime.timedelta(seconds=lock_timeout),
+                    ),
+                ),
+            )
+            .order_by(Job.run_at, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        q = await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(candidates))
+            .values(status=JobStatus.RUNNING.value, locked_at=now, attempts=Job.attempts + 1)
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = q.scalars().all()
+        await self.session.commit()
+        return sorted(jobs, key=lambda j: (j.run_at, j.id))
+
+    async def complete_job(self, job: job_models.Job) -> bool:
+        return await self._finish_job(job, status=JobStatus.SUCCEEDED.value, last_error=None)
+
+    async def fail_job(self, job: job_models.Job, error: str, retry_at: datetime.datetime | None) -> bool:
+        if retry_at is None:
+            return await self._finish_job(job, status=JobStatus.FAILED.value, last_error=error)
+        return await self._finish_job(job, status=JobStatus.QUEUED.value, last_error=error, run_at=retry_at)
+
+    async def _finish_job(self, job: job_models.Job, **values) -> bool:
+        # `locked_at` identifies the claim: a run that outlived its lock must not overwrite the run that replaced it
+        q = await self.session.execute(
+            update(job_models.Job)
+            .where(job_models.Job.id == job.id, job_models.Job.locked_at == job.locked_at)
+            .values(locked_at=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return q.rowcount > 0
+
+    async def delete_finished_jobs(self, before: datetime.datetime) -> int:
+        q = await self.session.execute(
+            delete(job_models.Job).where(
+                job_models.Job.status.in_([JobStatus.SUCCEEDED.value, JobStatus.FAILED.value]),
+                job_models.Job.updated_at < before,
+            )
+        )
+        await self.session.commit()
+        return q.rowcount
@@ -0,0 +1,20 @@
+from typing import Sequence
+from sqlalchemy import ColumnElement, literal, tuple_
+
+
+def get_keyset_condition(columns: Sequence, values: Sequence, descending: bool) -> ColumnElement[bool]:
+    """Rows after `values` in (columns) order, as one row-value comparison
+
+    `(a, b) < (:a, :b)` is a single range condition on a composite index, unlike the equivalent
+    `a < :a OR (a = :a AND b < :b)` which planners often can't turn into one index scan.
+    """
+    if len(columns) == 1:
+        return columns[0] < values[0] if descending else columns[0] > values[0]
+
+    left = tuple_(*columns)
+    right = tuple_(*(literal(value, column.type) for column, value in zip(columns, values)))
+    return left < right if descending else left > right
+
+
+def get_keyset_order_by(columns: Sequence, descending: bool) -> list:
+    return [column.desc() if descending else column.asc() for column in columns]
@@ -0,0 +1,91 @@
+import threading
+import time
+import zlib
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+
+
+class AbstractBucketStore(metaclass=ABCMeta):
+    async def consume(self, key: str, capacity: int, refill_rate: float, cost: float = 1) -> float:
+        """Take `cost` tokens from the bucket at `key`
+
+        Returns 0 when the tokens were taken, otherwise the seconds until enough tokens are refilled.
+        """
+        return await self._consume(key, capacity, refill_rate, cost)
+
+    @abstractmethod
+    async def _consume(self, key: str, capacity: int, refill_rate: float, cost: float) -> float:
+        ...
+
+
+class InProcessBucketStore(AbstractBucketStore):
+    """Token buckets in worker memory, sharded by key so that each lock guards only a slice of the keys
+
+    Each shard keeps at most `max_keys_per_shard` buckets and drops the least recently used one beyond that.
+    """
+
+    def __init__(self, shards: int = 16, max_keys_per_shard: int = 10_000):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards: list[OrderedDict[str, tuple[float, float]]] = [OrderedDict() for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def _get_shard_index(self, key: str) -> int:
+        return zlib.crc32(key.encode()) % len(self._shards)
+
+    async def _consume(self, key: str, capacity: int, refill_rate: float, cost: float) -> float:
+        index = self._get_shard_index(key)
+        shard = self._shards[index]
+        now = time.monotonic()
+
+        with self._locks[index]:
+            tokens, updated_at = shard.get(key) or (capacity, now)
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            if tokens >= cost:
+                shard[key] = (tokens - cost, now)
+                retry_after = 0.0
+            else:
+                shard[key] = (tokens, now)
+                retry_after = (cost - tokens) / refill_rate
+
+            shard.move_to_end(key)
+            while len(shard) > self.max_keys_per_shard:
+                shard.popitem(last=False)
+
+        return retry_after
+
+
+class RedisBucketStore(AbstractBucketStore):
+    """Token buckets shared by every worker, updated atomically by a Lua script"""
+
+    SCRIPT = """
+    local capacity, refill_rate, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local now = redis.call('TIME')
+    now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated_at) * refill_rate)
+    local retry_after = 0
+    if tokens >= cost then
+        tokens = tokens - cost
+    else
+        retry_after = (cost - tokens) / refill_rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill_rate))
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the `redis` package is not installed") from e
+
+        self._client = aioredis.from_url(url)
+        self._script = self._client.register_script(self.SCRIPT)
+
+    async def _consume(self, key: str, capacity: int, refill_rate: float, cost: float) -> float:
+        retry_after = await self._script(keys=[f"rate_limit:{key}"], args=[capacity, refill_rate, cost])
+        return float(retry_after)
@@ -0,0 +1,28 @@
+from sqlalchemy import Table, Column, Integer, String, func, MetaData
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import registry
+
+from app.domain.shard.models import UserShard
+
+metadata = MetaData()
+mapper_registry = registry(metadata=metadata)
+
+user_shards = Table(
+    "user_shards",
+    mapper_registry.metadata,
+    Column("user_id", Integer, primary_key=True, autoincrement=False),
+    Column("shard", String(64), nullable=False),
+    Column("moving_to", String(64), nullable=True),
+    Column(
+        "updated_at",
+        postgresql.TIMESTAMP(timezone=True),
+        default=func.now(),
+        onupdate=func.current_timestamp(),
+        server_default=func.now(),
+        nullable=False,
+    ),
+)
+
+
+def start_mappers():
+    mapper_registry.map_imperatively(UserShard, user_shards)
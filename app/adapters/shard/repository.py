@@ -0,0 +1,73 @@
+from abc import ABCMeta, abstractmethod
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adapters import dialect
+from app.domain.shard import models as shard_models
+
+
+class AbstractRepository(metaclass=ABCMeta):
+    def add(self, model):
+        self._add(model)
+
+    def add_all(self, models):
+        self._add_all(models)
+
+    @abstractmethod
+    def _add(self, model):
+        ...
+
+    @abstractmethod
+    def _add_all(self, models):
+        ...
+
+
+class UserShardRepository(AbstractRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _add(self, model):
+        self.session.add(model)
+
+    def _add_all(self, models):
+        self.session.add_all(models)
+
+    async def get(self, user_id: int) -> tuple[str, str | None] | None:
+        """(shard, moving_to) of the user, or None if the user was never placed"""
+        UserShard = shard_models.UserShard
+        q = await self.session.execute(
+            select(UserShard.shard, UserShard.moving_to).where(UserShard.user_id == user_id)
+        )
+        row = q.first()
+        return tuple(row) if row else None
+
+    async def place(self, user_id: int, shard: str) -> tuple[str, str | None]:
+        # Concurrent first requests of a user race to place it; the first one wins and the others read its shard
+        UserShard = shard_models.UserShard
+        insert = dialect.get_insert(self.session)
+        await self.session.execute(
+            insert(UserShard).values(user_id=user_id, shard=shard).on_conflict_do_nothing(index_elements=["user_id"])
+        )
+        await self.session.commit()
+        return await self.get(user_id)
+
+    async def start_move(self, user_id: int, to: str) -> bool:
+        # Only one move of a user at a time
+        return await self._update(user_id, dict(moving_to=to), shard_models.UserShard.moving_to.is_(None))
+
+    async def finish_move(self, user_id: int, to: str) -> bool:
+        return await self._update(user_id, dict(shard=to, moving_to=None), shard_models.UserShard.moving_to == to)
+
+    async def cancel_move(self, user_id: int, to: str) -> bool:
+        return await self._update(user_id, dict(moving_to=None), shard_models.UserShard.moving_to == to)
+
+    async def _update(self, user_id: int, values: dict, condition) -> bool:
+        UserShard = shard_models.UserShard
+        q = await self.session.execute(
+            update(UserShard)
+            .where(UserShard.user_id == user_id, condition)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        return q.rowcount > 0
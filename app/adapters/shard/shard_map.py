@@ -0,0 +1,61 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+
+from app import settings
+from app.db import get_shard_names
+from app.adapters.shard.repository import UserShardRepository
+
+
+def get_default_shard(user_id: int) -> str:
+    # Only decides where a user is placed first; placements are recorded, so adding shards moves nobody
+    shards = settings.SHARD_SETTINGS.SHARD_NEW_USERS or get_shard_names()
+    return shards[user_id % len(shards)]
+
+
+def get_origin_shard(id: int) -> str | None:
+    """Shard whose sequences issued `id`; the row is still there unless its user was moved since"""
+    shards = get_shard_names()
+    offset = id % settings.SHARD_SETTINGS.SHARD_ID_STRIDE
+    return shards[offset] if offset < len(shards) else None
+
+
+class ShardMap:
+    """user_id -> (shard, moving_to), read from user_shards and kept for `ttl` seconds
+
+    A user is placed on its default shard on first lookup. Moves are announced through `moving_to`
+    at least `ttl` seconds before any row is copied, so no worker keeps routing the user to the old shard.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[int, tuple[tuple[str, str | None], float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, user_id: int, repository: UserShardRepository) -> tuple[str, str | None]:
+        with self._lock:
+            if (entry := self._entries.get(user_id)) is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return entry[0]
+
+        if (user_shard := await repository.get(user_id)) is None:
+            user_shard = await repository.place(user_id, get_default_shard(user_id))
+
+        with self._lock:
+            self._entries[user_id] = (user_shard, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return user_shard
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+@cache
+def get_shard_map() -> ShardMap:
+    shard_settings = settings.SHARD_SETTINGS
+    return ShardMap(ttl=shard_settings.SHARD_MAP_CACHE_TTL, maxsize=shard_settings.SHARD_MAP_CACHE_SIZE)
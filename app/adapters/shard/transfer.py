@@ -0,0 +1,60 @@
+"""Copy and delete all the rows of a user, to move them from one shard to another
+
+Every user-owned table hangs off todo_repos.user_id. Rows keep their ids, which the interleaved sequences
+of the shards keep unique across shards. Generated columns are recomputed by the target.
+"""
+from sqlalchemy import Table, delete, insert, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.todo import models as todo_models
+
+
+BATCH_SIZE = 1000
+
+# Parents before children; deleted in reverse
+USER_MODELS = [
+    todo_models.TodoRepo,
+    todo_models.TodoRepoCount,
+    todo_models.TodoRepoPeriodStats,
+    todo_models.TodoRepoWeekdayStats,
+    todo_models.DailyTodo,
+    todo_models.DailyTodoTask,
+    todo_models.DailyTodoArchive,
+    todo_models.DailyTodoArchiveTask,
+]
+
+
+def _get_condition(table: Table, user_id: int):
+    if "user_id" in table.c:
+        return table.c.user_id == user_id
+    todo_repo_ids = select(todo_models.TodoRepo.id).where(todo_models.TodoRepo.user_id == user_id)
+    return table.c.todo_repo_id.in_(todo_repo_ids)
+
+
+async def copy_user_data(source: AsyncSession, target: AsyncSession, user_id: int) -> dict[str, int]:
+    """Copies the rows of the user from `source` into `target`, replacing whatever `target` had of them
+
+    Nothing is committed, so the caller commits `target` once everything is there.
+    """
+    await delete_user_data(target, user_id)
+
+    copied = {}
+    for model in USER_MODELS:
+        table = inspect(model).local_table
+        columns = [c for c in table.c if c.computed is None]
+        result = await source.stream(select(*columns).where(_get_condition(table, user_id)))
+        copied[table.name] = 0
+        async for rows in result.partitions(BATCH_SIZE):
+            await target.execute(insert(table), [dict(row._mapping) for row in rows])
+            copied[table.name] += len(rows)
+    return copied
+
+
+async def delete_user_data(session: AsyncSession, user_id: int) -> dict[str, int]:
+    # Uncommitted, like `copy_user_data`. todo_repos goes last, since the other tables are matched through it
+    deleted = {}
+    for model in reversed(USER_MODELS):
+        table = inspect(model).local_table
+        q = await session.execute(delete(table).where(_get_condition(table, user_id)))
+        deleted[table.name] = q.rowcount
+    return deleted
@@ -0,0 +1,236 @@
+"""Log of the statements slower than SLOW_QUERY_THRESHOLD
+
+Cursor execution hooks time every statement of an engine. Slow ones are aggregated per normalized statement
+(literals and bound parameters replaced by `?`) along with the shapes of their parameters and the app code they
+were run from, in a bounded per-worker table. The first slow run of a statement can also be EXPLAINed, on its own
+cursor of the same connection, so that the plan matches the data the statement ran against.
+"""
+import datetime
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+from types import FrameType
+
+import greenlet
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app import settings
+
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = str(Path(__file__).resolve().parents[1])
+MAX_STATEMENT_LENGTH = 2000
+OTHER = "(other)"
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|%s|\b\d+(?:\.\d+)?\b")
+_REPEATED_GROUPS = re.compile(r"(\([^()]*\))(?:\s*,\s*\1)+")
+_REPEATED_PARAMETERS = re.compile(r"\?((?:::\w+(?:\[\])?)?)(?:\s*,\s*\?\1)+")  # asyncpg casts them, as in $1::INTEGER
+
+
+def normalize_statement(statement: str) -> str:
+    """`SELECT * FROM t WHERE id IN ($1, $2) AND title = 'a'` -> `SELECT * FROM t WHERE id IN (?, ...) AND title = ?`"""
+    statement = " ".join(statement.split())
+    statement = _LITERALS.sub("?", statement)
+    statement = _REPEATED_PARAMETERS.sub(r"?\1, ...", statement)
+    statement = _REPEATED_GROUPS.sub(r"\1, ...", statement)
+    return statement[:MAX_STATEMENT_LENGTH]
+
+
+def get_value_shape(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def get_parameter_shape(parameters, executemany: bool = False) -> str:
+    """Types of the bound parameters, e.g. `(int, str, list[3])`; `3 x (...)` for an executemany"""
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {get_parameter_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        return "(" + ", ".join(f"{name}: {get_value_shape(value)}" for name, value in parameters.items()) + ")"
+    return "(" + ", ".join(get_value_shape(value) for value in parameters or ()) + ")"
+
+
+def get_call_site() -> str | None:
+    """Innermost app frame running the statement, e.g. `DailyTodoRepository._get (adapters/todo/repository.py:265)`
+
+    Statements of AsyncSessions run in a greenlet whose own stack stops at SQLAlchemy; the awaiting coroutines
+    are on the stack of the parent greenlet.
+    """
+    frame: FrameType | None = sys._getframe(1)
+    current = greenlet.getcurrent()
+    while True:
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(APP_DIR) and filename != __file__:
+                path = filename[len(APP_DIR) + 1 :]
+                return f"{frame.f_code.co_qualname} ({path}:{frame.f_lineno})"
+            frame = frame.f_back
+        if current is None or current.parent is None:
+            return None
+        current = current.parent
+        frame = current.gr_frame
+
+
+@dataclass
+class SlowQuery:
+    statement: str
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    last_seen: datetime.datetime | None = None
+    parameter_shapes: Counter = field(default_factory=Counter)
+    call_sites: Counter = field(default_factory=Counter)
+    explain: str | None = None
+
+    def dict(self) -> dict:
+        return dict(
+            statement=self.statement,
+            count=self.count,
+            total_time=self.total_time,
+            mean_time=self.total_time / self.count if self.count else 0.0,
+            max_time=self.max_time,
+            last_seen=self.last_seen,
+            parameter_shapes=[dict(value=k, count=v) for k, v in self.parameter_shapes.most_common()],
+            call_sites=[dict(value=k, count=v) for k, v in self.call_sites.most_common()],
+            explain=self.explain,
+        )
+
+
+def _count_bounded(counter: Counter, key: str | None, maxsize: int) -> None:
+    if key is not None and key not in counter and len(counter) >= maxsize:
+        key = OTHER
+    counter[key or OTHER] += 1
+
+
+class SlowQueryLog:
+    """Slow statements by normalized text, the least recently slow evicted beyond `maxsize`"""
+
+    def __init__(self, threshold: float, maxsize: int, max_shapes: int, explain: bool):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.max_shapes = max_shapes
+        self.explain = explain
+        self._entries: OrderedDict[str, SlowQuery] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, duration: float, parameter_shape: str, call_site: str | None) -> bool:
+        """Adds a slow run; True when it is the first one of its normalized statement"""
+        normalized = normalize_statement(statement)
+        with self._lock:
+            if first := (entry := self._entries.get(normalized)) is None:
+                entry = self._entries[normalized] = SlowQuery(normalized)
+            self._entries.move_to_end(normalized)
+            entry.count += 1
+            entry.total_time += duration
+            entry.max_time = max(entry.max_time, duration)
+            entry.last_seen = datetime.datetime.now(datetime.timezone.utc)
+            _count_bounded(entry.parameter_shapes, parameter_shape, self.max_shapes)
+            _count_bounded(entry.call_sites, call_site, self.max_shapes)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return first
+
+    def set_explain(self, statement: str, explain: str) -> None:
+        with self._lock:
+            if (entry := self._entries.get(normalize_statement(statement))) is not None:
+                entry.explain = explain
+
+    def get_entries(self, order_by: str = "total_time", limit: int | None = None) -> list[SlowQuery]:
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda e: getattr(e, order_by), reverse=True)
+        return entries[:limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def install(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+    def _after_cursor_execute(self, conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+        _, started = conn.info["slow_query_started"].pop()
+        duration = time.perf_counter() - started
+        if duration < self.threshold:
+            return
+
+        call_site = get_call_site()
+        shape = get_parameter_shape(parameters, executemany)
+        logger.warning("Slow query (%.3fs) from %s: %s", duration, call_site, normalize_statement(statement))
+        if self.record(statement, duration, shape, call_site) and self.explain and not executemany:
+            if (plan := explain(conn, statement, parameters)) is not None:
+                self.set_explain(statement, plan)
+
+
+def _before_cursor_execute(conn: Connection, cursor, statement, parameters, context, executemany) -> None:
+    # A stack, since statements can nest (e.g. a flush run by autoflush)
+    conn.info.setdefault("slow_query_started", []).append((context, time.perf_counter()))
+
+
+def _handle_error(exception_context: ExceptionContext) -> None:
+    # A failed statement never reaches after_cursor_execute; its start would be taken for that of the next one.
+    # Errors raised while fetching come after after_cursor_execute, and their statement is no longer on the stack.
+    if exception_context.connection is None:
+        return
+    started = exception_context.connection.info.get("slow_query_started")
+    if started and started[-1][0] is exception_context.execution_context:
+        started.pop()
+
+
+def explain(conn: Connection, statement: str, parameters) -> str | None:
+    """Plan of `statement` with the parameters it ran with, or None for statements that can't be explained
+
+    Postgres runs SELECTs again under EXPLAIN (ANALYZE, BUFFERS) for actual timings; other statements only get
+    their plan, since ANALYZE would apply their writes twice. A savepoint keeps a failing EXPLAIN from aborting
+    the transaction of the statement.
+    """
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if keyword not in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH"):
+        return None
+
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if conn.dialect.name != "postgresql":
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+        options = "(ANALYZE, BUFFERS) " if keyword == "SELECT" else ""
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN {options}{statement}", parameters)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        except Exception:
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            raise
+        cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    except Exception:
+        logger.warning("Could not EXPLAIN %s", normalize_statement(statement), exc_info=True)
+        return None
+    finally:
+        cursor.close()
+
+
+@cache
+def get_slow_query_log() -> SlowQueryLog:
+    # One log per worker process, shared by the engines of all shards
+    slow_query_settings = settings.SLOW_QUERY_SETTINGS
+    return SlowQueryLog(
+        threshold=slow_query_settings.SLOW_QUERY_THRESHOLD,
+        maxsize=slow_query_settings.SLOW_QUERY_MAX_STATEMENTS,
+        max_shapes=slow_query_settings.SLOW_QUERY_MAX_SHAPES,
+        explain=slow_query_settings.SLOW_QUERY_EXPLAIN,
+    )
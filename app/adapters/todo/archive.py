@@ -0,0 +1,114 @@
+import datetime
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from functools import cache
+
+from app import settings
+from app.domain.todo import models as todo_models
+
+
+# date.isoformat() -> [[id, created_at, updated_at, content, is_completed, version], ...]
+ArchivedDays = dict[str, list[list]]
+
+# 1: rows without the version, which archived tasks of version 1 read as
+CODEC_VERSION = 2
+
+
+def encode_days(days: ArchivedDays) -> bytes:
+    payload = json.dumps(dict(v=CODEC_VERSION, days=days), ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(payload.encode(), settings.ARCHIVE_SETTINGS.ARCHIVE_COMPRESSION_LEVEL)
+
+
+def decode_days(data: bytes) -> ArchivedDays:
+    payload = json.loads(zlib.decompress(data))
+    if payload["v"] == 1:
+        return {date: [[*row, 1] for row in rows] for date, rows in payload["days"].items()}
+    if payload["v"] != CODEC_VERSION:
+        raise ValueError(f"Unsupported archive codec version {payload['v']}")
+    return payload["days"]
+
+
+def dump_daily_todo_task_values(
+    id: int,
+    created_at: datetime.datetime,
+    updated_at: datetime.datetime,
+    content: str,
+    is_completed: bool,
+    version: int,
+) -> list:
+    return [id, created_at.isoformat(), updated_at.isoformat(), content, is_completed, version]
+
+
+def count_daily_todo_tasks(rows: list[list]) -> tuple[int, int]:
+    """(total, completed) tasks of an archived day"""
+    return len(rows), sum(1 for row in rows if row[4])
+
+
+def load_daily_todo_task_values(todo_repo_id: int, date: datetime.date, row: list) -> dict:
+    # Tasks get their version back when rehydrated, so that an If-Match read before archiving still applies
+    id, created_at, updated_at, content, is_completed, version = row
+    return dict(
+        id=id,
+        created_at=datetime.datetime.fromisoformat(created_at),
+        updated_at=datetime.datetime.fromisoformat(updated_at),
+        content=content,
+        is_completed=is_completed,
+        todo_repo_id=todo_repo_id,
+        date=date,
+        version=version,
+    )
+
+
+def load_daily_todo(todo_repo_id: int, date: datetime.date, rows: list[list]) -> todo_models.DailyTodo:
+    """Build a detached, read-only DailyTodo; it is never added to a session"""
+    daily_todo = todo_models.DailyTodo(date=date)
+    daily_todo.todo_repo_id = todo_repo_id
+    for row in rows:
+        values = load_daily_todo_task_values(todo_repo_id, date, row)
+        daily_todo_task = todo_models.DailyTodoTask(content=values["content"], is_completed=values["is_completed"])
+        daily_todo_task.id = values["id"]
+        daily_todo_task.created_at = values["created_at"]
+        daily_todo_task.updated_at = values["updated_at"]
+        daily_todo_task.todo_repo_id = todo_repo_id
+        daily_todo_task.date = date
+        daily_todo_task.version = values["version"]
+        daily_todo.daily_todo_tasks.append(daily_todo_task)
+    return daily_todo
+
+
+class ArchiveCache:
+    """LRU of decoded archives keyed by (todo_repo_id, year)
+
+    Entries carry the archive version they were decoded from, so a reader only needs the version of the row
+    to tell whether its entry is still current, without fetching and decompressing the blob again.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[int, int], tuple[int, ArchivedDays]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[int, int], version: int) -> ArchivedDays | None:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple[int, int], version: int, days: ArchivedDays) -> None:
+        with self._lock:
+            self._entries[key] = (version, days)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: tuple[int, int]) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+@cache
+def get_archive_cache() -> ArchiveCache:
+    return ArchiveCache(maxsize=settings.ARCHIVE_SETTINGS.ARCHIVE_CACHE_SIZE)
@@ -0,0 +1,171 @@
+import datetime
+import re
+from dataclasses import dataclass
+from typing import Literal, Sequence
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+
+Interval = Literal["month", "year"]
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """Declarative RANGE partitioning of `table` by a date `column`, one partition per `interval`"""
+
+    table: str
+    column: str
+    interval: Interval = "month"
+
+    @property
+    def partition_by(self) -> str:
+        return f"RANGE ({self.column})"
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.table}_default"
+
+    def get_bounds(self, date: datetime.date) -> tuple[datetime.date, datetime.date]:
+        if self.interval == "year":
+            return datetime.date(date.year, 1, 1), datetime.date(date.year + 1, 1, 1)
+        start = datetime.date(date.year, date.month, 1)
+        end = datetime.date(date.year + date.month // 12, date.month % 12 + 1, 1)
+        return start, end
+
+    def get_partition_name(self, date: datetime.date) -> str:
+        start, _ = self.get_bounds(date)
+        suffix = f"{start.year}" if self.interval == "year" else f"{start.year}_{start.month:02d}"
+        return f"{self.table}_p{suffix}"
+
+    def is_partition(self, name: str) -> bool:
+        return name == self.default_partition or self.parse_partition_start(name) is not None
+
+    def parse_partition_start(self, name: str) -> datetime.date | None:
+        if (match := re.fullmatch(rf"{self.table}_p(\d{{4}})(?:_(\d{{2}}))?", name)) is None:
+            return None
+        year, month = match.groups()
+        return datetime.date(int(year), int(month or 1), 1)
+
+    def iter_partition_starts(self, since: datetime.date, until: datetime.date):
+        start, _ = self.get_bounds(since)
+        while start <= until:
+            yield start
+            _, start = self.get_bounds(start)
+
+    def create_partition_ddl(self, date: datetime.date) -> str:
+        start, end = self.get_bounds(date)
+        return (
+            f"CREATE TABLE IF NOT EXISTS {self.get_partition_name(date)} PARTITION OF {self.table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+
+    def create_default_partition_ddl(self) -> str:
+        # Catches rows outside every range so that inserts never fail for a missing partition
+        return f"CREATE TABLE IF NOT EXISTS {self.default_partition} PARTITION OF {self.table} DEFAULT"
+
+    def detach_default_partition_ddl(self) -> str:
+        # Not CONCURRENTLY: the default is reattached in the same transaction
+        return f"ALTER TABLE {self.table} DETACH PARTITION {self.default_partition}"
+
+    def attach_default_partition_ddl(self) -> str:
+        return f"ALTER TABLE {self.table} ATTACH PARTITION {self.default_partition} DEFAULT"
+
+    def get_range_condition(self, date: datetime.date) -> str:
+        start, end = self.get_bounds(date)
+        return f"{self.column} >= '{start.isoformat()}' AND {self.column} < '{end.isoformat()}'"
+
+    def detach_partition_ddl(self, name: str) -> str:
+        # CONCURRENTLY only takes a SHARE UPDATE EXCLUSIVE lock, but can't run inside a transaction block
+        return f"ALTER TABLE {self.table} DETACH PARTITION {name} CONCURRENTLY"
+
+
+DAILY_TODO_TASKS_PARTITION_SPEC = PartitionSpec(table="daily_todo_tasks", column="date", interval="month")
+
+
+async def get_partitions(conn: AsyncConnection, spec: PartitionSpec) -> dict[str, datetime.date]:
+    q = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        dict(table=spec.table),
+    )
+    partitions = {}
+    for (name,) in q:
+        if (start := spec.parse_partition_start(name)) is not None:
+            partitions[name] = start
+    return partitions
+
+
+def get_copied_columns(table: Table) -> list[str]:
+    # Generated columns are recomputed on insert, and Postgres refuses any value for them
+    return [c.name for c in table.c if c.computed is None]
+
+
+async def create_future_partitions(
+    conn: AsyncConnection,
+    spec: PartitionSpec,
+    ahead: int,
+    today: datetime.date | None = None,
+    *,
+    columns: Sequence[str],
+) -> list[str]:
+    """Create the partitions for the current interval and `ahead` intervals after it; `conn` must be in a transaction
+
+    Partitions should exist before rows arrive. Postgres refuses to create a partition whose range has rows in
+    the default partition, so those rows are moved: the default is detached, the partition created, the rows
+    copied into it and deleted from the default, and the default reattached, all under the transaction's
+    ACCESS EXCLUSIVE lock on the table. Only `columns` are copied, see get_copied_columns.
+    """
+    today = today or datetime.date.today()
+    until = today
+    for _ in range(ahead):
+        _, until = spec.get_bounds(until)
+
+    existing = await get_partitions(conn, spec)
+    missing = [
+        start for start in spec.iter_partition_starts(today, until) if spec.get_partition_name(start) not in existing
+    ]
+    misplaced = [start for start in missing if await has_default_rows(conn, spec, start)]
+
+    if misplaced:
+        await conn.execute(text(spec.detach_default_partition_ddl()))
+    column_list = ", ".join(columns)
+    created = []
+    for start in missing:
+        name = spec.get_partition_name(start)
+        await conn.execute(text(spec.create_partition_ddl(start)))
+        if start in misplaced:
+            condition = spec.get_range_condition(start)
+            await conn.execute(
+                text(
+                    f"INSERT INTO {name} ({column_list}) "
+                    f"SELECT {column_list} FROM {spec.default_partition} WHERE {condition}"
+                )
+            )
+            await conn.execute(text(f"DELETE FROM {spec.default_partition} WHERE {condition}"))
+        created.append(name)
+    if misplaced:
+        await conn.execute(text(spec.attach_default_partition_ddl()))
+    return created
+
+
+async def has_default_rows(conn: AsyncConnection, spec: PartitionSpec, date: datetime.date) -> bool:
+    q = await conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {spec.default_partition} WHERE {spec.get_range_condition(date)})")
+    )
+    return bool(q.scalar())
+
+
+async def detach_partitions_before(conn: AsyncConnection, spec: PartitionSpec, before: datetime.date) -> list[str]:
+    """Detach partitions whose whole range is before `before`; `conn` must be in autocommit mode
+
+    Detached partitions are plain tables that can be dumped and dropped for archival.
+    """
+    detached = []
+    for name, start in sorted((await get_partitions(conn, spec)).items(), key=lambda p: p[1]):
+        _, end = spec.get_bounds(start)
+        if end <= before:
+            await conn.execute(text(spec.detach_partition_ddl(name)))
+            detached.append(name)
+    return detached
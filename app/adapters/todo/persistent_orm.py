@@ -10,12 +10,29 @@ from sqlalchemy import (
     func,
     Boolean,
     MetaData,
-    Date
+    Date,
+    LargeBinary,
+    SmallInteger,
+    DDL,
+    event,
+    false,
+    Computed,
 )
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import registry, relationship
 
-from app.domain.todo.models import TodoRepo, DailyTodo, DailyTodoTask
+from app.domain.todo.models import (
+    TodoRepo,
+    TodoRepoCount,
+    TodoRepoPeriodStats,
+    TodoRepoWeekdayStats,
+    DailyTodo,
+    DailyTodoTask,
+    DailyTodoArchive,
+    DailyTodoArchiveTask,
+)
+from app.adapters.todo.partitioning import DAILY_TODO_TASKS_PARTITION_SPEC
+from app.adapters.todo import search
 
 metadata = MetaData()
 mapper_registry = registry(metadata=metadata)
@@ -42,6 +59,38 @@ todo_repos = Table(
     Column("title", String(50), nullable=False, default=""),
     Column("description", String(256), nullable=False, default=""),
     Column("user_id", Integer, nullable=False, index=True),
+    # Opts the TodoRepo in to its anonymous graph.svg
+    Column("is_public", Boolean, nullable=False, default=False, server_default=false()),
+    # Bumped by every UPDATE, which only applies while the row still has the version that was read
+    Column("version", Integer, nullable=False, default=1, server_default="1"),
+    Column("search_vector", postgresql.TSVECTOR, Computed(search.TODO_REPO_SEARCH_VECTOR, persisted=True)),
+    Index("ix_todo_repos_search_vector", "search_vector", postgresql_using="gin"),
+)
+
+todo_repo_counts = Table(
+    "todo_repo_counts",
+    mapper_registry.metadata,
+    Column("user_id", Integer, primary_key=True, autoincrement=False),
+    Column("count", Integer, nullable=False, default=0),
+)
+
+todo_repo_period_stats = Table(
+    "todo_repo_period_stats",
+    mapper_registry.metadata,
+    Column("todo_repo_id", ForeignKey(todo_repos.name + ".id", ondelete="cascade"), primary_key=True),
+    Column("period", String(5), primary_key=True),
+    Column("start", Date, primary_key=True),
+    Column("total", Integer, nullable=False, default=0),
+    Column("completed", Integer, nullable=False, default=0),
+)
+
+todo_repo_weekday_stats = Table(
+    "todo_repo_weekday_stats",
+    mapper_registry.metadata,
+    Column("todo_repo_id", ForeignKey(todo_repos.name + ".id", ondelete="cascade"), primary_key=True),
+    Column("weekday", SmallInteger, primary_key=True, autoincrement=False),
+    Column("total", Integer, nullable=False, default=0),
+    Column("completed", Integer, nullable=False, default=0),
 )
 
 daily_todos = Table(
@@ -73,13 +122,54 @@ daily_todo_tasks = Table(
     Column("content", Text, nullable=False),
     Column("is_completed", Boolean, nullable=False, default=False),
     Column("todo_repo_id", Integer, nullable=False),
-    Column("date", Date, nullable=False),
+    # Partition key, so it has to be part of the primary key
+    Column("date", Date, primary_key=True, nullable=False),
+    Column("version", Integer, nullable=False, default=1, server_default="1"),
     ForeignKeyConstraint(
         ["todo_repo_id", "date"],
         ["daily_todos.todo_repo_id", "daily_todos.date"],
         name="fk_daily_todo_task_daily_todo",
     ),
     Index("fk_daily_todo_task_daily_todo", "todo_repo_id", "date"),
+    Column("search_vector", postgresql.TSVECTOR, Computed(search.DAILY_TODO_TASK_SEARCH_VECTOR, persisted=True)),
+    Index("ix_daily_todo_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    postgresql_partition_by=DAILY_TODO_TASKS_PARTITION_SPEC.partition_by,
+)
+event.listen(
+    daily_todo_tasks,
+    "after_create",
+    DDL(DAILY_TODO_TASKS_PARTITION_SPEC.create_default_partition_ddl()),
+)
+
+daily_todo_archives = Table(
+    "daily_todo_archives",
+    mapper_registry.metadata,
+    Column("todo_repo_id", ForeignKey(todo_repos.name + ".id", ondelete="cascade"), primary_key=True),
+    Column("year", Integer, primary_key=True),
+    Column("data", LargeBinary, nullable=False),
+    Column("version", Integer, nullable=False, default=1),
+    Column(
+        "archived_at",
+        postgresql.TIMESTAMP(timezone=True),
+        default=func.now(),
+        onupdate=func.current_timestamp(),
+        server_default=func.now(),
+        nullable=False,
+    ),
+)
+
+
+# Contents of the archived tasks by task id, for search; the rest of the task is only in the blob
+daily_todo_archive_tasks = Table(
+    "daily_todo_archive_tasks",
+    mapper_registry.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("todo_repo_id", ForeignKey(todo_repos.name + ".id", ondelete="cascade"), nullable=False),
+    Column("date", Date, nullable=False),
+    Column("content", Text, nullable=False),
+    Column("search_vector", postgresql.TSVECTOR, Computed(search.DAILY_TODO_TASK_SEARCH_VECTOR, persisted=True)),
+    Index("ix_daily_todo_archive_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    Index("ix_daily_todo_archive_tasks_todo_repo_id_date", "todo_repo_id", "date"),
 )
 
 
@@ -94,6 +184,8 @@ def start_mappers():
                 cascade="all, delete-orphan",
             )
         },
+        version_id_col=todo_repos.c.version,
+        exclude_properties=["search_vector"],
         eager_defaults=True,
     )
     mapper_registry.map_imperatively(
@@ -121,5 +213,16 @@ def start_mappers():
                 back_populates="daily_todo_tasks",
             ),
         },
+        version_id_col=daily_todo_tasks.c.version,
+        exclude_properties=["search_vector"],
         eager_defaults=True,
     )
+    mapper_registry.map_imperatively(TodoRepoCount, todo_repo_counts)
+    mapper_registry.map_imperatively(TodoRepoPeriodStats, todo_repo_period_stats)
+    mapper_registry.map_imperatively(TodoRepoWeekdayStats, todo_repo_weekday_stats)
+    mapper_registry.map_imperatively(DailyTodoArchive, daily_todo_archives)
+    mapper_registry.map_imperatively(
+        DailyTodoArchiveTask,
+        daily_todo_archive_tasks,
+        exclude_properties=["search_vector"],
+    )
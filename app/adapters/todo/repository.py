@@ -1,15 +1,25 @@
-import asyncio
 import datetime
 from abc import ABCMeta, abstractmethod
 from typing import TypeVar, Sequence
-from sqlalchemy import select
+from collections import defaultdict
+from sqlalchemy import select, insert, update, delete, func, case, literal, false, inspect
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.todo import models as todo_models
+from app.adapters import dialect, keyset
+from app.adapters.todo import archive, search, stats
+from app.domain.todo import models as todo_models, read_models
 
 
 ModelType = TypeVar("ModelType")
+RecordType = TypeVar("RecordType")
+
+
+def get_record_columns(model: type, record_class: type[RecordType]) -> list:
+    # Selecting mapped columns instead of the entity yields plain rows that bypass the identity map
+    return [getattr(model, name) for name in record_class.__slots__]
 
 
 class AbstractRepository(metaclass=ABCMeta):
@@ -47,52 +57,113 @@ class TodoRepoRepository(AbstractRepository):
 
     async def create_todo_repo(self, todo_repo: todo_models.TodoRepo) -> todo_models.TodoRepo:
         self.session.add(todo_repo)
+        await self._add_todo_repo_count(todo_repo.user_id, 1)
         await self.session.commit()
         return todo_repo
 
-    async def get_todo_repos_by_user_id(
-        self, user_id: int, cursor: int | None, page_size: int
-    ) -> Sequence[todo_models.TodoRepo]:
-        stmt = select(todo_models.TodoRepo).where(todo_models.TodoRepo.user_id == user_id)
-        if cursor:
-            stmt = stmt.where(todo_models.TodoRepo.id < cursor)
-        stmt = stmt.order_by(todo_models.TodoRepo.id.desc()).limit(page_size)
-        q = await self.session.execute(stmt)
-        return q.scalars().all()
+    async def delete_todo_repo(self, todo_repo: todo_models.TodoRepo) -> None:
+        await self._delete_todo_repo(todo_repo)
 
-    async def update_todo_repo(self, todo_repo: todo_models.TodoRepo) -> todo_models.TodoRepo:
-        self.session.add(todo_repo)
+    async def _delete_todo_repo(self, todo_repo: todo_models.TodoRepo) -> None:
+        # DailyTodos and archives go with the TodoRepo through ON DELETE CASCADE; tasks reference the DailyTodos
+        # without one, so they are deleted first
+        await self.session.execute(
+            delete(todo_models.DailyTodoTask)
+            .where(todo_models.DailyTodoTask.todo_repo_id == todo_repo.id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            delete(todo_models.TodoRepo)
+            .where(todo_models.TodoRepo.id == todo_repo.id)
+            .execution_options(synchronize_session=False)
+        )
+        await self._add_todo_repo_count(todo_repo.user_id, -1)
         await self.session.commit()
-        return todo_repo
+        stats.get_task_versions().bump((todo_repo.id, None))
+        self.session.expunge(todo_repo)
 
-    async def get_prev_todo_repos_and_next_todo_repos(
-        self, user_id: int, cursor: int | None, next_cursor: int | None, page_size: int
-    ) -> tuple[Sequence[todo_models.TodoRepo], Sequence[todo_models.TodoRepo]]:
-        next_stmt = select(todo_models.TodoRepo).where(todo_models.TodoRepo.user_id == user_id)
-        if next_cursor:
-            next_stmt = next_stmt.where(todo_models.TodoRepo.id < next_cursor)
-        next_stmt = next_stmt.order_by(todo_models.TodoRepo.id.desc()).limit(page_size)
+    async def get_todo_repo_count(self, user_id: int) -> int:
+        q = await self.session.execute(
+            select(todo_models.TodoRepoCount.count).where(todo_models.TodoRepoCount.user_id == user_id)
+        )
+        return q.scalar() or 0
 
-        prev_stmt = select(todo_models.TodoRepo).where(todo_models.TodoRepo.user_id == user_id)
-        if cursor:
-            prev_stmt = prev_stmt.where(todo_models.TodoRepo.id > cursor)
-        prev_stmt = prev_stmt.order_by(todo_models.TodoRepo.id.asc()).limit(page_size)
+    async def get_estimated_todo_repo_count(self) -> int:
+        return await dialect.get_estimated_row_count(self.session, "todo_repos")
 
-        if cursor and next_cursor:
-            stmt_bundle = [self.session.execute(prev_stmt), self.session.execute(next_stmt)]
-            prev_q, next_q = await asyncio.gather(*stmt_bundle)
+    async def _add_todo_repo_count(self, user_id: int, delta: int) -> None:
+        # Runs in the transaction of the insert/delete it accounts for, so the count can't drift from the rows
+        insert = dialect.get_insert(self.session)
+        stmt = insert(todo_models.TodoRepoCount).values(user_id=user_id, count=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id"], set_=dict(count=todo_models.TodoRepoCount.count + stmt.excluded.count)
+        )
+        await self.session.execute(stmt)
 
-            return prev_q.scalars().all(), next_q.scalars().all()
-        elif cursor and not next_cursor:
-            q = await self.session.execute(prev_stmt)
+    async def get_todo_repo_records_by_user_id(
+        self, user_id: int, cursor: int | None, page_size: int
+    ) -> list[read_models.TodoRepoRecord]:
+        return await self._get_todo_repo_records(user_id, cursor, page_size)
 
-            return q.scalars().all(), []
-        elif not cursor and next_cursor:
-            q = await self.session.execute(next_stmt)
+    async def get_todo_repo_records(self, cursor: int | None, page_size: int) -> list[read_models.TodoRepoRecord]:
+        return await self._get_todo_repo_records(None, cursor, page_size)
 
-            return [], q.scalars().all()
-        else:
-            return [], []
+    async def get_prev_todo_repo_records_and_next_todo_repo_records(
+        self, user_id: int, cursor: int | None, next_cursor: int | None, page_size: int
+    ) -> tuple[list[read_models.TodoRepoRecord], list[read_models.TodoRepoRecord]]:
+        prev_records, next_records = [], []
+        if cursor:
+            prev_records = await self._get_todo_repo_records(user_id, cursor, page_size, descending=False)
+        if next_cursor:
+            next_records = await self._get_todo_repo_records(user_id, next_cursor, 1)
+        return prev_records, next_records
+
+    async def get_prev_todo_repo_ids_and_next_todo_repo_ids(
+        self, cursor: int | None, next_cursor: int | None, page_size: int
+    ) -> tuple[Sequence, Sequence]:
+        prev_ids, next_ids = [], []
+        if cursor:
+            q = await self.session.execute(
+                select(todo_models.TodoRepo.id)
+                .where(todo_models.TodoRepo.id > cursor)
+                .order_by(todo_models.TodoRepo.id.asc())
+                .limit(page_size)
+            )
+            prev_ids = q.all()
+        if next_cursor:
+            q = await self.session.execute(
+                select(todo_models.TodoRepo.id)
+                .where(todo_models.TodoRepo.id < next_cursor)
+                .order_by(todo_models.TodoRepo.id.desc())
+                .limit(1)
+            )
+            next_ids = q.all()
+        return prev_ids, next_ids
+
+    async def _get_todo_repo_records(
+        self, user_id: int | None, cursor: int | None, limit: int, descending: bool = True
+    ) -> list[read_models.TodoRepoRecord]:
+        columns = [todo_models.TodoRepo.id]
+        stmt = select(*get_record_columns(todo_models.TodoRepo, read_models.TodoRepoRecord))
+        if user_id is not None:
+            stmt = stmt.where(todo_models.TodoRepo.user_id == user_id)
+        if cursor:
+            stmt = stmt.where(keyset.get_keyset_condition(columns, (cursor,), descending))
+        stmt = stmt.order_by(*keyset.get_keyset_order_by(columns, descending)).limit(limit)
+        q = await self.session.execute(stmt)
+        return [read_models.TodoRepoRecord(*row) for row in q]
+
+    async def update_todo_repo(self, todo_repo: todo_models.TodoRepo) -> todo_models.TodoRepo:
+        # The UPDATE matches the version read with the TodoRepo; a concurrent update makes it miss the row
+        self.session.add(todo_repo)
+        try:
+            await self.session.commit()
+        except StaleDataError:
+            await self.session.rollback()
+            raise
+        # Drops the cached graphs, which may no longer be public
+        stats.get_task_versions().bump((todo_repo.id, None))
+        return todo_repo
 
 
 class DailyTodoRepository(AbstractRepository):
@@ -106,7 +177,65 @@ class DailyTodoRepository(AbstractRepository):
         self.session.add_all(models)
 
     async def get(self, todo_repo_id: int, date: datetime.date) -> todo_models.DailyTodo:
-        return await self._get(todo_repo_id, date)
+        # Falls back to the archive; archived DailyTodos are detached and must not be modified
+        if (daily_todo := await self._get(todo_repo_id, date)) is None:
+            daily_todo = await self._get_archived(todo_repo_id, date)
+        return daily_todo
+
+    async def get_daily_todo_records_by_todo_repo_id(
+        self, todo_repo_id: int, cursor: tuple[datetime.date] | None, page_size: int
+    ) -> list[read_models.DailyTodoRecord]:
+        return await self._get_daily_todo_records(todo_repo_id, cursor, page_size, descending=True)
+
+    async def get_prev_daily_todo_records_and_next_daily_todo_records(
+        self,
+        todo_repo_id: int,
+        cursor: tuple[datetime.date] | None,
+        next_cursor: tuple[datetime.date] | None,
+        page_size: int,
+    ) -> tuple[list[read_models.DailyTodoRecord], list[read_models.DailyTodoRecord]]:
+        prev_records, next_records = [], []
+        if cursor:
+            prev_records = await self._get_daily_todo_records(todo_repo_id, cursor, page_size, descending=False)
+        if next_cursor:
+            next_records = await self._get_daily_todo_records(todo_repo_id, next_cursor, 1, descending=True)
+        return prev_records, next_records
+
+    async def get_daily_todo_task_records(
+        self, todo_repo_id: int, date: datetime.date, cursor: int | None = None, page_size: int | None = None
+    ) -> list[read_models.DailyTodoTaskRecord]:
+        return await self._get_daily_todo_task_records(todo_repo_id, date, cursor, page_size)
+
+    async def get_prev_daily_todo_task_ids_and_next_daily_todo_task_ids(
+        self, todo_repo_id: int, date: datetime.date, cursor: int | None, next_cursor: int | None, page_size: int
+    ) -> tuple[Sequence, Sequence]:
+        return await self._get_prev_daily_todo_task_ids_and_next_daily_todo_task_ids(
+            todo_repo_id, date, cursor, next_cursor, page_size
+        )
+
+    async def get_daily_task_counts(self, todo_repo_id: int, year: int) -> dict[datetime.date, tuple[int, int]]:
+        """date -> (total, completed) tasks of every day of `year` that has tasks, archived ones included"""
+        DailyTodoTask = todo_models.DailyTodoTask
+        q = await self.session.execute(
+            select(DailyTodoTask.date, func.count(), func.sum(case((DailyTodoTask.is_completed, 1), else_=0)))
+            .where(
+                DailyTodoTask.todo_repo_id == todo_repo_id,
+                DailyTodoTask.date >= datetime.date(year, 1, 1),
+                DailyTodoTask.date < datetime.date(year + 1, 1, 1),
+            )
+            .group_by(DailyTodoTask.date)
+        )
+        counts = {date: (total, completed) for date, total, completed in q.all()}
+        for date, rows in ((await self._get_archived_days(todo_repo_id, year)) or {}).items():
+            counts[datetime.date.fromisoformat(date)] = archive.count_daily_todo_tasks(rows)
+        return counts
+
+    async def get_for_update(self, todo_repo_id: int, date: datetime.date) -> todo_models.DailyTodo:
+        # An archived day is moved back to the hot tables in the current transaction before it is modified
+        if (daily_todo := await self._get(todo_repo_id, date)) is None:
+            if await self._rehydrate_daily_todo(todo_repo_id, date):
+                daily_todo = await self._get(todo_repo_id, date)
+        return daily_todo
 
     async def _get(self, todo_repo_id: int, date: datetime.date) -> todo_models.DailyTodo:
         q = await self.session.execute(
@@ -116,16 +245,527 @@ class DailyTodoRepository(AbstractRepository):
         )
         return q.scalar()
 
+    async def _get_daily_todo_records(
+        self, todo_repo_id: int, cursor: tuple[datetime.date] | None, limit: int, descending: bool
+    ) -> list[read_models.DailyTodoRecord]:
+        # Archived days are merged in, so a page may combine hot and archived DailyTodos
+        columns = [todo_models.DailyTodo.date]
+        stmt = select(*get_record_columns(todo_models.DailyTodo, read_models.DailyTodoRecord)).where(
+            todo_models.DailyTodo.todo_repo_id == todo_repo_id
+        )
+        if cursor:
+            stmt = stmt.where(keyset.get_keyset_condition(columns, cursor, descending))
+        stmt = stmt.order_by(*keyset.get_keyset_order_by(columns, descending)).limit(limit)
+        q = await self.session.execute(stmt)
+        records = [read_models.DailyTodoRecord(*row) for row in q]
+
+        archived_dates = await self._get_archived_dates(todo_repo_id, cursor[0] if cursor else None, limit, descending)
+        records += [read_models.DailyTodoRecord(todo_repo_id, date) for date in archived_dates]
+        return sorted(records, key=lambda r: r.date, reverse=descending)[:limit]
+
+    async def _get_archived_dates(
+        self, todo_repo_id: int, cursor: datetime.date | None, limit: int, descending: bool
+    ) -> list[datetime.date]:
+        year = todo_models.DailyTodoArchive.year
+        stmt = select(year).where(todo_models.DailyTodoArchive.todo_repo_id == todo_repo_id)
+        if cursor:
+            stmt = stmt.where(year <= cursor.year if descending else year >= cursor.year)
+        q = await self.session.execute(stmt.order_by(year.desc() if descending else year))
+
+        dates = []
+        for archived_year in q.scalars().all():
+            days = await self._get_archived_days(todo_repo_id, archived_year) or {}
+            year_dates = sorted(map(datetime.date.fromisoformat, days), reverse=descending)
+            if cursor:
+                year_dates = [d for d in year_dates if (d < cursor if descending else d > cursor)]
+            dates += year_dates
+            if len(dates) >= limit:
+                break
+        return dates[:limit]
+
+    async def _get_daily_todo_task_records(
+        self, todo_repo_id: int, date: datetime.date, cursor: int | None, page_size: int | None
+    ) -> list[read_models.DailyTodoTaskRecord]:
+        # Tasks are listed by ascending id, the keyset within the (todo_repo_id, date) index range
+        stmt = select(*get_record_columns(todo_models.DailyTodoTask, read_models.DailyTodoTaskRecord)).where(
+            todo_models.DailyTodoTask.todo_repo_id == todo_repo_id, todo_models.DailyTodoTask.date == date
+        )
+        if cursor:
+            stmt = stmt.where(todo_models.DailyTodoTask.id > cursor)
+        stmt = stmt.order_by(todo_models.DailyTodoTask.id).limit(page_size)
+        q = await self.session.execute(stmt)
+        if records := [read_models.DailyTodoTaskRecord(*row) for row in q]:
+            return records
+
+        if (records := await self._get_archived_daily_todo_task_records(todo_repo_id, date)) is None:
+            return []
+        if cursor:
+            records = [r for r in records if r.id > cursor]
+        return records[:page_size] if page_size else records
+
+    async def _get_prev_daily_todo_task_ids_and_next_daily_todo_task_ids(
+        self, todo_repo_id: int, date: datetime.date, cursor: int | None, next_cursor: int | None, page_size: int
+    ) -> tuple[Sequence, Sequence]:
+        # Only the ids are needed to tell whether neighbouring pages exist and where the previous one starts
+        DailyTodoTask = todo_models.DailyTodoTask
+        where = (DailyTodoTask.todo_repo_id == todo_repo_id, DailyTodoTask.date == date)
+        prev_ids, next_ids = [], []
+        if cursor:
+            q = await self.session.execute(
+                select(DailyTodoTask.id)
+                .where(*where, DailyTodoTask.id < cursor)
+                .order_by(DailyTodoTask.id.desc())
+                .limit(page_size)
+            )
+            prev_ids = q.all()
+        if next_cursor:
+            q = await self.session.execute(
+                select(DailyTodoTask.id)
+                .where(*where, DailyTodoTask.id > next_cursor)
+                .order_by(DailyTodoTask.id)
+                .limit(1)
+            )
+            next_ids = q.all()
+        if prev_ids or next_ids or not (cursor or next_cursor):
+            return prev_ids, next_ids
+
+        if (records := await self._get_archived_daily_todo_task_records(todo_repo_id, date)) is None:
+            return [], []
+        if cursor:
+            prev_ids = [r for r in reversed(records) if r.id < cursor][:page_size]
+        if next_cursor:
+            next_ids = [r for r in records if r.id > next_cursor][:1]
+        return prev_ids, next_ids
+
+    async def _get_archived_daily_todo_task_records(
+        self, todo_repo_id: int, date: datetime.date
+    ) -> list[read_models.DailyTodoTaskRecord] | None:
+        if (daily_todo := await self._get_archived(todo_repo_id, date)) is None:
+            return None
+        records = [read_models.DailyTodoTaskRecord(**t.dict()) for t in daily_todo.daily_todo_tasks]
+        return sorted(records, key=lambda r: r.id)
+
+    async def _get_archived(self, todo_repo_id: int, date: datetime.date) -> todo_models.DailyTodo | None:
+        if (days := await self._get_archived_days(todo_repo_id, date.year)) is None:
+            return None
+        if (rows := days.get(date.isoformat())) is None:
+            return None
+        return archive.load_daily_todo(todo_repo_id, date, rows)
+
+    async def _get_archived_days(self, todo_repo_id: int, year: int) -> archive.ArchivedDays | None:
+        # Only the version is read while the decoded archive in the cache is current
+        where = (todo_models.DailyTodoArchive.todo_repo_id == todo_repo_id, todo_models.DailyTodoArchive.year == year)
+        q = await self.session.execute(select(todo_models.DailyTodoArchive.version).where(*where))
+        if (version := q.scalar()) is None:
+            return None
+        if (days := archive.get_archive_cache().get((todo_repo_id, year), version)) is not None:
+            return days
+
+        q = await self.session.execute(
+            select(todo_models.DailyTodoArchive.version, todo_models.DailyTodoArchive.data).where(*where)
+        )
+        if (row := q.first()) is None:
+            return None
+        days = archive.decode_days(row.data)
+        archive.get_archive_cache().put((todo_repo_id, year), row.version, days)
+        return days
+
+    async def _rehydrate_daily_todo(self, todo_repo_id: int, date: datetime.date) -> bool:
+        q = await self.session.execute(
+            select(todo_models.DailyTodoArchive)
+            .where(
+                todo_models.DailyTodoArchive.todo_repo_id == todo_repo_id,
+                todo_models.DailyTodoArchive.year == date.year,
+            )
+            .with_for_update()
+        )
+        if (daily_todo_archive := q.scalar()) is None:
+            return False
+        days = archive.decode_days(daily_todo_archive.data)
+        if (rows := days.pop(date.isoformat(), None)) is None:
+            return False
+
+        await self._insert_daily_todo_if_not_exists(todo_repo_id, date)
+        DailyTodoArchiveTask = todo_models.DailyTodoArchiveTask
+        await self.session.execute(
+            delete(DailyTodoArchiveTask)
+            .where(DailyTodoArchiveTask.todo_repo_id == todo_repo_id, DailyTodoArchiveTask.date == date)
+            .execution_options(synchronize_session=False)
+        )
+        if rows:
+            # Into the table, since an ORM insert would reset the versions the tasks had when they were archived
+            await self.session.execute(
+                insert(inspect(todo_models.DailyTodoTask).local_table),
+                [archive.load_daily_todo_task_values(todo_repo_id, date, row) for row in rows],
+            )
+        if days:
+            daily_todo_archive.data = archive.encode_days(days)
+            daily_todo_archive.version += 1
+        else:
+            await self.session.delete(daily_todo_archive)
+        await self.session.flush()
+        archive.get_archive_cache().invalidate((todo_repo_id, date.year))
+        return True
+
     async def create_daily_todo(self, daily_todo: todo_models.DailyTodo) -> todo_models.DailyTodo:
         return await self._create_daily_todo(daily_todo)
 
     async def _create_daily_todo(self, daily_todo: todo_models.DailyTodo) -> todo_models.DailyTodo:
         self.session.add(daily_todo)
-        await self.session.commit()
+        await self._commit()
         return daily_todo
 
+    async def create_daily_todo_if_not_exists(self, todo_repo_id: int, date: datetime.date) -> bool:
+        if await self._rehydrate_daily_todo(todo_repo_id, date):
+            created = False
+        else:
+            created = await self._insert_daily_todo_if_not_exists(todo_repo_id, date)
+        await self.session.commit()
+        return created
+
+    async def _insert_daily_todo_if_not_exists(self, todo_repo_id: int, date: datetime.date) -> bool:
+        # Relies on the (todo_repo_id, date) primary key; a missing TodoRepo surfaces as a foreign key IntegrityError
+        insert = dialect.get_insert(self.session)
+        stmt = (
+            insert(todo_models.DailyTodo)
+            .values(todo_repo_id=todo_repo_id, date=date)
+            .on_conflict_do_nothing(index_elements=["todo_repo_id", "date"])
+            .returning(todo_models.DailyTodo.todo_repo_id)
+        )
+        try:
+            q = await self.session.execute(stmt)
+        except IntegrityError:
+            await self.session.rollback()
+            raise
+        return q.scalar() is not None
+
+    async def create_daily_todo_task_with_daily_todo(
+        self, daily_todo_task: todo_models.DailyTodoTask
+    ) -> todo_models.DailyTodoTask:
+        return await self._create_daily_todo_task_with_daily_todo(daily_todo_task)
+
+    async def _create_daily_todo_task_with_daily_todo(
+        self, daily_todo_task: todo_models.DailyTodoTask
+    ) -> todo_models.DailyTodoTask:
+        # The DailyTodo upsert and the task insert share one transaction
+        await self._rehydrate_daily_todo(daily_todo_task.todo_repo_id, daily_todo_task.date)
+        await self._insert_daily_todo_if_not_exists(daily_todo_task.todo_repo_id, daily_todo_task.date)
+        self.session.add(daily_todo_task)
+        await self._commit()
+        return daily_todo_task
+
+    async def carry_over_daily_todo_tasks(
+        self, todo_repo_id: int, from_date: datetime.date, to_date: datetime.date
+    ) -> list[read_models.DailyTodoTaskRecord] | None:
+        return await self._carry_over_daily_todo_tasks(todo_repo_id, from_date, to_date)
+
+    async def _carry_over_daily_todo_tasks(
+        self, todo_repo_id: int, from_date: datetime.date, to_date: datetime.date
+    ) -> list[read_models.DailyTodoTaskRecord] | None:
+        # The target upsert and the copy share one transaction; None when there is no DailyTodo on `from_date`
+        DailyTodo, DailyTodoTask = todo_models.DailyTodo, todo_models.DailyTodoTask
+        q = await self.session.execute(
+            select(DailyTodo.date).where(DailyTodo.todo_repo_id == todo_repo_id, DailyTodo.date == from_date)
+        )
+        source_is_hot = q.scalar() is not None
+        if not source_is_hot and (archived := await self._get_archived(todo_repo_id, from_date)) is None:
+            return None
+
+        await self._rehydrate_daily_todo(todo_repo_id, to_date)
+        await self._insert_daily_todo_if_not_exists(todo_repo_id, to_date)
+
+        columns = ["content", "is_completed", "todo_repo_id", "date"]
+        returning = get_record_columns(DailyTodoTask, read_models.DailyTodoTaskRecord)
+        if source_is_hot:
+            # Copied by the database in one INSERT ... SELECT, without the tasks making a round trip
+            source = (
+                select(DailyTodoTask.content, false(), literal(todo_repo_id), literal(to_date, DailyTodoTask.date.type))
+                .where(
+                    DailyTodoTask.todo_repo_id == todo_repo_id,
+                    DailyTodoTask.date == from_date,
+                    DailyTodoTask.is_completed == false(),
+                )
+                .order_by(DailyTodoTask.id)
+            )
+            stmt = insert(DailyTodoTask).from_select(columns, source)
+        else:
+            values = [
+                dict(content=t.content, is_completed=False, todo_repo_id=todo_repo_id, date=to_date)
+                for t in archived.daily_todo_tasks
+                if not t.is_completed
+            ]
+            stmt = insert(DailyTodoTask).values(values) if values else None
+
+        records = []
+        if stmt is not None:
+            q = await self.session.execute(stmt.returning(*returning))
+            records = sorted((read_models.DailyTodoTaskRecord(*row) for row in q), key=lambda r: r.id)
+
+        delta = stats.TaskStatsDelta()
+        delta.add(todo_repo_id, to_date, len(records), 0)
+        await self._commit(delta)
+        return records
+
+    async def update_daily_todo_tasks_is_completed(
+        self, todo_repo_id: int, date: datetime.date, ids: list[int] | None, is_completed: bool
+    ) -> list[read_models.DailyTodoTaskRecord] | None:
+        return await self._update_daily_todo_tasks_is_completed(todo_repo_id, date, ids, is_completed)
+
+    async def _update_daily_todo_tasks_is_completed(
+        self, todo_repo_id: int, date: datetime.date, ids: list[int] | None, is_completed: bool
+    ) -> list[read_models.DailyTodoTaskRecord] | None:
+        # Sets `is_completed` on the tasks `ids` of the day (every task with None) and returns the ones found;
+        # None when the DailyTodo doesn't exist. The DailyTodo row lock serializes it with the other edits of the day
+        DailyTodo, DailyTodoTask = todo_models.DailyTodo, todo_models.DailyTodoTask
+        q = await self.session.execute(
+            select(DailyTodo.date)
+            .where(DailyTodo.todo_repo_id == todo_repo_id, DailyTodo.date == date)
+            .with_for_update()
+        )
+        if q.scalar() is None and not await self._rehydrate_daily_todo(todo_repo_id, date):
+            return None
+
+        where = [DailyTodoTask.todo_repo_id == todo_repo_id, DailyTodoTask.date == date]
+        if ids is not None:
+            where.append(dialect.get_in_condition(self.session, DailyTodoTask.id, ids))
+        columns = get_record_columns(DailyTodoTask, read_models.DailyTodoTaskRecord)
+        # Tasks already at the value are left alone, so that only real changes touch updated_at and the rollups
+        q = await self.session.execute(
+            update(DailyTodoTask)
+            .where(*where, DailyTodoTask.is_completed != is_completed)
+            .values(is_completed=is_completed, version=DailyTodoTask.version + 1)
+            .returning(*columns)
+            .execution_options(synchronize_session=False)
+        )
+        records = [read_models.DailyTodoTaskRecord(*row) for row in q]
+        changed = len(records)
+
+        if ids is None or changed < len(ids):
+            q = await self.session.execute(
+                select(*columns).where(*where, DailyTodoTask.id.not_in([r.id for r in records]))
+            )
+            records.extend(read_models.DailyTodoTaskRecord(*row) for row in q)
+
+        delta = stats.TaskStatsDelta()
+        delta.add(todo_repo_id, date, 0, changed if is_completed else -changed)
+        await self._commit(delta)
+        return sorted(records, key=lambda r: r.id)
+
     async def update_daily_todo(self):
         return await self._update_daily_todo()
 
     async def _update_daily_todo(self):
+        await self._commit()
+
+    async def _commit(self, delta: stats.TaskStatsDelta | None = None) -> None:
+        # Task changes still pending in the session are rolled up before they are flushed,
+        # along with `delta` for the ones made by Core statements
+        if delta := stats.collect_task_stats_delta(self.session, delta):
+            await stats.add_task_stats(self.session, delta)
+        try:
+            await self.session.commit()
+        except StaleDataError:
+            # A task changed by someone else since it was read
+            await self.session.rollback()
+            raise
+        for key in delta.get_keys():
+            stats.get_task_versions().bump(key)
+
+
+class DailyTodoArchiveRepository(AbstractRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _add(self, model):
+        self.session.add(model)
+
+    def _add_all(self, models):
+        self.session.add_all(models)
+
+    async def get_todo_repo_ids_to_archive(self, before: datetime.date) -> Sequence[int]:
+        q = await self.session.execute(
+            select(todo_models.DailyTodo.todo_repo_id).where(todo_models.DailyTodo.date < before).distinct()
+        )
+        return q.scalars().all()
+
+    async def archive_daily_todos(self, todo_repo_id: int, before: datetime.date) -> int:
+        return await self._archive_daily_todos(todo_repo_id, before)
+
+    async def _archive_daily_todos(self, todo_repo_id: int, before: datetime.date) -> int:
+        # Archived rows are the ones the DELETEs returned, so an edit can't be lost between read and delete.
+        # A task inserted meanwhile makes the DailyTodo DELETE fail on the foreign key and the transaction roll back
+        DailyTodo, DailyTodoTask = todo_models.DailyTodo, todo_models.DailyTodoTask
+        q = await self.session.execute(
+            delete(DailyTodoTask)
+            .where(DailyTodoTask.todo_repo_id == todo_repo_id, DailyTodoTask.date < before)
+            .returning(
+                DailyTodoTask.id,
+                DailyTodoTask.created_at,
+                DailyTodoTask.updated_at,
+                DailyTodoTask.content,
+                DailyTodoTask.is_completed,
+                DailyTodoTask.version,
+                DailyTodoTask.date,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        rows_by_date = defaultdict(list)
+        archived_tasks = []
+        for *row, date in sorted(q.all()):
+            rows_by_date[date].append(archive.dump_daily_todo_task_values(*row))
+            archived_tasks.append(dict(id=row[0], todo_repo_id=todo_repo_id, date=date, content=row[3]))
+        if archived_tasks:
+            # Contents stay searchable next to the blob; into the table, since the rows keep the ids of the tasks
+            await self.session.execute(insert(inspect(todo_models.DailyTodoArchiveTask).local_table), archived_tasks)
+
+        q = await self.session.execute(
+            delete(DailyTodo)
+            .where(DailyTodo.todo_repo_id == todo_repo_id, DailyTodo.date < before)
+            .returning(DailyTodo.date)
+            .execution_options(synchronize_session=False)
+        )
+        days_by_year: dict[int, archive.ArchivedDays] = defaultdict(dict)
+        for date in (dates := q.scalars().all()):
+            days_by_year[date.year][date.isoformat()] = rows_by_date[date]
+
+        for year, days in days_by_year.items():
+            q = await self.session.execute(
+                select(todo_models.DailyTodoArchive)
+                .where(
+                    todo_models.DailyTodoArchive.todo_repo_id == todo_repo_id,
+                    todo_models.DailyTodoArchive.year == year,
+                )
+                .with_for_update()
+            )
+            if (daily_todo_archive := q.scalar()) is None:
+                self.session.add(
+                    todo_models.DailyTodoArchive(todo_repo_id=todo_repo_id, year=year, data=archive.encode_days(days))
+                )
+            else:
+                daily_todo_archive.data = archive.encode_days(archive.decode_days(daily_todo_archive.data) | days)
+                daily_todo_archive.version += 1
+            archive.get_archive_cache().invalidate((todo_repo_id, year))
+
+        await self.session.commit()
+        return len(dates)
+
+
+class TodoRepoStatsRepository(AbstractRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _add(self, model):
+        self.session.add(model)
+
+    def _add_all(self, models):
+        self.session.add_all(models)
+
+    async def get_period_stats(
+        self, todo_repo_id: int, period: stats.Period, since: datetime.date, until: datetime.date
+    ) -> Sequence[todo_models.TodoRepoPeriodStats]:
+        q = await self.session.execute(
+            select(todo_models.TodoRepoPeriodStats)
+            .where(
+                todo_models.TodoRepoPeriodStats.todo_repo_id == todo_repo_id,
+                todo_models.TodoRepoPeriodStats.period == period,
+                todo_models.TodoRepoPeriodStats.start >= stats.get_period_start(since, period),
+                todo_models.TodoRepoPeriodStats.start <= until,
+            )
+            .order_by(todo_models.TodoRepoPeriodStats.start)
+        )
+        return q.scalars().all()
+
+    async def get_weekday_stats(self, todo_repo_id: int) -> Sequence[todo_models.TodoRepoWeekdayStats]:
+        q = await self.session.execute(
+            select(todo_models.TodoRepoWeekdayStats)
+            .where(todo_models.TodoRepoWeekdayStats.todo_repo_id == todo_repo_id)
+            .order_by(todo_models.TodoRepoWeekdayStats.weekday)
+        )
+        return q.scalars().all()
+
+    async def get_todo_repo_ids(self, cursor: int | None, page_size: int) -> Sequence[int]:
+        stmt = select(todo_models.TodoRepo.id)
+        if cursor:
+            stmt = stmt.where(todo_models.TodoRepo.id > cursor)
+        q = await self.session.execute(stmt.order_by(todo_models.TodoRepo.id).limit(page_size))
+        return q.scalars().all()
+
+    async def rebuild_todo_repo_stats(self, todo_repo_id: int) -> int:
+        return await self._rebuild_todo_repo_stats(todo_repo_id)
+
+    async def _rebuild_todo_repo_stats(self, todo_repo_id: int) -> int:
+        # Recounts the live tasks and the archived ones of the TodoRepo, replacing its rollup rows
+        DailyTodoTask = todo_models.DailyTodoTask
+        for model in (todo_models.TodoRepoPeriodStats, todo_models.TodoRepoWeekdayStats):
+            await self.session.execute(
+                delete(model).where(model.todo_repo_id == todo_repo_id).execution_options(synchronize_session=False)
+            )
+
+        delta = stats.TaskStatsDelta()
+        q = await self.session.execute(
+            select(DailyTodoTask.date, func.count(), func.sum(case((DailyTodoTask.is_completed, 1), else_=0)))
+            .where(DailyTodoTask.todo_repo_id == todo_repo_id)
+            .group_by(DailyTodoTask.date)
+        )
+        delta.add_days(todo_repo_id, q.all())
+
+        q = await self.session.execute(
+            select(todo_models.DailyTodoArchive.data).where(todo_models.DailyTodoArchive.todo_repo_id == todo_repo_id)
+        )
+        for data in q.scalars():
+            delta.add_days(
+                todo_repo_id,
+                (
+                    (datetime.date.fromisoformat(date), *archive.count_daily_todo_tasks(rows))
+                    for date, rows in archive.decode_days(data).items()
+                ),
+            )
+
+        await stats.add_task_stats(self.session, delta)
         await self.session.commit()
+        return sum(total for (_, period, _), (total, _) in delta.periods.items() if period == "week")
+
+
+class TodoSearchRepository(AbstractRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _add(self, model):
+        self.session.add(model)
+
+    def _add_all(self, models):
+        self.session.add_all(models)
+
+    async def search_records(
+        self, user_id: int, query: str, cursor: tuple[float, str, int] | None, page_size: int
+    ) -> list[read_models.SearchRecord]:
+        return await self._search_records(user_id, query, cursor, page_size, descending=True)
+
+    async def get_prev_search_records_and_next_search_records(
+        self,
+        user_id: int,
+        query: str,
+        cursor: tuple[float, str, int] | None,
+        next_cursor: tuple[float, str, int] | None,
+        page_size: int,
+    ) -> tuple[list[read_models.SearchRecord], list[read_models.SearchRecord]]:
+        prev_records, next_records = [], []
+        if cursor:
+            prev_records = await self._search_records(user_id, query, cursor, page_size, descending=False)
+        if next_cursor:
+            next_records = await self._search_records(user_id, query, next_cursor, 1, descending=True)
+        return prev_records, next_records
+
+    async def _search_records(
+        self, user_id: int, query: str, cursor: tuple[float, str, int] | None, limit: int, descending: bool
+    ) -> list[read_models.SearchRecord]:
+        # Best match first; kind and id break ties between hits of the same rank
+        if (stmt := search.get_search_statement(self.session, user_id, query)) is None:
+            return []
+        hits = stmt.selected_columns
+        columns = [hits.rank, hits.kind, hits.id]
+        if cursor:
+            stmt = stmt.where(keyset.get_keyset_condition(columns, cursor, descending))
+        stmt = stmt.order_by(*keyset.get_keyset_order_by(columns, descending)).limit(limit)
+        q = await self.session.execute(stmt)
+        return [read_models.SearchRecord(*row) for row in q]
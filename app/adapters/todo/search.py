@@ -0,0 +1,140 @@
+"""Full-text search over task contents and TodoRepo titles/descriptions
+
+Postgres matches the generated `search_vector` tsvector column of each table through its GIN index.
+SQLite has no tsvector, so each table gets an FTS5 external-content table kept in sync by triggers.
+Either way only matching rows are read, and both rank them higher-is-better.
+
+Archived tasks are searched through daily_todo_archive_tasks, which holds their contents next to the blobs.
+A task is either in daily_todo_tasks or archived, so both kinds of hits share the "daily_todo_task" kind.
+"""
+import re
+from typing import Sequence
+from sqlalchemy import (
+    Float,
+    Select,
+    cast,
+    column,
+    func,
+    inspect,
+    literal,
+    literal_column,
+    null,
+    select,
+    table,
+    union_all,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.todo import models as todo_models
+
+
+# No stemming or stop words, since tasks are written in any language
+TEXT_SEARCH_CONFIG = "simple"
+
+DAILY_TODO_TASK_SEARCH_VECTOR = f"to_tsvector('{TEXT_SEARCH_CONFIG}', content)"
+TODO_REPO_SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', title), 'A') || "
+    f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', description), 'B')"
+)
+
+# bm25 weights of the FTS5 columns, matching the A/B weights of the title and description on Postgres
+TODO_REPO_FTS_WEIGHTS = (2.0, 1.0)
+
+
+def get_fts_ddl(name: str, columns: Sequence[str]) -> list[str]:
+    """FTS5 table indexing `columns` of table `name` by its `id`, and the triggers that keep it current
+
+    One statement per item, since SQLite executes a single statement at a time.
+    """
+    fts = f"{name}_fts"
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({cols}, content='{name}', content_rowid='id')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {name} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {name} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+    ]
+
+
+def get_fts_query(query: str) -> str | None:
+    # Every word quoted, so that user input is never parsed as FTS5 syntax; the words are ANDed like on Postgres
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"' for word in words) if words else None
+
+
+def get_search_statement(session: AsyncSession, user_id: int, query: str) -> Select | None:
+    """Hits of `query` among the user's tasks, archived or not, and TodoRepos, as one select of `SearchRecord` columns
+
+    None when the query has no words to match.
+    """
+    if session.bind.dialect.name == "postgresql":
+        tasks, archived_tasks, todo_repos = _get_tsvector_selects(query)
+    else:
+        if (fts_query := get_fts_query(query)) is None:
+            return None
+        tasks, archived_tasks, todo_repos = _get_fts_selects(fts_query)
+
+    TodoRepo = todo_models.TodoRepo
+    tasks, archived_tasks = (
+        stmt.add_columns(
+            literal("daily_todo_task").label("kind"),
+            model.id,
+            model.todo_repo_id,
+            model.date,
+            model.content.label("text"),
+            null().label("description"),
+        ).where(TodoRepo.user_id == user_id)
+        for stmt, model in ((tasks, todo_models.DailyTodoTask), (archived_tasks, todo_models.DailyTodoArchiveTask))
+    )
+    todo_repos = todo_repos.add_columns(
+        literal("todo_repo").label("kind"),
+        TodoRepo.id,
+        TodoRepo.id.label("todo_repo_id"),
+        null().label("date"),
+        TodoRepo.title.label("text"),
+        TodoRepo.description,
+    ).where(TodoRepo.user_id == user_id)
+    return select(union_all(tasks, archived_tasks, todo_repos).subquery())
+
+
+def _get_tsvector_selects(query: str) -> tuple[Select, Select, Select]:
+    tsquery = func.websearch_to_tsquery(cast(TEXT_SEARCH_CONFIG, postgresql.REGCONFIG), query)
+    TodoRepo = todo_models.TodoRepo
+    selects = []
+    for model in (todo_models.DailyTodoTask, todo_models.DailyTodoArchiveTask, TodoRepo):
+        # Not mapped, so that the ORM never loads or writes it
+        vector = inspect(model).local_table.c.search_vector
+        stmt = select(func.ts_rank(vector, tsquery, type_=Float).label("rank")).select_from(model)
+        if model is not TodoRepo:
+            stmt = stmt.join(TodoRepo, TodoRepo.id == model.todo_repo_id)
+        selects.append(stmt.where(vector.bool_op("@@")(tsquery)))
+    return selects[0], selects[1], selects[2]
+
+
+def _get_fts_selects(fts_query: str) -> tuple[Select, Select, Select]:
+    TodoRepo = todo_models.TodoRepo
+    selects = []
+    for model in (todo_models.DailyTodoTask, todo_models.DailyTodoArchiveTask):
+        fts = table(f"{inspect(model).local_table.name}_fts", column("rowid"))
+        selects.append(
+            select((-func.bm25(literal_column(fts.name), type_=Float)).label("rank"))
+            .select_from(fts)
+            .join(model, model.id == fts.c.rowid)
+            .join(TodoRepo, TodoRepo.id == model.todo_repo_id)
+            .where(literal_column(fts.name).bool_op("MATCH")(fts_query))
+        )
+    todo_repo_fts = table("todo_repos_fts", column("rowid"))
+    todo_repos = (
+        select((-func.bm25(literal_column(todo_repo_fts.name), *TODO_REPO_FTS_WEIGHTS, type_=Float)).label("rank"))
+        .select_from(todo_repo_fts)
+        .join(TodoRepo, TodoRepo.id == todo_repo_fts.c.rowid)
+        .where(literal_column(todo_repo_fts.name).bool_op("MATCH")(fts_query))
+    )
+    return selects[0], selects[1], todo_repos
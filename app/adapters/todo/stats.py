@@ -0,0 +1,155 @@
+import datetime
+import itertools
+import threading
+from collections import OrderedDict, defaultdict
+from functools import cache
+from typing import Iterable, Literal
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import settings
+from app.adapters import dialect
+from app.domain.todo import models as todo_models
+
+
+Period = Literal["week", "month"]
+PERIODS: tuple[Period, ...] = ("week", "month")
+
+
+def get_period_start(date: datetime.date, period: Period) -> datetime.date:
+    if period == "week":
+        return date - datetime.timedelta(days=date.weekday())
+    return date.replace(day=1)
+
+
+def get_next_period_start(start: datetime.date, period: Period) -> datetime.date:
+    if period == "week":
+        return start + datetime.timedelta(days=7)
+    return datetime.date(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+
+def iter_period_starts(since: datetime.date, until: datetime.date, period: Period):
+    start = get_period_start(since, period)
+    while start <= until:
+        yield start
+        start = get_next_period_start(start, period)
+
+
+class TaskStatsDelta:
+    """Changes to the task totals of TodoRepos, accumulated per rollup row"""
+
+    def __init__(self):
+        # (todo_repo_id, period, start) -> [total, completed]
+        self.periods: defaultdict[tuple[int, str, datetime.date], list[int]] = defaultdict(lambda: [0, 0])
+        # (todo_repo_id, weekday) -> [total, completed]
+        self.weekdays: defaultdict[tuple[int, int], list[int]] = defaultdict(lambda: [0, 0])
+
+    def __bool__(self) -> bool:
+        return any(any(v) for v in self.periods.values()) or any(any(v) for v in self.weekdays.values())
+
+    def add(self, todo_repo_id: int, date: datetime.date, total: int, completed: int) -> None:
+        for period in PERIODS:
+            values = self.periods[(todo_repo_id, period, get_period_start(date, period))]
+            values[0] += total
+            values[1] += completed
+        values = self.weekdays[(todo_repo_id, date.weekday())]
+        values[0] += total
+        values[1] += completed
+
+    def add_days(self, todo_repo_id: int, days: Iterable[tuple[datetime.date, int, int]]) -> None:
+        for date, total, completed in days:
+            self.add(todo_repo_id, date, total, completed)
+
+    def get_keys(self) -> set[tuple[int, int]]:
+        """(todo_repo_id, year) of every changed day"""
+        return {(todo_repo_id, start.year) for (todo_repo_id, period, start) in self.periods if period == "month"}
+
+    def get_period_values(self) -> list[dict]:
+        return [
+            dict(todo_repo_id=todo_repo_id, period=period, start=start, total=total, completed=completed)
+            for (todo_repo_id, period, start), (total, completed) in self.periods.items()
+            if total or completed
+        ]
+
+    def get_weekday_values(self) -> list[dict]:
+        return [
+            dict(todo_repo_id=todo_repo_id, weekday=weekday, total=total, completed=completed)
+            for (todo_repo_id, weekday), (total, completed) in self.weekdays.items()
+            if total or completed
+        ]
+
+
+def _get_task_key(daily_todo_task: todo_models.DailyTodoTask) -> tuple[int, datetime.date]:
+    # A task appended to a DailyTodo gets its foreign key columns only at flush time
+    if daily_todo_task.todo_repo_id is None and (daily_todo := daily_todo_task.daily_todo) is not None:
+        return daily_todo.todo_repo_id, daily_todo.date
+    return daily_todo_task.todo_repo_id, daily_todo_task.date
+
+
+def collect_task_stats_delta(session: AsyncSession, delta: TaskStatsDelta | None = None) -> TaskStatsDelta:
+    """Task changes pending in `session`, as they would change the rollups once flushed, added onto `delta`"""
+    delta = delta if delta is not None else TaskStatsDelta()
+    for obj in session.new:
+        if isinstance(obj, todo_models.DailyTodoTask):
+            delta.add(*_get_task_key(obj), 1, int(bool(obj.is_completed)))
+    for obj in session.dirty:
+        if isinstance(obj, todo_models.DailyTodoTask):
+            history = inspect(obj).attrs.is_completed.history
+            if history.added and history.deleted:
+                delta.add(*_get_task_key(obj), 0, int(history.added[0]) - int(history.deleted[0]))
+    for obj in session.deleted:
+        if isinstance(obj, todo_models.DailyTodoTask):
+            delta.add(*_get_task_key(obj), -1, -int(bool(obj.is_completed)))
+    return delta
+
+
+async def add_task_stats(session: AsyncSession, delta: TaskStatsDelta) -> None:
+    """Add `delta` onto the rollup rows, in the transaction of the task changes it accounts for"""
+    insert = dialect.get_insert(session)
+    for model, values, index_elements in (
+        (todo_models.TodoRepoPeriodStats, delta.get_period_values(), ["todo_repo_id", "period", "start"]),
+        (todo_models.TodoRepoWeekdayStats, delta.get_weekday_values(), ["todo_repo_id", "weekday"]),
+    ):
+        if not values:
+            continue
+        # Rows are sorted so that concurrent upserts lock them in the same order
+        stmt = insert(model).values(sorted(values, key=lambda v: tuple(v[e] for e in index_elements)))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_=dict(total=model.total + stmt.excluded.total, completed=model.completed + stmt.excluded.completed),
+        )
+        await session.execute(stmt)
+
+
+class TaskVersions:
+    """In-process versions of the task totals per (todo_repo_id, year), bumped after each committed change
+
+    Versions come from one increasing counter, and a key evicted from the LRU reads as the largest version
+    evicted so far. A reader holding an older version therefore always sees a newer one after a change,
+    even once the key is gone. Other workers don't see the bumps, so caches keyed by them need a TTL too.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._versions: OrderedDict[tuple[int, int | None], int] = OrderedDict()
+        self._counter = itertools.count(1)
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[int, int | None]) -> int:
+        with self._lock:
+            return self._versions.get(key, self._floor)
+
+    def bump(self, key: tuple[int, int | None]) -> None:
+        with self._lock:
+            self._versions[key] = next(self._counter)
+            self._versions.move_to_end(key)
+            while len(self._versions) > self.maxsize:
+                _, version = self._versions.popitem(last=False)
+                self._floor = max(self._floor, version)
+
+
+@cache
+def get_task_versions() -> TaskVersions:
+    # (todo_repo_id, None) is bumped when the TodoRepo itself is updated or goes away
+    return TaskVersions(maxsize=settings.GRAPH_SETTINGS.GRAPH_CACHE_SIZE * 4)
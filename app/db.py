@@ -1,24 +1,82 @@
+from functools import cache
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
+    AsyncEngine,
     AsyncSession,
 )
 
 from app import settings
-from app.adapters.auth.persistent_orm import start_mappers as auth_start_mappers
-from app.adapters.todo.persistent_orm import start_mappers as todo_start_mappers
 
 
-if settings.STAGE != "testing":
+_mappers_started = False
+
+
+def init_mappers():
+    # ORM modules are imported here so that importing the app does not configure the mappers as a side effect
+    global _mappers_started
+    if _mappers_started:
+        return
+
+    from app.adapters.auth.persistent_orm import start_mappers as auth_start_mappers
+    from app.adapters.todo.persistent_orm import start_mappers as todo_start_mappers
+    from app.adapters.job.persistent_orm import start_mappers as job_start_mappers
+    from app.adapters.shard.persistent_orm import start_mappers as shard_start_mappers
+    from app.adapters.idempotency.persistent_orm import start_mappers as idempotency_start_mappers
+
     auth_start_mappers()
     todo_start_mappers()
+    job_start_mappers()
+    shard_start_mappers()
+    idempotency_start_mappers()
+    _mappers_started = True
+
+
+def create_engine(dsn: str) -> AsyncEngine:
+    engine = create_async_engine(dsn, future=True)
+    if settings.SLOW_QUERY_SETTINGS.SLOW_QUERY_ENABLED:
+        from app.adapters.slow_queries import get_slow_query_log
+
+        get_slow_query_log().install(engine)
+    return engine
+
+
+@cache
+def get_engine() -> AsyncEngine:
+    # The DBAPI driver (asyncpg) is imported by the engine, so the engine is created on first use
+    return create_engine(settings.POSTGRES_SETTINGS.get_dsn())
+
 
+DEFAULT_SHARD = "default"
 
-engine = create_async_engine(settings.POSTGRES_SETTINGS.get_dsn(), future=True)
-async_session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False, class_=AsyncSession)
+
+def is_sharded() -> bool:
+    return bool(settings.SHARD_SETTINGS.SHARD_DSNS)
+
+
+def get_shard_names() -> list[str]:
+    """Shards holding user data, in SHARD_DSNS order; without SHARD_DSNS the main database is the only one"""
+    return list(settings.SHARD_SETTINGS.SHARD_DSNS) or [DEFAULT_SHARD]
+
+
+@cache
+def get_shard_engine(shard: str) -> AsyncEngine:
+    # One engine, and so one connection pool, per shard, created on first use
+    if not is_sharded() and shard == DEFAULT_SHARD:
+        return get_engine()
+    return create_engine(settings.SHARD_SETTINGS.SHARD_DSNS[shard])
+
+
+async def dispose_engines() -> None:
+    await get_engine().dispose()
+    if is_sharded():
+        for shard in get_shard_names():
+            await get_shard_engine(shard).dispose()
+
+
+async_session_factory = async_sessionmaker(expire_on_commit=False, autoflush=False, class_=AsyncSession)
 
 
 async def get_session():
-    async with async_session_factory() as session:
+    async with async_session_factory(bind=get_engine()) as session:
         yield session
-
@@ -1,5 +1,5 @@
-import bcrypt
 from dataclasses import dataclass, field
+from datetime import datetime
 
 from app import settings
 from app.domain.base_models import Base
@@ -26,6 +26,8 @@ class User(Base):
         )
     
     def hash_password(self) -> None:
+        import bcrypt
+
         hashed_password: bytes = bcrypt.hashpw(
             self.password.encode(settings.AUTH_SETTINGS.HASH_ENCODING),
             salt=bcrypt.gensalt(),
@@ -33,7 +35,23 @@ class User(Base):
         self.password = hashed_password.decode(settings.AUTH_SETTINGS.HASH_ENCODING)
     
     def verify_password(self, plain_password: str) -> bool:
+        import bcrypt
+
         return bcrypt.checkpw(
             plain_password.encode(settings.AUTH_SETTINGS.HASH_ENCODING),
             self.password.encode(settings.AUTH_SETTINGS.HASH_ENCODING)
         )
+
+
+@dataclass
+class RevokedToken:
+    jti: str = field(default="")
+    expires_at: datetime = field(default_factory=datetime.utcnow)
+    revoked_at: datetime = field(init=False)
+
+    def dict(self) -> dict:
+        return dict(
+            jti=self.jti,
+            expires_at=self.expires_at,
+            revoked_at=self.revoked_at,
+        )
@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class IdempotencyKey:
+    """Response to the first request made with an Idempotency-Key
+
+    `status_code` is None while that request runs; until `expires_at` the key is then held by it.
+    """
+
+    user_id: int = field(default=0)
+    key: str = field(default="")
+    fingerprint: str = field(default="")
+    status_code: int | None = field(default=None)
+    body: bytes | None = field(default=None)
+    expires_at: datetime = field(default_factory=utcnow)
+    created_at: datetime = field(init=False)
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
@@ -0,0 +1,47 @@
+import enum
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from app.domain.base_models import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job(Base):
+    name: str = field(default="")
+    payload: dict = field(default_factory=dict)
+    queue: str = field(default="default")
+    status: str = field(default=JobStatus.QUEUED.value)
+    attempts: int = field(default=0)
+    max_attempts: int = field(default=1)
+    run_at: datetime = field(default_factory=utcnow)
+    locked_at: datetime | None = field(default=None)
+    last_error: str | None = field(default=None)
+    schedule_key: str | None = field(default=None)  # name@run_at of recurring jobs, unique
+
+    def dict(self) -> dict:
+        return dict(
+            id=self.id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            name=self.name,
+            payload=self.payload,
+            queue=self.queue,
+            status=self.status,
+            attempts=self.attempts,
+            max_attempts=self.max_attempts,
+            run_at=self.run_at,
+            locked_at=self.locked_at,
+            last_error=self.last_error,
+            schedule_key=self.schedule_key,
+        )
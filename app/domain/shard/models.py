@@ -0,0 +1,10 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class UserShard:
+    """Shard holding the TodoRepos of a user; `moving_to` is set while they are moved to another shard"""
+
+    user_id: int = field(default=0)
+    shard: str = field(default="")
+    moving_to: str | None = field(default=None)
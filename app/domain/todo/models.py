@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import date
+from datetime import date, datetime
 
 from app.domain.base_models import Base
 
@@ -11,6 +11,8 @@ class TodoRepo(Base):
     title: str = field(default="")
     description: str = field(default="")
     user_id: int = field(default=0)
+    is_public: bool = field(default=False)
+    version: int = field(init=False)
 
     # relationships
     daily_todos: list[DailyTodo] = field(default_factory=list)
@@ -23,6 +25,8 @@ class TodoRepo(Base):
             title=self.title,
             description=self.description,
             user_id=self.user_id,
+            is_public=self.is_public,
+            version=self.version,
         )
 
 
@@ -54,6 +58,7 @@ class DailyTodoTask(Base):
     is_completed: bool = field(default=False)
     todo_repo_id: int = field(init=False)
     date: date = field(init=False)
+    version: int = field(init=False)
 
     # relationships
     daily_todo: DailyTodo = field(init=False)
@@ -67,4 +72,70 @@ class DailyTodoTask(Base):
             is_completed=self.is_completed,
             todo_repo_id=self.todo_repo_id,
             date=self.date,
+            version=self.version,
         )
+
+
+@dataclass
+class TodoRepoCount:
+    """Number of TodoRepos of a user, maintained alongside every create and delete"""
+
+    user_id: int = field(default=0)
+    count: int = field(default=0)
+
+
+@dataclass
+class TodoRepoPeriodStats:
+    """Task totals of a TodoRepo per week or month, starting at `start`"""
+
+    todo_repo_id: int = field(default=0)
+    period: str = field(default="week")
+    start: date = field(default=date.today())
+    total: int = field(default=0)
+    completed: int = field(default=0)
+
+    def dict(self) -> dict:
+        return dict(
+            period=self.period,
+            start=self.start,
+            total=self.total,
+            completed=self.completed,
+        )
+
+
+@dataclass
+class TodoRepoWeekdayStats:
+    """Task totals of a TodoRepo per weekday, 0 being Monday"""
+
+    todo_repo_id: int = field(default=0)
+    weekday: int = field(default=0)
+    total: int = field(default=0)
+    completed: int = field(default=0)
+
+    def dict(self) -> dict:
+        return dict(
+            weekday=self.weekday,
+            total=self.total,
+            completed=self.completed,
+        )
+
+
+@dataclass
+class DailyTodoArchive:
+    """Compressed DailyTodos and DailyTodoTasks of one TodoRepo and year, moved out of the hot tables"""
+
+    todo_repo_id: int = field(default=0)
+    year: int = field(default=0)
+    data: bytes = field(default=b"")
+    version: int = field(default=1)
+    archived_at: datetime = field(init=False)
+
+
+@dataclass
+class DailyTodoArchiveTask:
+    """Content of a DailyTodoTask held in a DailyTodoArchive, kept out of the blob so that search can find it"""
+
+    id: int = field(default=0)
+    todo_repo_id: int = field(default=0)
+    date: date = field(default=date.today())
+    content: str = field(default="")
@@ -0,0 +1,89 @@
+"""Read-only records built straight from column rows
+
+Unlike the mapped models they carry no instrumentation or session state, so they are cheap to build in bulk.
+The field order is the column order they are selected in.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+
+
+@dataclass(slots=True)
+class TodoRepoRecord:
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    title: str
+    description: str
+    user_id: int
+    is_public: bool
+    version: int
+
+    def dict(self) -> dict:
+        return dict(
+            id=self.id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            title=self.title,
+            description=self.description,
+            user_id=self.user_id,
+            is_public=self.is_public,
+            version=self.version,
+        )
+
+
+@dataclass(slots=True)
+class DailyTodoRecord:
+    todo_repo_id: int
+    date: date
+
+    def dict(self) -> dict:
+        return dict(
+            todo_repo_id=self.todo_repo_id,
+            date=self.date,
+        )
+
+
+@dataclass(slots=True)
+class DailyTodoTaskRecord:
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    content: str
+    is_completed: bool
+    todo_repo_id: int
+    date: date
+    version: int
+
+    def dict(self) -> dict:
+        return dict(
+            id=self.id,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            content=self.content,
+            is_completed=self.is_completed,
+            todo_repo_id=self.todo_repo_id,
+            date=self.date,
+            version=self.version,
+        )
+
+
+@dataclass(slots=True)
+class SearchRecord:
+    rank: float
+    kind: str  # "daily_todo_task" or "todo_repo"
+    id: int
+    todo_repo_id: int
+    date: date | None  # of tasks only
+    text: str  # task content or TodoRepo title
+    description: str | None  # of TodoRepos only
+
+    def dict(self) -> dict:
+        return dict(
+            rank=self.rank,
+            kind=self.kind,
+            id=self.id,
+            todo_repo_id=self.todo_repo_id,
+            date=self.date,
+            text=self.text,
+            description=self.description,
+        )
@@ -3,10 +3,11 @@ from fastapi_restful.cbv import cbv
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Annotated
 
-from app.adapters.auth.repository import UserRepository
+from app.adapters.auth.repository import UserRepository, RevokedTokenRepository
 from app.entrypoints.fastapi.api_v1 import enums, examples
 from app.entrypoints.fastapi.api_v1.auth import in_schemas, out_schemas
 from app.entrypoints.fastapi.security import OAuth2PasswordRequestFormWithValidation, JWTAuthorizer
+from app.entrypoints.fastapi.rate_limit import login_rate_limiter, signup_rate_limiter
 from app.service.auth.handlers import UserService
 from app.db import get_session
 from app.service import exceptions
@@ -23,7 +24,8 @@ class Auth:
     @router.post(
         "/signup",
         status_code=status.HTTP_201_CREATED,
-        responses=examples.get_error_responses([status.HTTP_400_BAD_REQUEST]),
+        responses=examples.get_error_responses([status.HTTP_400_BAD_REQUEST, status.HTTP_429_TOO_MANY_REQUESTS]),
+        dependencies=[Depends(signup_rate_limiter)],
     )
     async def user_signup(self, sign_up_in: in_schemas.UserSignUpIn) -> out_schemas.UserResponse:
         try:
@@ -46,7 +48,10 @@ class Auth:
     @router.post(
         "/login",
         status_code=status.HTTP_200_OK,
-        responses=examples.get_error_responses([status.HTTP_401_UNAUTHORIZED, status.HTTP_404_NOT_FOUND]),
+        responses=examples.get_error_responses(
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_404_NOT_FOUND, status.HTTP_429_TOO_MANY_REQUESTS]
+        ),
+        dependencies=[Depends(login_rate_limiter)],
     )
     async def user_login(
         self, login_in: Annotated[OAuth2PasswordRequestFormWithValidation, Depends()], response: Response
@@ -64,7 +69,14 @@ class Auth:
         return out_schemas.LoginResponse(ok=True, message=enums.ResponseMessage.LOGIN_SUCCESS, data=None)
 
     @router.post("/logout", status_code=status.HTTP_200_OK)
-    async def user_logout(self, response: Response) -> out_schemas.LogoutResponse:
+    async def user_logout(
+        self,
+        response: Response,
+        access_token: str | None = Depends(JWTAuthorizer.JWT_COOKIE_AUTH),
+        refresh_token: str | None = Cookie(None),
+    ) -> out_schemas.LogoutResponse:
+        repository: RevokedTokenRepository = RevokedTokenRepository(self.session)
+        await self.user_service.logout_user(access_token, refresh_token, repository=repository)
         response.set_cookie(key="access_token", expires=0, max_age=0, httponly=True, secure=True)
         response.set_cookie(key="refresh_token", expires=0, max_age=0, httponly=True, secure=True)
 
@@ -78,7 +90,12 @@ class Auth:
     async def refresh_login(self, response: Response, refresh_token: str | None = Cookie(None)):
         try:
             repository: UserRepository = UserRepository(self.session)
-            res = await self.user_service.refresh_login(refresh_token=refresh_token, repository=repository)
+            revoked_token_repository: RevokedTokenRepository = RevokedTokenRepository(self.session)
+            res = await self.user_service.refresh_login(
+                refresh_token=refresh_token,
+                repository=repository,
+                revoked_token_repository=revoked_token_repository,
+            )
             response.set_cookie(key="access_token", value=res["access_token"], httponly=True, secure=True)
             response.set_cookie(key="refresh_token", value=res["refresh_token"], httponly=True, secure=True)
         except exceptions.NoTokenExists as e:
@@ -6,6 +6,7 @@ class ResponseMessage(str, Enum):
     FAIL = "Request Fail"
     CREATE_SUCCESS = "Create Successfully"
     UPDATE_SUCCESS = "Update Successfully"
+    DELETE_SUCCESS = "Delete Successfully"
     LOGIN_SUCCESS = "Login Successfully"
     LOGOUT_SUCCESS = "Logout Successfully"
     REFRESH_SUCCESS = "Refresh Successfully"
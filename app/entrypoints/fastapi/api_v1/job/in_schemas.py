@@ -0,0 +1,8 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class JobCreateIn(BaseModel):
+    name: str
+    payload: dict = {}
+    run_at: datetime | None = None
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, status, Depends, Path, HTTPException
+from fastapi_restful.cbv import cbv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.entrypoints.fastapi.api_v1.job import in_schemas, out_schemas
+from app.entrypoints.fastapi.api_v1 import enums, examples
+from app.entrypoints.jobs import handlers  # noqa: F401  registers the jobs that can be enqueued
+from app.service.job.handlers import JobService
+from app.service import exceptions
+from app.adapters.job.repository import JobRepository
+from app.db import get_session
+
+
+router = APIRouter()
+
+
+@cbv(router)
+class JobAdmin:
+    session: AsyncSession = Depends(get_session)
+    job_service: JobService = Depends()
+
+    @router.post(
+        "/jobs",
+        status_code=status.HTTP_201_CREATED,
+        responses=examples.get_error_responses([status.HTTP_400_BAD_REQUEST]),
+    )
+    async def enqueue_job(self, create_in: in_schemas.JobCreateIn) -> out_schemas.JobResponse:
+        try:
+            repository: JobRepository = JobRepository(self.session)
+            res = await self.job_service.enqueue(
+                create_in.name, create_in.payload, create_in.run_at, repository=repository
+            )
+        except exceptions.JobNotRegistered as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return out_schemas.JobResponse(
+            ok=True, message=enums.ResponseMessage.CREATE_SUCCESS, data=out_schemas.JobOut(**res)
+        )
+
+    @router.get(
+        "/jobs/{job_id}",
+        status_code=status.HTTP_200_OK,
+        responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND]),
+    )
+    async def get_job(self, job_id: int = Path(...)) -> out_schemas.JobResponse:
+        try:
+            repository: JobRepository = JobRepository(self.session)
+            res = await self.job_service.get_job(job_id, repository=repository)
+        except exceptions.JobNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        return out_schemas.JobResponse(ok=True, message=enums.ResponseMessage.SUCCESS, data=out_schemas.JobOut(**res))
@@ -0,0 +1,24 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+from app.entrypoints.fastapi.api_v1.schemas import Response
+
+
+class JobOut(BaseModel):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    name: str
+    payload: dict
+    queue: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+    locked_at: datetime | None
+    last_error: str | None
+    schedule_key: str | None
+
+
+class JobResponse(Response):
+    data: JobOut
@@ -1,15 +1,23 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from app.entrypoints.fastapi.api_v1.todo.todo import router as todo_router
+from app.entrypoints.fastapi.api_v1.todo.internal import router as todo_internal_router
+from app.entrypoints.fastapi.api_v1.job.internal import router as job_internal_router
+from app.entrypoints.fastapi.api_v1.slow_query.internal import router as slow_query_internal_router
 from app.entrypoints.fastapi.api_v1.auth.auth import router as user_router
+from app.entrypoints.fastapi.security import require_admin
 from app import settings
 
 api_router = APIRouter(prefix=settings.API_V1_STR)
 external_router = APIRouter()
-internal_router = APIRouter()
+internal_router = APIRouter(dependencies=[Depends(require_admin)])
 
 external_router.include_router(todo_router, prefix="/todo", tags=["todo"])
 external_router.include_router(user_router, prefix="/auth", tags=["auth"])
 
+internal_router.include_router(todo_internal_router, prefix="/todo", tags=["internal"])
+internal_router.include_router(job_internal_router, tags=["internal"])
+internal_router.include_router(slow_query_internal_router, tags=["internal"])
+
 api_router.include_router(external_router, prefix="/external")
 api_router.include_router(internal_router, prefix="/internal")
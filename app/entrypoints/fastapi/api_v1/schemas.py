@@ -18,14 +18,17 @@ class ErrorResponse(BaseModel):
 
 
 class Cursors(BaseModel):
-    prev: int | None = Field(None)
-    next: int | None = Field(None)
+    # Integer ids for single-key listings, opaque strings for composite sort keys
+    prev: int | str | None = Field(None)
+    next: int | str | None = Field(None)
 
 
 class Paging(BaseModel):
     cursors: Cursors
     has_prev: bool
     has_next: bool
+    total: int | None = Field(None)
+    total_is_estimate: bool | None = Field(None)
 
 
 class PaginationResponse(Response):
@@ -35,3 +38,4 @@ class PaginationResponse(Response):
 class PaginationQueryParams(BaseModel):
     cursor: Optional[int] = Field(None)
     page_size: int = Field(10)
+    include_total: bool = Field(False)
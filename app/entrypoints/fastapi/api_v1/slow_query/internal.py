@@ -0,0 +1,35 @@
+from typing import Literal
+
+from fastapi import APIRouter, status, Query
+from fastapi_restful.cbv import cbv
+
+from app.entrypoints.fastapi.api_v1.slow_query import out_schemas
+from app.entrypoints.fastapi.api_v1 import enums
+from app.adapters.slow_queries import get_slow_query_log
+
+
+router = APIRouter()
+
+
+@cbv(router)
+class SlowQueryAdmin:
+    # The log is per worker process, so each call reports on the worker that serves it
+    @router.get("/slow-queries", status_code=status.HTTP_200_OK)
+    async def get_slow_queries(
+        self,
+        order_by: Literal["total_time", "max_time", "count", "last_seen"] = Query("total_time"),
+        limit: int = Query(50, ge=1, le=500),
+    ) -> out_schemas.SlowQueriesResponse:
+        entries = get_slow_query_log().get_entries(order_by=order_by, limit=limit)
+
+        return out_schemas.SlowQueriesResponse(
+            ok=True,
+            message=enums.ResponseMessage.SUCCESS,
+            data=[out_schemas.SlowQueryOut(**entry.dict()) for entry in entries],
+        )
+
+    @router.delete("/slow-queries", status_code=status.HTTP_200_OK)
+    async def clear_slow_queries(self) -> out_schemas.SlowQueriesResponse:
+        get_slow_query_log().clear()
+
+        return out_schemas.SlowQueriesResponse(ok=True, message=enums.ResponseMessage.DELETE_SUCCESS, data=[])
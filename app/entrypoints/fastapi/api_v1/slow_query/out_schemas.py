@@ -0,0 +1,25 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+from app.entrypoints.fastapi.api_v1.schemas import Response
+
+
+class SlowQueryCount(BaseModel):
+    value: str
+    count: int
+
+
+class SlowQueryOut(BaseModel):
+    statement: str
+    count: int
+    total_time: float
+    mean_time: float
+    max_time: float
+    last_seen: datetime | None
+    parameter_shapes: list[SlowQueryCount]
+    call_sites: list[SlowQueryCount]
+    explain: str | None
+
+
+class SlowQueriesResponse(Response):
+    data: list[SlowQueryOut]
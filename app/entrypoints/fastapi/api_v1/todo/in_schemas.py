@@ -1,11 +1,25 @@
-from pydantic import BaseModel, model_validator
+from typing import Literal
+from pydantic import BaseModel, Field, model_validator
 
 
 class TodoRepoCreateIn(BaseModel):
     title: str
     description: str
+    is_public: bool = Field(False, description="Serve the contribution graph to anyone")
 
 
 class TodoRepoUpdateIn(BaseModel):
     title: str
     description: str
+    is_public: bool | None = Field(None, description="Serve the contribution graph to anyone; None keeps it as is")
+
+
+class DailyTodoTasksIsCompletedUpdateIn(BaseModel):
+    ids: list[int] | Literal["all"] = Field(description='Ids of the tasks, or "all" for every task of the day')
+    is_completed: bool
+
+    @model_validator(mode="after")
+    def check_ids(self) -> "DailyTodoTasksIsCompletedUpdateIn":
+        if self.ids != "all" and not 0 < len(self.ids) <= 1000:
+            raise ValueError("ids must hold between 1 and 1000 task ids")
+        return self
@@ -0,0 +1,33 @@
+from fastapi import APIRouter, status, Depends
+from fastapi_restful.cbv import cbv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.entrypoints.fastapi.api_v1.todo import out_schemas
+from app.entrypoints.fastapi.api_v1 import schemas as general_schemas
+from app.entrypoints.fastapi.api_v1 import enums
+from app.service.todo.handlers import TodoRepoService
+from app.adapters.todo.repository import TodoRepoRepository
+from app.entrypoints.fastapi.sharding import get_shard_sessions
+
+
+router = APIRouter()
+
+
+@cbv(router)
+class TodoRepoAdmin:
+    sessions: list[AsyncSession] = Depends(get_shard_sessions)
+    todo_service: TodoRepoService = Depends()
+
+    @router.get("/todo-repos", status_code=status.HTTP_200_OK)
+    async def get_all_todo_repos(
+        self, pagination: general_schemas.PaginationQueryParams = Depends()
+    ) -> out_schemas.TodoRepoPaginationResponse:
+        repositories = [TodoRepoRepository(session) for session in self.sessions]
+        res = await self.todo_service.get_all_todo_repos(
+            cursor=pagination.cursor,
+            page_size=pagination.page_size,
+            include_total=pagination.include_total,
+            repositories=repositories,
+        )
+
+        return out_schemas.TodoRepoPaginationResponse(ok=True, message=enums.ResponseMessage.SUCCESS, **res)
@@ -1,7 +1,8 @@
 from datetime import datetime, date
+from typing import Literal
 from pydantic import BaseModel
 
-from app.entrypoints.fastapi.api_v1.schemas import Response, PaginationResponse
+from app.entrypoints.fastapi.api_v1.schemas import Response, PaginationResponse, Paging
 
 
 class TodoRepoOut(BaseModel):
@@ -11,6 +12,8 @@ class TodoRepoOut(BaseModel):
     title: str
     description: str
     user_id: int
+    is_public: bool  # graph.svg is served to anyone
+    version: int  # sent back in If-Match to update the TodoRepo only if nobody else changed it
 
 
 class DailyTodoOut(BaseModel):
@@ -26,6 +29,43 @@ class DailyTodoTaskOut(BaseModel):
     is_completed: bool
     todo_repo_id: int
     date: date
+    version: int  # sent back in If-Match to update the task only if nobody else changed it
+
+
+class PeriodStatsOut(BaseModel):
+    start: date
+    total: int
+    completed: int
+    completion_rate: float
+
+
+class WeekdayStatsOut(BaseModel):
+    weekday: int  # 0 is Monday
+    total: int
+    completed: int
+    completion_rate: float
+
+
+class TodoRepoStatsOut(BaseModel):
+    todo_repo_id: int
+    period: Literal["week", "month"]
+    periods: list[PeriodStatsOut]
+    weekdays: list[WeekdayStatsOut]
+
+
+class SearchResultOut(BaseModel):
+    rank: float
+    kind: Literal["daily_todo_task", "todo_repo"]
+    id: int
+    todo_repo_id: int
+    date: date | None  # of tasks only
+    text: str  # task content or TodoRepo title
+    description: str | None  # of TodoRepos only
+
+
+class DailyTodoTasksIsCompletedOut(BaseModel):
+    daily_todo_tasks: list[DailyTodoTaskOut]
+    not_found_ids: list[int]
 
 
 class TodoRepoResponse(Response):
@@ -40,9 +80,26 @@ class DailyTodoResponse(Response):
     data: DailyTodoOut
 
 
+class DailyTodoPaginationResponse(PaginationResponse):
+    data: list[DailyTodoOut]
+
+
 class DailyTodoTaskResponse(Response):
     data: DailyTodoTaskOut
 
 
 class DailyTodoTasksResponse(Response):
     data: list[DailyTodoTaskOut]
+    paging: Paging | None = None  # set only when the tasks are paginated
+
+
+class DailyTodoTasksIsCompletedResponse(Response):
+    data: DailyTodoTasksIsCompletedOut
+
+
+class SearchPaginationResponse(PaginationResponse):
+    data: list[SearchResultOut]
+
+
+class TodoRepoStatsResponse(Response):
+    data: TodoRepoStatsOut
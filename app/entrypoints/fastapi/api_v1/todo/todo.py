@@ -1,16 +1,33 @@
 import datetime
-from fastapi import APIRouter, status, Depends, Path, Body, HTTPException
+from typing import Literal
+from fastapi import APIRouter, status, Depends, Path, Body, Query, HTTPException, Header, Request, Response
 from fastapi_restful.cbv import cbv
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.entrypoints.fastapi.security import JWTAuthorizer
+from app.entrypoints.fastapi.idempotency import (
+    get_idempotency_store,
+    get_idempotency_key_repository,
+    get_request_fingerprint,
+)
+from app.entrypoints.fastapi.graph import get_graph_cache, render_contribution_graph, etag_matches
 from app.entrypoints.fastapi.api_v1.todo import in_schemas, out_schemas
 from app.entrypoints.fastapi.api_v1 import schemas as general_schemas, examples
 from app.entrypoints.fastapi.api_v1 import enums
-from app.service.todo.handlers import TodoRepoService, DailyTodoService
+from app.service.todo.handlers import TodoRepoService, DailyTodoService, TodoRepoStatsService, TodoSearchService
 from app.service import exceptions
-from app.adapters.todo.repository import TodoRepoRepository, DailyTodoRepository
-from app.db import get_session
+from app.adapters.todo import stats
+from app.adapters.idempotency.repository import IdempotencyKeyRepository
+from app.adapters.todo.repository import (
+    TodoRepoRepository,
+    DailyTodoRepository,
+    TodoRepoStatsRepository,
+    TodoSearchRepository,
+)
+from app.entrypoints.fastapi.sharding import TodoRepoSessions, get_user_session
+from app.entrypoints.fastapi.versioning import get_if_match_version
+from app import settings
 
 
 router = APIRouter()
@@ -18,59 +35,203 @@ router = APIRouter()
 
 @cbv(router)
 class TodoRepo:
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_user_session)
     todo_service: TodoRepoService = Depends()
     user_info: JWTAuthorizer.UserInfo = Depends(JWTAuthorizer.get_user_info)
 
     @router.post("/todo-repos", status_code=status.HTTP_201_CREATED)
-    async def create_todo_repo(self, create_in: in_schemas.TodoRepoCreateIn) -> out_schemas.TodoRepoResponse:
-        repository: TodoRepoRepository = TodoRepoRepository(self.session)
-        res = await self.todo_service.create_todo_repo(
-            title=create_in.title,
-            description=create_in.description,
-            user_id=self.user_info.user_id,
-            repository=repository,
-        )
+    async def create_todo_repo(
+        self,
+        request: Request,
+        create_in: in_schemas.TodoRepoCreateIn,
+        idempotency_key: str | None = Header(None, max_length=255),
+        idempotency_repository: IdempotencyKeyRepository = Depends(get_idempotency_key_repository),
+    ) -> out_schemas.TodoRepoResponse:
+        async def create() -> out_schemas.TodoRepoResponse:
+            repository: TodoRepoRepository = TodoRepoRepository(self.session)
+            res = await self.todo_service.create_todo_repo(
+                title=create_in.title,
+                description=create_in.description,
+                user_id=self.user_info.user_id,
+                is_public=create_in.is_public,
+                repository=repository,
+            )
 
-        return out_schemas.TodoRepoResponse(
-            ok=True, message=enums.ResponseMessage.CREATE_SUCCESS, data=out_schemas.TodoRepoOut(**res)
+            return out_schemas.TodoRepoResponse(
+                ok=True, message=enums.ResponseMessage.CREATE_SUCCESS, data=out_schemas.TodoRepoOut(**res)
+            )
+
+        return await get_idempotency_store().execute(
+            self.user_info.user_id,
+            idempotency_key,
+            await get_request_fingerprint(request),
+            status.HTTP_201_CREATED,
+            create,
+            repository=idempotency_repository,
         )
 
     @router.patch(
         "/todo-repos/{todo_repo_id}",
         status_code=status.HTTP_200_OK,
-        responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND]),
+        responses=examples.get_error_responses(
+            [status.HTTP_404_NOT_FOUND, status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT]
+        ),
     )
     async def update_todo_repo(
-        self, todo_repo_id: int = Path(...), update_in: in_schemas.TodoRepoUpdateIn = Body(...)
+        self,
+        todo_repo_id: int = Path(...),
+        update_in: in_schemas.TodoRepoUpdateIn = Body(...),
+        version: int | None = Depends(get_if_match_version),
     ) -> out_schemas.TodoRepoResponse:
         try:
             repository: TodoRepoRepository = TodoRepoRepository(self.session)
             res = await self.todo_service.update_todo_repo(
-                todo_repo_id, update_in.title, update_in.description, repository=repository
+                todo_repo_id,
+                update_in.title,
+                update_in.description,
+                version,
+                update_in.is_public,
+                repository=repository,
             )
         except exceptions.TodoRepoNotFound as e:
             raise HTTPException(status_code=404, detail=str(e))
+        except exceptions.VersionConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
 
         return out_schemas.TodoRepoResponse(
             ok=True, message=enums.ResponseMessage.UPDATE_SUCCESS, data=out_schemas.TodoRepoOut(**res)
         )
 
+    @router.delete(
+        "/todo-repos/{todo_repo_id}",
+        status_code=status.HTTP_200_OK,
+        responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND]),
+    )
+    async def delete_todo_repo(self, todo_repo_id: int = Path(...)) -> out_schemas.TodoRepoResponse:
+        try:
+            repository: TodoRepoRepository = TodoRepoRepository(self.session)
+            res = await self.todo_service.delete_todo_repo(
+                id=todo_repo_id, user_id=self.user_info.user_id, repository=repository
+            )
+        except exceptions.TodoRepoNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        return out_schemas.TodoRepoResponse(
+            ok=True, message=enums.ResponseMessage.DELETE_SUCCESS, data=out_schemas.TodoRepoOut(**res)
+        )
+
     @router.get("/todo-repos", status_code=status.HTTP_200_OK)
     async def get_todo_repos(
         self, pagination: general_schemas.PaginationQueryParams = Depends()
     ) -> out_schemas.TodoRepoPaginationResponse:
         repository: TodoRepoRepository = TodoRepoRepository(self.session)
         res = await self.todo_service.get_todo_repos(
-            cursor=pagination.cursor, page_size=pagination.page_size, repository=repository
+            user_id=self.user_info.user_id,
+            cursor=pagination.cursor,
+            page_size=pagination.page_size,
+            include_total=pagination.include_total,
+            repository=repository,
         )
 
         return out_schemas.TodoRepoPaginationResponse(ok=True, message=enums.ResponseMessage.SUCCESS, **res)
 
+    @router.get(
+        "/todo-repos/{todo_repo_id}/stats",
+        status_code=status.HTTP_200_OK,
+        responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND, status.HTTP_400_BAD_REQUEST]),
+    )
+    async def get_todo_repo_stats(
+        self,
+        todo_repo_id: int = Path(...),
+        period: Literal["week", "month"] = Query("week"),
+        since: datetime.date | None = Query(None, description="Defaults to a year before `until`"),
+        until: datetime.date | None = Query(None, description="Defaults to today"),
+        todo_repo_stats_service: TodoRepoStatsService = Depends(),
+    ) -> out_schemas.TodoRepoStatsResponse:
+        try:
+            res = await todo_repo_stats_service.get_todo_repo_stats(
+                todo_repo_id=todo_repo_id,
+                user_id=self.user_info.user_id,
+                period=period,
+                since=since,
+                until=until,
+                todo_repo_repository=TodoRepoRepository(self.session),
+                stats_repository=TodoRepoStatsRepository(self.session),
+            )
+        except exceptions.TodoRepoNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except exceptions.InvalidStatsRange as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return out_schemas.TodoRepoStatsResponse(
+            ok=True, message=enums.ResponseMessage.SUCCESS, data=out_schemas.TodoRepoStatsOut(**res)
+        )
+
+
+@cbv(router)
+class TodoRepoGraph:
+    # Anonymous, so that the graph can be embedded in READMEs and profiles, for TodoRepos marked is_public
+    todo_repo_sessions: TodoRepoSessions = Depends()
+    todo_repo_stats_service: TodoRepoStatsService = Depends()
+
+    @router.get(
+        "/todo-repos/{todo_repo_id}/graph.svg",
+        status_code=status.HTTP_200_OK,
+        response_class=Response,
+        responses={
+            status.HTTP_200_OK: {"content": {"image/svg+xml": {}}},
+            status.HTTP_304_NOT_MODIFIED: {"description": "Not Modified"},
+            **examples.get_error_responses([status.HTTP_404_NOT_FOUND]),
+        },
+    )
+    async def get_todo_repo_graph(
+        self,
+        todo_repo_id: int = Path(...),
+        year: int | None = Query(None, ge=1, le=9998, description="Defaults to the current year"),
+        if_none_match: str | None = Header(None),
+    ) -> Response:
+        year = year or datetime.date.today().year
+        key = (todo_repo_id, year)
+        try:
+            async with self.todo_repo_sessions.open(todo_repo_id) as session:
+                # Checked on every request, cache hits included: the cache of each worker and the TaskVersions that
+                # expire it are per process, so they can't tell that a TodoRepo was made private elsewhere
+                todo_repo_version = await self.todo_repo_stats_service.get_public_todo_repo_version(
+                    todo_repo_id, todo_repo_repository=TodoRepoRepository(session)
+                )
+                # Read before the counts, so that a write racing with the render leaves the entry behind
+                task_versions = stats.get_task_versions()
+                version = (todo_repo_version, task_versions.get((todo_repo_id, None)), task_versions.get(key))
+
+                if (graph := get_graph_cache().get(key, version)) is None:
+                    counts = await self.todo_repo_stats_service.get_daily_task_counts(
+                        todo_repo_id,
+                        year,
+                        todo_repo_repository=TodoRepoRepository(session),
+                        daily_todo_repository=DailyTodoRepository(session),
+                    )
+        except exceptions.TodoRepoNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        if graph is None:
+            svg = await run_in_threadpool(render_contribution_graph, year, counts)
+            graph = get_graph_cache().put(key, version, svg.encode())
+
+        headers = {
+            "ETag": graph.etag,
+            "Cache-Control": (
+                f"public, max-age={settings.GRAPH_SETTINGS.GRAPH_MAX_AGE}, "
+                f"stale-while-revalidate={settings.GRAPH_SETTINGS.GRAPH_STALE_WHILE_REVALIDATE}"
+            ),
+        }
+        if etag_matches(if_none_match, graph.etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=graph.body, media_type="image/svg+xml", headers=headers)
+
 
 @cbv(router)
 class DailyTodo:
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_user_session)
     daily_todo_service: DailyTodoService = Depends()
     user_info: JWTAuthorizer.UserInfo = Depends(JWTAuthorizer.get_user_info)
 
@@ -80,26 +241,89 @@ class DailyTodo:
         responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND, status.HTTP_400_BAD_REQUEST]),
     )
     async def create_daily_todo(
-        self, todo_repo_id: int = Path(), date: datetime.date = Body(embed=True)
+        self,
+        request: Request,
+        todo_repo_id: int = Path(),
+        date: datetime.date = Body(embed=True),
+        idempotency_key: str | None = Header(None, max_length=255),
+        idempotency_repository: IdempotencyKeyRepository = Depends(get_idempotency_key_repository),
+    ) -> out_schemas.DailyTodoResponse:
+        async def create() -> out_schemas.DailyTodoResponse:
+            try:
+                todo_repo_repository: TodoRepoRepository = TodoRepoRepository(self.session)
+                daily_todo_repository: DailyTodoRepository = DailyTodoRepository(self.session)
+                res = await self.daily_todo_service.create_daily_todo(
+                    todo_repo_id=todo_repo_id,
+                    date=date,
+                    todo_repo_repository=todo_repo_repository,
+                    daily_todo_repository=daily_todo_repository,
+                )
+            except exceptions.TodoRepoNotFound as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except exceptions.DailyTodoAlreadyExists as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            return out_schemas.DailyTodoResponse(
+                ok=True, message=enums.ResponseMessage.CREATE_SUCCESS, data=out_schemas.DailyTodoOut(**res)
+            )
+
+        return await get_idempotency_store().execute(
+            self.user_info.user_id,
+            idempotency_key,
+            await get_request_fingerprint(request),
+            status.HTTP_201_CREATED,
+            create,
+            repository=idempotency_repository,
+        )
+
+    @router.put(
+        "/todo-repos/{todo_repo_id}/daily-todos/{date}",
+        status_code=status.HTTP_200_OK,
+        responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND]),
+    )
+    async def put_daily_todo(
+        self, response: Response, todo_repo_id: int = Path(), date: datetime.date = Path()
     ) -> out_schemas.DailyTodoResponse:
         try:
-            todo_repo_repository: TodoRepoRepository = TodoRepoRepository(self.session)
-            daily_todo_repository: DailyTodoRepository = DailyTodoRepository(self.session)
-            res = await self.daily_todo_service.create_daily_todo(
+            repository: DailyTodoRepository = DailyTodoRepository(self.session)
+            res, created = await self.daily_todo_service.put_daily_todo(
                 todo_repo_id=todo_repo_id,
                 date=date,
-                todo_repo_repository=todo_repo_repository,
-                daily_todo_repository=daily_todo_repository,
+                repository=repository,
             )
         except exceptions.TodoRepoNotFound as e:
             raise HTTPException(status_code=404, detail=str(e))
-        except exceptions.DailyTodoAlreadyExists as e:
-            raise HTTPException(status_code=400, detail=str(e))
+
+        if created:
+            response.status_code = status.HTTP_201_CREATED
 
         return out_schemas.DailyTodoResponse(
-            ok=True, message=enums.ResponseMessage.CREATE_SUCCESS, data=out_schemas.DailyTodoOut(**res)
+            ok=True,
+            message=enums.ResponseMessage.CREATE_SUCCESS if created else enums.ResponseMessage.SUCCESS,
+            data=out_schemas.DailyTodoOut(**res),
         )
 
+    @router.get(
+        "/todo-repos/{todo_repo_id}/daily-todos",
+        status_code=status.HTTP_200_OK,
+        responses=examples.get_error_responses([status.HTTP_400_BAD_REQUEST]),
+    )
+    async def get_daily_todos(
+        self,
+        todo_repo_id: int = Path(),
+        cursor: str | None = Query(None, max_length=128, description="Opaque cursor from a previous page"),
+        page_size: int = Query(10, ge=1, le=100),
+    ) -> out_schemas.DailyTodoPaginationResponse:
+        try:
+            repository: DailyTodoRepository = DailyTodoRepository(self.session)
+            res = await self.daily_todo_service.get_daily_todos(
+                todo_repo_id=todo_repo_id, cursor=cursor, page_size=page_size, repository=repository
+            )
+        except exceptions.InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return out_schemas.DailyTodoPaginationResponse(ok=True, message=enums.ResponseMessage.SUCCESS, **res)
+
     @router.get(
         "/todo-repos/{todo_repo_id}/daily-todos/{date}",
         status_code=status.HTTP_200_OK,
@@ -128,42 +352,119 @@ class DailyTodo:
         responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND]),
     )
     async def create_daily_todo_task(
-        self, todo_repo_id: int = Path(), date: datetime.date = Path(), content: str = Body(embed=True)
+        self,
+        request: Request,
+        todo_repo_id: int = Path(),
+        date: datetime.date = Path(),
+        content: str = Body(embed=True),
+        create_daily_todo: bool = Query(False, description="Create the DailyTodo in the same transaction if missing"),
+        idempotency_key: str | None = Header(None, max_length=255),
+        idempotency_repository: IdempotencyKeyRepository = Depends(get_idempotency_key_repository),
     ) -> out_schemas.DailyTodoTaskResponse:
-        try:
-            repository: DailyTodoRepository = DailyTodoRepository(self.session)
-            res = await self.daily_todo_service.create_daily_todo_task(
-                todo_repo_id=todo_repo_id,
-                date=date,
-                content=content,
-                repository=repository,
+        async def create() -> out_schemas.DailyTodoTaskResponse:
+            try:
+                repository: DailyTodoRepository = DailyTodoRepository(self.session)
+                res = await self.daily_todo_service.create_daily_todo_task(
+                    todo_repo_id=todo_repo_id,
+                    date=date,
+                    content=content,
+                    repository=repository,
+                    create_daily_todo=create_daily_todo,
+                )
+            except exceptions.DailyTodoNotFound as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except exceptions.TodoRepoNotFound as e:
+                raise HTTPException(status_code=404, detail=str(e))
+
+            return out_schemas.DailyTodoTaskResponse(
+                ok=True, message=enums.ResponseMessage.CREATE_SUCCESS, data=out_schemas.DailyTodoTaskOut(**res)
             )
-        except exceptions.DailyTodoNotFound as e:
-            raise HTTPException(status_code=404, detail=str(e))
 
-        return out_schemas.DailyTodoTaskResponse(
-            ok=True, message=enums.ResponseMessage.CREATE_SUCCESS, data=out_schemas.DailyTodoTaskOut(**res)
+        return await get_idempotency_store().execute(
+            self.user_info.user_id,
+            idempotency_key,
+            await get_request_fingerprint(request),
+            status.HTTP_201_CREATED,
+            create,
+            repository=idempotency_repository,
+        )
+
+    @router.post(
+        "/todo-repos/{todo_repo_id}/daily-todos/{date}/carry-over",
+        status_code=status.HTTP_201_CREATED,
+        responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND, status.HTTP_400_BAD_REQUEST]),
+    )
+    async def carry_over_daily_todo_tasks(
+        self,
+        request: Request,
+        todo_repo_id: int = Path(),
+        date: datetime.date = Path(),
+        from_date: datetime.date | None = Query(None, alias="from", description="Defaults to the day before"),
+        idempotency_key: str | None = Header(None, max_length=255),
+        idempotency_repository: IdempotencyKeyRepository = Depends(get_idempotency_key_repository),
+    ) -> out_schemas.DailyTodoTasksResponse:
+        async def carry_over() -> out_schemas.DailyTodoTasksResponse:
+            try:
+                repository: DailyTodoRepository = DailyTodoRepository(self.session)
+                res = await self.daily_todo_service.carry_over_daily_todo_tasks(
+                    todo_repo_id=todo_repo_id, date=date, from_date=from_date, repository=repository
+                )
+            except (exceptions.TodoRepoNotFound, exceptions.DailyTodoNotFound) as e:
+                raise HTTPException(status_code=404, detail=str(e))
+            except exceptions.InvalidCarryOver as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            return out_schemas.DailyTodoTasksResponse(
+                ok=True,
+                message=enums.ResponseMessage.CREATE_SUCCESS,
+                data=[out_schemas.DailyTodoTaskOut(**r) for r in res],
+            )
+
+        return await get_idempotency_store().execute(
+            self.user_info.user_id,
+            idempotency_key,
+            await get_request_fingerprint(request),
+            status.HTTP_201_CREATED,
+            carry_over,
+            repository=idempotency_repository,
         )
 
     @router.get("/todo-repos/{todo_repo_id}/daily-todos/{date}/daily-todo-tasks", status_code=status.HTTP_200_OK)
     async def get_daily_todo_tasks(
-        self, todo_repo_id: int = Path(), date: datetime.date = Path()
+        self,
+        todo_repo_id: int = Path(),
+        date: datetime.date = Path(),
+        cursor: int | None = Query(None, description="Id of the last task of the previous page"),
+        page_size: int | None = Query(None, ge=1, le=100, description="Paginate when given (or with a cursor)"),
     ) -> out_schemas.DailyTodoTasksResponse:
         repository: DailyTodoRepository = DailyTodoRepository(self.session)
-        res = await self.daily_todo_service.get_daily_todo_tasks(
+        if cursor is None and page_size is None:
+            res = await self.daily_todo_service.get_daily_todo_tasks(
+                todo_repo_id=todo_repo_id,
+                date=date,
+                repository=repository,
+            )
+
+            return out_schemas.DailyTodoTasksResponse(
+                ok=True, message=enums.ResponseMessage.SUCCESS, data=[out_schemas.DailyTodoTaskOut(**r) for r in res]
+            )
+
+        res = await self.daily_todo_service.get_daily_todo_tasks_page(
             todo_repo_id=todo_repo_id,
             date=date,
+            cursor=cursor,
+            page_size=page_size or 10,
             repository=repository,
         )
 
-        return out_schemas.DailyTodoTasksResponse(
-            ok=True, message=enums.ResponseMessage.SUCCESS, data=[out_schemas.DailyTodoTaskOut(**r) for r in res]
-        )
+        return out_schemas.DailyTodoTasksResponse(ok=True, message=enums.ResponseMessage.SUCCESS, **res)
 
     @router.patch(
         "/todo-repos/{todo_repo_id}/daily-todos/{date}/daily-todo-tasks/{daily_todo_task_id}/content",
         status_code=status.HTTP_200_OK,
-        responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND]),
+        responses=examples.get_error_responses(
+            [status.HTTP_404_NOT_FOUND, status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT]
+        ),
     )
     async def update_daily_todo_task_for_content(
         self,
@@ -171,6 +472,7 @@ class DailyTodo:
         date: datetime.date = Path(),
         daily_todo_task_id: int = Path(),
         content: str = Body(embed=True),
+        version: int | None = Depends(get_if_match_version),
     ) -> out_schemas.DailyTodoTaskResponse:
         try:
             repository: DailyTodoRepository = DailyTodoRepository(self.session)
@@ -179,28 +481,61 @@ class DailyTodo:
                 date=date,
                 daily_todo_task_id=daily_todo_task_id,
                 content=content,
+                version=version,
                 repository=repository,
             )
         except exceptions.DailyTodoNotFound as e:
             raise HTTPException(status_code=404, detail=str(e))
         except exceptions.DailyTodoTaskNotFound as e:
             raise HTTPException(status_code=404, detail=str(e))
+        except exceptions.VersionConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
 
         return out_schemas.DailyTodoTaskResponse(
             ok=True, message=enums.ResponseMessage.UPDATE_SUCCESS, data=out_schemas.DailyTodoTaskOut(**res)
         )
 
     @router.patch(
-        "/todo-repos/{todo_repo_id}/daily-todos/{date}/daily-todo-tasks/{daily_todo_task_id}/is-completed",
+        "/todo-repos/{todo_repo_id}/daily-todos/{date}/daily-todo-tasks/is-completed",
         status_code=status.HTTP_200_OK,
         responses=examples.get_error_responses([status.HTTP_404_NOT_FOUND]),
     )
+    async def update_daily_todo_tasks_for_is_completed(
+        self,
+        todo_repo_id: int = Path(),
+        date: datetime.date = Path(),
+        update_in: in_schemas.DailyTodoTasksIsCompletedUpdateIn = Body(...),
+    ) -> out_schemas.DailyTodoTasksIsCompletedResponse:
+        try:
+            repository: DailyTodoRepository = DailyTodoRepository(self.session)
+            res = await self.daily_todo_service.update_daily_todo_tasks_for_is_completed(
+                todo_repo_id=todo_repo_id,
+                date=date,
+                daily_todo_task_ids=None if update_in.ids == "all" else update_in.ids,
+                is_completed=update_in.is_completed,
+                repository=repository,
+            )
+        except exceptions.DailyTodoNotFound as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+        return out_schemas.DailyTodoTasksIsCompletedResponse(
+            ok=True, message=enums.ResponseMessage.UPDATE_SUCCESS, data=out_schemas.DailyTodoTasksIsCompletedOut(**res)
+        )
+
+    @router.patch(
+        "/todo-repos/{todo_repo_id}/daily-todos/{date}/daily-todo-tasks/{daily_todo_task_id}/is-completed",
+        status_code=status.HTTP_200_OK,
+        responses=examples.get_error_responses(
+            [status.HTTP_404_NOT_FOUND, status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT]
+        ),
+    )
     async def update_daily_todo_task_for_is_completed(
         self,
         todo_repo_id: int = Path(),
         date: datetime.date = Path(),
         daily_todo_task_id: int = Path(),
         is_completed: bool = Body(embed=True),
+        version: int | None = Depends(get_if_match_version),
     ) -> out_schemas.DailyTodoTaskResponse:
         try:
             repository: DailyTodoRepository = DailyTodoRepository(self.session)
@@ -209,13 +544,44 @@ class DailyTodo:
                 date=date,
                 daily_todo_task_id=daily_todo_task_id,
                 is_completed=is_completed,
+                version=version,
                 repository=repository,
             )
         except exceptions.DailyTodoNotFound as e:
             raise HTTPException(status_code=404, detail=str(e))
         except exceptions.DailyTodoTaskNotFound as e:
             raise HTTPException(status_code=404, detail=str(e))
+        except exceptions.VersionConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
 
         return out_schemas.DailyTodoTaskResponse(
             ok=True, message=enums.ResponseMessage.UPDATE_SUCCESS, data=out_schemas.DailyTodoTaskOut(**res)
         )
+
+
+@cbv(router)
+class TodoSearch:
+    session: AsyncSession = Depends(get_user_session)
+    todo_search_service: TodoSearchService = Depends()
+    user_info: JWTAuthorizer.UserInfo = Depends(JWTAuthorizer.get_user_info)
+
+    @router.get(
+        "/search",
+        status_code=status.HTTP_200_OK,
+        responses=examples.get_error_responses([status.HTTP_400_BAD_REQUEST]),
+    )
+    async def search(
+        self,
+        q: str = Query(min_length=1, max_length=256, description="Words to find in tasks and TodoRepos"),
+        cursor: str | None = Query(None, max_length=128, description="Opaque cursor from a previous page"),
+        page_size: int = Query(10, ge=1, le=100),
+    ) -> out_schemas.SearchPaginationResponse:
+        try:
+            repository: TodoSearchRepository = TodoSearchRepository(self.session)
+            res = await self.todo_search_service.search(
+                user_id=self.user_info.user_id, query=q, cursor=cursor, page_size=page_size, repository=repository
+            )
+        except exceptions.InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        return out_schemas.SearchPaginationResponse(ok=True, message=enums.ResponseMessage.SUCCESS, **res)
@@ -0,0 +1,204 @@
+import importlib
+import json
+import zlib
+from functools import cache
+from types import ModuleType
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import settings
+
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+COMPRESSIBLE_MEDIA_TYPES = (
+    "text/",
+    JSON_MEDIA_TYPE,
+    *MSGPACK_MEDIA_TYPES,
+    "image/svg+xml",
+    "application/javascript",
+    "application/xml",
+)
+# Server preference among the encodings a client accepts equally
+ENCODINGS = ("br", "gzip")
+
+
+@cache
+def import_optional(name: str) -> ModuleType | None:
+    # brotli and msgpack are optional; without them the encodings they provide are never negotiated
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def parse_qvalues(header: str) -> dict[str, float]:
+    """`a, b;q=0.5` -> {"a": 1.0, "b": 0.5}, with the tokens lowercased"""
+    qvalues = {}
+    for item in header.split(","):
+        token, *params = (part.strip() for part in item.split(";"))
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[token.lower()] = q
+    return qvalues
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    qvalues = parse_qvalues(accept_encoding)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = qvalues.get(encoding, qvalues.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def accepts_msgpack(accept: str) -> bool:
+    # Only an explicit MessagePack type counts; wildcards keep getting JSON
+    qvalues = parse_qvalues(accept)
+    msgpack_q = max(qvalues.get(media_type, 0.0) for media_type in MSGPACK_MEDIA_TYPES)
+    json_q = max(qvalues.get(JSON_MEDIA_TYPE, 0.0), qvalues.get("application/*", 0.0), qvalues.get("*/*", 0.0))
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+def get_media_type(headers: MutableHeaders) -> str:
+    return headers.get("content-type", "").partition(";")[0].strip().lower()
+
+
+def is_compressible(headers: MutableHeaders) -> bool:
+    return "content-encoding" not in headers and get_media_type(headers).startswith(COMPRESSIBLE_MEDIA_TYPES)
+
+
+class Compressor:
+    """Incremental gzip or brotli compression of a response body"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = import_optional("brotli").Compressor(quality=brotli_quality)
+            self._compress, self._finish = self._compressor.process, self._compressor.finish
+        else:
+            # wbits 16 + 15 writes the gzip header and trailer around the deflate stream
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compress, self._finish = self._compressor.compress, self._compressor.flush
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+class ResponseEncodingMiddleware:
+    """Encodes responses the way the request's Accept and Accept-Encoding headers ask for
+
+    Complete JSON bodies are transcoded to MessagePack for clients that accept it explicitly. Compressible
+    bodies of at least `minimum_size` bytes are compressed with brotli or gzip; streamed bodies are compressed
+    chunk by chunk as they are sent, whatever their size, since it isn't known upfront.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int | None = None,
+        gzip_level: int | None = None,
+        brotli_quality: int | None = None,
+        msgpack: bool | None = None,
+    ):
+        encoding_settings = settings.ENCODING_SETTINGS
+        self.app = app
+        self.minimum_size = encoding_settings.ENCODING_MINIMUM_SIZE if minimum_size is None else minimum_size
+        self.gzip_level = encoding_settings.ENCODING_GZIP_LEVEL if gzip_level is None else gzip_level
+        self.brotli_quality = encoding_settings.ENCODING_BROTLI_QUALITY if brotli_quality is None else brotli_quality
+        self.msgpack = encoding_settings.ENCODING_MSGPACK_ENABLED if msgpack is None else msgpack
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        available = tuple(e for e in ENCODINGS if e != "br" or import_optional("brotli") is not None)
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""), available)
+        msgpack = self.msgpack and accepts_msgpack(headers.get("accept", "")) and import_optional("msgpack")
+        if encoding is None and not msgpack:
+            await self.app(scope, receive, send)
+            return
+
+        responder = EncodingResponder(self, send, encoding, bool(msgpack))
+        await self.app(scope, receive, responder.send)
+
+
+class EncodingResponder:
+    def __init__(self, middleware: ResponseEncodingMiddleware, send: Send, encoding: str | None, msgpack: bool):
+        self.middleware = middleware
+        self._send = send
+        self.encoding = encoding
+        self.msgpack = msgpack
+        self.start_message: Message | None = None
+        self.compressor: Compressor | None = None
+        self.started = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether the body is complete or streamed
+            self.start_message = message
+        elif message["type"] != "http.response.body":
+            await self._send(message)
+        elif not self.started:
+            self.started = True
+            await self._send_first(message)
+        elif self.compressor is not None:
+            body = self.compressor.compress(message.get("body", b""))
+            if not (more_body := message.get("more_body", False)):
+                body += self.compressor.finish()
+            await self._send(dict(message, body=body, more_body=more_body))
+        else:
+            await self._send(message)
+
+    async def _send_first(self, message: Message) -> None:
+        headers = MutableHeaders(scope=self.start_message)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not more_body:
+            encoded = body
+            if self.msgpack and body and get_media_type(headers) == JSON_MEDIA_TYPE:
+                encoded = self._transcode(body, headers)
+            if self.encoding and is_compressible(headers) and len(encoded) >= self.middleware.minimum_size:
+                compressor = self._start_compression(headers)
+                encoded = compressor.compress(encoded) + compressor.finish()
+            if encoded is not body:
+                body = encoded
+                headers["content-length"] = str(len(body))
+        elif self.encoding and is_compressible(headers):
+            self.compressor = self._start_compression(headers)
+            body = self.compressor.compress(body)
+            del headers["content-length"]
+
+        await self._send(self.start_message)
+        await self._send(dict(message, body=body, more_body=more_body))
+
+    def _transcode(self, body: bytes, headers: MutableHeaders) -> bytes:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return body
+        headers["content-type"] = MSGPACK_MEDIA_TYPES[0]
+        headers.add_vary_header("Accept")
+        return import_optional("msgpack").packb(data)
+
+    def _start_compression(self, headers: MutableHeaders) -> Compressor:
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # The compressed body is another representation, so a strong validator would no longer hold byte for byte
+        if (etag := headers.get("etag")) and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+        return Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
@@ -0,0 +1,116 @@
+import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+from xml.sax.saxutils import escape
+
+from app import settings
+
+
+CELL = 10
+GAP = 3
+TOP = 20  # room for the month labels
+LEFT = 30  # room for the weekday labels
+COLORS = ("#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def get_level(completed: int, max_completed: int) -> int:
+    # Quartiles of the busiest day of the year, like the GitHub contribution graph
+    if completed <= 0 or max_completed <= 0:
+        return 0
+    return min(4, -(-4 * completed // max_completed))
+
+
+def render_contribution_graph(year: int, counts: dict[datetime.date, tuple[int, int]]) -> str:
+    """SVG of the completed tasks per day of `year`; one column per week, starting on Monday"""
+    first = datetime.date(year, 1, 1)
+    origin = first - datetime.timedelta(days=first.weekday())
+    max_completed = max((completed for _, completed in counts.values()), default=0)
+
+    cells, labels = [], []
+    date = first
+    while date.year == year:
+        column, row = (date - origin).days // 7, date.weekday()
+        x, y = LEFT + column * (CELL + GAP), TOP + row * (CELL + GAP)
+        total, completed = counts.get(date, (0, 0))
+        cells.append(
+            f'<rect x="{x}" y="{y}" width="{CELL}" height="{CELL}" rx="2" '
+            f'fill="{COLORS[get_level(completed, max_completed)]}">'
+            f"<title>{completed}/{total} tasks completed on {date.isoformat()}</title></rect>"
+        )
+        if date.day == 1:
+            labels.append(f'<text x="{x}" y="{TOP - 8}">{MONTHS[date.month - 1]}</text>')
+        date += datetime.timedelta(days=1)
+
+    for row, name in ((0, "Mon"), (2, "Wed"), (4, "Fri")):
+        labels.append(f'<text x="0" y="{TOP + row * (CELL + GAP) + CELL - 1}">{name}</text>')
+
+    columns = (datetime.date(year, 12, 31) - origin).days // 7 + 1
+    width, height = LEFT + columns * (CELL + GAP), TOP + 7 * (CELL + GAP)
+    title = escape(f"{sum(c for _, c in counts.values())} tasks completed in {year}")
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" role="img" aria-label="{title}">'
+        f"<title>{title}</title>"
+        f'<g font-family="sans-serif" font-size="9" fill="#767676">{"".join(labels)}</g>'
+        f'<g>{"".join(cells)}</g></svg>'
+    )
+
+
+class RenderedGraph:
+    __slots__ = ("body", "etag", "expires_at")
+
+    def __init__(self, body: bytes, ttl: int):
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()}"'
+        self.expires_at = time.monotonic() + ttl
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class GraphCache:
+    """LRU of rendered graphs keyed by (todo_repo_id, year, version), each kept for `ttl` seconds
+
+    The version changes with the tasks, so a stale graph is never looked up again within a worker;
+    the TTL bounds how long writes made through other workers go unseen.
+    """
+
+    def __init__(self, ttl: int, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[int, int], tuple[tuple, RenderedGraph]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[int, int], version: tuple) -> RenderedGraph | None:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None or entry[0] != version:
+                return None
+            if entry[1].expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple[int, int], version: tuple, body: bytes) -> RenderedGraph:
+        graph = RenderedGraph(body, self.ttl)
+        with self._lock:
+            # One entry per (todo_repo_id, year): a newer version replaces the old one instead of piling up
+            self._entries[key] = (version, graph)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return graph
+
+
+@cache
+def get_graph_cache() -> GraphCache:
+    return GraphCache(ttl=settings.GRAPH_SETTINGS.GRAPH_CACHE_TTL, maxsize=settings.GRAPH_SETTINGS.GRAPH_CACHE_SIZE)
@@ -0,0 +1,118 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import math
+import time
+from functools import cache
+from typing import Any, Awaitable, Callable
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import settings
+from app.db import get_session
+from app.adapters.idempotency.repository import IdempotencyKeyRepository
+from app.domain.idempotency import models as idempotency_models
+
+
+def get_idempotency_key_repository(
+    session: AsyncSession = Depends(get_session, use_cache=False)
+) -> IdempotencyKeyRepository:
+    # A session of its own, so that records are committed whether or not the request's changes are
+    return IdempotencyKeyRepository(session)
+
+
+async def get_request_fingerprint(request: Request) -> str:
+    """Digest of the method, path, query and JSON body, so that a key reused for another request is told apart"""
+    target = f"{request.method} {request.url.path}?{'&'.join(sorted(request.url.query.split('&')))}"
+    body = await request.body()
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode() if body else b""
+    except ValueError:
+        pass
+    return hashlib.sha256(target.encode() + b"\n" + body).hexdigest()
+
+
+def to_response(record: idempotency_models.IdempotencyKey) -> Response:
+    return Response(
+        content=record.body,
+        status_code=record.status_code,
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+class IdempotencyStore:
+    """(user_id, Idempotency-Key) -> (status, body) of the first successful response, kept for `ttl` seconds
+
+    Records are kept in the idempotency_keys table, so a retry is replayed whichever worker serves it.
+    A request holds its key for at most `lock_timeout` seconds, after which a worker lost mid-request no longer
+    blocks the key; duplicates wait up to `wait_timeout` seconds for it to finish. Failed requests are not
+    recorded so that they can be retried with the same key.
+    """
+
+    def __init__(self, ttl: int, lock_timeout: int, wait_timeout: float, poll_interval: float = 0.1):
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    async def execute(
+        self,
+        user_id: int,
+        key: str | None,
+        fingerprint: str,
+        status_code: int,
+        call: Callable[[], Awaitable[Any]],
+        *,
+        repository: IdempotencyKeyRepository,
+    ) -> Any:
+        if key is None:
+            return await call()
+
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            now = idempotency_models.utcnow()
+            expires_at = now + datetime.timedelta(seconds=self.lock_timeout)
+            if await repository.claim(user_id, key, fingerprint, expires_at, now):
+                break
+            if (record := await repository.get(user_id, key)) is None:
+                # Released by a failed request in the meantime
+                continue
+            if record.fingerprint != fingerprint:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency-Key was already used for a different request",
+                )
+            if record.completed:
+                return to_response(record)
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still in progress",
+                    headers={"Retry-After": str(math.ceil(self.wait_timeout))},
+                )
+            # A duplicate in flight: wait for it instead of running the handler again
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            result = await call()
+        except BaseException:
+            await repository.release(user_id, key)
+            raise
+
+        body = json.dumps(jsonable_encoder(result), ensure_ascii=False, separators=(",", ":")).encode()
+        expires_at = idempotency_models.utcnow() + datetime.timedelta(seconds=self.ttl)
+        await repository.complete(user_id, key, status_code, body, expires_at)
+        return result
+
+
+@cache
+def get_idempotency_store() -> IdempotencyStore:
+    idempotency_settings = settings.IDEMPOTENCY_SETTINGS
+    return IdempotencyStore(
+        ttl=idempotency_settings.IDEMPOTENCY_TTL,
+        lock_timeout=idempotency_settings.IDEMPOTENCY_LOCK_TIMEOUT,
+        wait_timeout=idempotency_settings.IDEMPOTENCY_WAIT_TIMEOUT,
+    )
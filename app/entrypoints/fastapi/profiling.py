@@ -0,0 +1,243 @@
+"""Sampling profiler for single requests
+
+A request picked by PROFILING_TOKEN or PROFILING_SAMPLE_RATE runs alongside a thread that samples its task every
+PROFILING_INTERVAL: the stack of the event loop thread while the task runs on it, and the chain of awaits it is
+suspended in otherwise, so the profile shows both where CPU goes (cbv dispatch, pydantic, SQLAlchemy, services)
+and what the request waits on. Each profile is written to PROFILING_DIR as speedscope JSON
+(open it on https://www.speedscope.app) or as collapsed stacks for flamegraph tools. Only the newest
+PROFILING_MAX_FILES profiles, and at most PROFILING_MAX_BYTES of them, are kept there.
+
+Without a token or a sample rate the middleware isn't installed at all.
+"""
+import asyncio
+import hmac
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import settings
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = "x-profile-token"
+# (qualified name, file, first line) of a function; stacks are root first
+Frame = tuple[str, str, int]
+WAITING: Frame = ("(waiting)", "", 0)
+FORMATS = {"speedscope": "speedscope.json", "collapsed": "collapsed.txt"}
+
+
+def get_frame_stack(frame: FrameType | None, root: FrameType | None = None) -> list[Frame]:
+    # Frames above `root`, the event loop's, are left out
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+        if frame is root:
+            break
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def get_await_stack(coro) -> list[Frame]:
+    """Stack of a suspended coroutine, from itself down to what it awaits"""
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        code = frame.f_code
+        stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None) or getattr(coro, "gi_yieldfrom", None)
+    stack.append(WAITING)
+    return stack
+
+
+class RequestProfiler:
+    """Samples the task that starts it, from a thread of its own, until stopped"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: list[tuple[tuple[Frame, ...], float]] = []  # (stack, seconds it stands for), in order
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            try:
+                stack = self._sample()
+            except (AttributeError, ValueError):
+                # The task moved on while its stack was walked
+                continue
+            self.samples.append((tuple(stack), now - last))
+            last = now
+
+    def _sample(self) -> list[Frame]:
+        coro = self.task.get_coro()
+        if asyncio.tasks._current_tasks.get(self.loop) is self.task:
+            return get_frame_stack(sys._current_frames().get(self.thread_id), coro.cr_frame)
+        return get_await_stack(coro)
+
+
+def format_frame(frame: Frame) -> str:
+    name, file, line = frame
+    return f"{name} ({file}:{line})" if file else name
+
+
+def to_collapsed(samples: list[tuple[tuple[Frame, ...], float]]) -> str:
+    """One `root;...;leaf weight` line per distinct stack, weighted in microseconds"""
+    weights = Counter()
+    for stack, seconds in samples:
+        weights[stack] += seconds
+    return "".join(
+        f"{';'.join(format_frame(frame) for frame in stack)} {round(seconds * 1_000_000)}\n"
+        for stack, seconds in weights.items()
+    )
+
+
+def to_speedscope(samples: list[tuple[tuple[Frame, ...], float]], name: str) -> dict:
+    frames, indexes = [], {}
+    stacks = []
+    for stack, _ in samples:
+        for frame in stack:
+            if frame not in indexes:
+                indexes[frame] = len(frames)
+                frame_name, file, line = frame
+                frames.append(dict(name=frame_name, file=file, line=line) if file else dict(name=frame_name))
+        stacks.append([indexes[frame] for frame in stack])
+    weights = [seconds for _, seconds in samples]
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "shared": dict(frames=frames),
+        "profiles": [
+            dict(
+                type="sampled",
+                name=name,
+                unit="seconds",
+                startValue=0,
+                endValue=sum(weights),
+                samples=stacks,
+                weights=weights,
+            )
+        ],
+        "name": name,
+        "exporter": "commit-today",
+    }
+
+
+class ProfilingMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str | None = None,
+        sample_rate: float | None = None,
+        interval: float | None = None,
+        directory: str | None = None,
+        format: str | None = None,
+        max_files: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        profiling_settings = settings.PROFILING_SETTINGS
+        self.app = app
+        self.token = profiling_settings.PROFILING_TOKEN if token is None else token
+        self.sample_rate = profiling_settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.interval = profiling_settings.PROFILING_INTERVAL if interval is None else interval
+        self.directory = Path(profiling_settings.PROFILING_DIR if directory is None else directory)
+        self.format = profiling_settings.PROFILING_FORMAT if format is None else format
+        if self.format not in FORMATS:
+            raise ValueError(f"Unknown profile format {self.format}, expected one of {', '.join(FORMATS)}")
+        self.max_files = profiling_settings.PROFILING_MAX_FILES if max_files is None else max_files
+        self.max_bytes = profiling_settings.PROFILING_MAX_BYTES if max_bytes is None else max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = Headers(scope=scope).get(TOKEN_HEADER)
+        by_token = bool(self.token) and token is not None and hmac.compare_digest(token, self.token)
+        if not by_token and not random.random() < self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        name = f"{scope['method']} {scope['path']}"
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-")[:80]
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}-{uuid.uuid4().hex[:8]}"
+        path = self.directory / f"{filename}.{FORMATS[self.format]}"
+
+        async def send_with_profile(message: Message) -> None:
+            # Only whoever holds the token learns where the profile went
+            if message["type"] == "http.response.start" and by_token:
+                MutableHeaders(scope=message)["X-Profile"] = path.name
+            await send(message)
+
+        profiler = RequestProfiler(self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile)
+        finally:
+            profiler.stop()
+            # The response has been sent by now; the file is written off the event loop
+            await run_in_threadpool(self._write, profiler.samples, name, path)
+
+    def _write(self, samples: list[tuple[tuple[Frame, ...], float]], name: str, path: Path) -> None:
+        if self.format == "speedscope":
+            content = json.dumps(to_speedscope(samples, name))
+        else:
+            content = to_collapsed(samples)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        except OSError:
+            logger.warning("Could not write the profile of %s to %s", name, path, exc_info=True)
+            return
+        self._prune()
+
+    def _prune(self) -> None:
+        """Deletes the oldest profiles beyond max_files or max_bytes; the newest one is always kept"""
+        profiles = []
+        for path in self.directory.iterdir():
+            if not path.name.endswith(tuple(FORMATS.values())):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                # Deleted by another request's prune
+                continue
+            profiles.append((stat.st_mtime, path.name, stat.st_size, path))
+        profiles.sort(reverse=True)
+
+        total = 0
+        for index, (_, _, size, path) in enumerate(profiles):
+            total += size
+            if index == 0 or (index < self.max_files and total <= self.max_bytes):
+                continue
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                logger.warning("Could not delete the profile %s", path, exc_info=True)
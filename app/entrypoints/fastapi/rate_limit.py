@@ -0,0 +1,69 @@
+import math
+from functools import cache
+from fastapi import HTTPException, Request, status
+
+from app import settings
+from app.adapters.rate_limit.bucket_store import AbstractBucketStore, InProcessBucketStore, RedisBucketStore
+
+
+@cache
+def get_bucket_store() -> AbstractBucketStore:
+    rate_limit_settings = settings.RATE_LIMIT_SETTINGS
+    if rate_limit_settings.RATE_LIMIT_REDIS_URL:
+        return RedisBucketStore(rate_limit_settings.RATE_LIMIT_REDIS_URL)
+    return InProcessBucketStore(
+        shards=rate_limit_settings.RATE_LIMIT_SHARDS,
+        max_keys_per_shard=rate_limit_settings.RATE_LIMIT_MAX_KEYS_PER_SHARD,
+    )
+
+
+class RateLimiter:
+    """Per-IP and per-email token buckets, meant to run as a route dependency
+
+    Route-level dependencies are solved before the endpoint's own, so a rejected request never reaches
+    form validation, the database or bcrypt. The email is read from the already received body.
+    """
+
+    def __init__(self, scope: str, email_field: str, is_form: bool = False):
+        self.scope = scope
+        self.email_field = email_field
+        self.is_form = is_form
+
+    async def __call__(self, request: Request) -> None:
+        rate_limit_settings = settings.RATE_LIMIT_SETTINGS
+        if not rate_limit_settings.RATE_LIMIT_ENABLED:
+            return
+
+        store = get_bucket_store()
+        ip = request.client.host if request.client else "unknown"
+        retry_after = await store.consume(
+            f"{self.scope}:ip:{ip}",
+            rate_limit_settings.RATE_LIMIT_IP_CAPACITY,
+            rate_limit_settings.RATE_LIMIT_IP_REFILL_RATE,
+        )
+        if not retry_after and (email := await self._get_email(request)):
+            retry_after = await store.consume(
+                f"{self.scope}:email:{email}",
+                rate_limit_settings.RATE_LIMIT_EMAIL_CAPACITY,
+                rate_limit_settings.RATE_LIMIT_EMAIL_REFILL_RATE,
+            )
+
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    async def _get_email(self, request: Request) -> str | None:
+        try:
+            body = await request.form() if self.is_form else await request.json()
+        except ValueError:
+            return None
+
+        email = body.get(self.email_field) if hasattr(body, "get") else None
+        return email.strip().lower() if isinstance(email, str) else None
+
+
+login_rate_limiter = RateLimiter(scope="login", email_field="username", is_form=True)
+signup_rate_limiter = RateLimiter(scope="signup", email_field="email")
@@ -1,11 +1,12 @@
+import hmac
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status, Request, Form
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.security import APIKeyHeader, OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.security.utils import get_authorization_scheme_param
-from jose import jwt, JWTError
 from typing import Any, Annotated
+from sqlalchemy.ext.asyncio import AsyncSession
 from email_validator import (
     validate_email,
     EmailNotValidError,
@@ -14,6 +15,9 @@ from email_validator import (
 )
 
 from app import settings
+from app.db import get_session
+from app.adapters.auth.repository import RevokedTokenRepository
+from app.adapters.auth.revocation_filter import get_revocation_filter
 
 
 class OAuth2PasswordRequestFormWithValidation(OAuth2PasswordRequestForm):
@@ -90,11 +94,6 @@ class JWTFromAuthorizationOrCookie(OAuth2PasswordBearer):
 
 
 class JWTAuthorizer:
-    SECRET_KEY = settings.AUTH_SETTINGS.JWT_SECRET_KEY
-    REFRESH_SECRET_KEY = settings.AUTH_SETTINGS.JWT_REFRESH_SECRET_KEY
-    ALGORITHM = settings.AUTH_SETTINGS.JWT_ALGORITHM
-    EXPIRES_DELTA = settings.AUTH_SETTINGS.JWT_EXPIRES_DELTA
-    REFRESH_EXPIRES_DELTA = settings.AUTH_SETTINGS.JWT_REFRESH_EXPIRES_DELTA
     JWT_COOKIE_AUTH = JWTFromAuthorizationOrCookie(tokenUrl="api/v1/external/auth/login", auto_error=False)
 
     class CredentialsException(Exception):
@@ -110,7 +109,9 @@ class JWTAuthorizer:
 
     @classmethod
     def create(cls, user: dict[str, Any], is_refresh: bool = False) -> str:
-        expires_delta = cls.REFRESH_EXPIRES_DELTA if is_refresh else cls.EXPIRES_DELTA
+        # Keys are read on use, so that importing the app doesn't parse AUTH_SETTINGS
+        auth_settings = settings.AUTH_SETTINGS
+        expires_delta = auth_settings.JWT_REFRESH_EXPIRES_DELTA if is_refresh else auth_settings.JWT_EXPIRES_DELTA
         payload = dict(
             sub=user["email"],
             exp=datetime.utcnow() + timedelta(minutes=expires_delta),
@@ -124,10 +125,13 @@ class JWTAuthorizer:
                 last_name=user["last_name"],
                 first_name=user["first_name"],
             )
-        secret_key = cls.REFRESH_SECRET_KEY if is_refresh else cls.SECRET_KEY
+        secret_key = auth_settings.JWT_REFRESH_SECRET_KEY if is_refresh else auth_settings.JWT_SECRET_KEY
+
+        # jose pulls in its crypto backends (ecdsa, rsa, pyasn1), so it is loaded on first use
+        from jose import jwt, JWTError
 
         try:
-            return jwt.encode(payload, secret_key, algorithm=cls.ALGORITHM)
+            return jwt.encode(payload, secret_key, algorithm=auth_settings.JWT_ALGORITHM)
         except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -136,10 +140,13 @@ class JWTAuthorizer:
 
     @classmethod
     def decode(cls, token: str, is_refresh: bool = False) -> dict[str, Any]:
-        secret_key = cls.REFRESH_SECRET_KEY if is_refresh else cls.SECRET_KEY
+        auth_settings = settings.AUTH_SETTINGS
+        secret_key = auth_settings.JWT_REFRESH_SECRET_KEY if is_refresh else auth_settings.JWT_SECRET_KEY
+
+        from jose import jwt, JWTError
 
         try:
-            return jwt.decode(token, secret_key, algorithms=[cls.ALGORITHM])
+            return jwt.decode(token, secret_key, algorithms=[auth_settings.JWT_ALGORITHM])
         except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -147,19 +154,24 @@ class JWTAuthorizer:
             )
 
     @classmethod
-    async def get_user_info(cls, access_token: str | None = Depends(JWT_COOKIE_AUTH)) -> UserInfo:
+    async def get_user_info(
+        cls, access_token: str | None = Depends(JWT_COOKIE_AUTH), session: AsyncSession = Depends(get_session)
+    ) -> UserInfo:
         try:
             if access_token is None:
                 raise cls.CredentialsException
             payload = cls.decode(access_token)
-            email, user_id, username, last_name, first_name = (
+            email, user_id, username, last_name, first_name, jti = (
                 payload.get("sub"),
                 payload.get("user_id"),
                 payload.get("username"),
                 payload.get("last_name"),
                 payload.get("first_name"),
+                payload.get("jti"),
             )
-            if not (email and user_id and username and last_name and first_name):
+            if not (email and user_id and username and last_name and first_name and jti):
+                raise cls.CredentialsException
+            if await get_revocation_filter().is_revoked(jti, RevokedTokenRepository(session)):
                 raise cls.CredentialsException
             user_info = cls.UserInfo(
                 email=email,
@@ -168,10 +180,25 @@ class JWTAuthorizer:
                 last_name=last_name,
                 first_name=first_name,
             )
-        except (JWTError, cls.CredentialsException):
+        except cls.CredentialsException:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Could not validate credentials",
             )
 
         return user_info
+
+
+ADMIN_TOKEN_HEADER = APIKeyHeader(name="X-Admin-Token", auto_error=False)
+
+
+async def require_admin(admin_token: str | None = Depends(ADMIN_TOKEN_HEADER)) -> None:
+    """Guards internal routes with the ADMIN_TOKEN shared secret"""
+    expected = settings.AUTH_SETTINGS.ADMIN_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if admin_token is None or not hmac.compare_digest(admin_token.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
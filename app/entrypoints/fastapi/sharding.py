@@ -0,0 +1,77 @@
+import math
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import settings
+from app.db import async_session_factory, get_session, get_shard_engine, get_shard_names, is_sharded
+from app.domain.todo import models as todo_models
+from app.adapters.shard.repository import UserShardRepository
+from app.adapters.shard.shard_map import get_origin_shard, get_shard_map
+from app.entrypoints.fastapi.security import JWTAuthorizer
+
+
+async def get_user_session(
+    user_info: JWTAuthorizer.UserInfo = Depends(JWTAuthorizer.get_user_info),
+    session: AsyncSession = Depends(get_session),
+):
+    """Session on the shard holding the data of the requesting user"""
+    if not is_sharded():
+        yield session
+        return
+
+    shard, moving_to = await get_shard_map().get(user_info.user_id, UserShardRepository(session))
+    if moving_to is not None:
+        retry_after = settings.SHARD_SETTINGS.SHARD_MAP_CACHE_TTL + settings.SHARD_SETTINGS.SHARD_MOVE_GRACE
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Your data is being moved, try again shortly",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    async with async_session_factory(bind=get_shard_engine(shard)) as user_session:
+        yield user_session
+
+
+async def get_shard_sessions(session: AsyncSession = Depends(get_session)):
+    """One session per shard, in SHARD_DSNS order, for routes that read the data of every user"""
+    if not is_sharded():
+        yield [session]
+        return
+
+    async with AsyncExitStack() as stack:
+        yield [
+            await stack.enter_async_context(async_session_factory(bind=get_shard_engine(shard)))
+            for shard in get_shard_names()
+        ]
+
+
+class TodoRepoSessions:
+    """Opens sessions on the shard holding a TodoRepo, for routes that don't know its user
+
+    Nothing is looked up until a session is opened.
+    The shard that issued the id is tried first, then the others, for TodoRepos whose user was moved.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_session)):
+        self.session = session
+
+    @asynccontextmanager
+    async def open(self, todo_repo_id: int) -> AsyncIterator[AsyncSession]:
+        if not is_sharded():
+            yield self.session
+            return
+
+        origin = get_origin_shard(todo_repo_id)
+        shards = sorted(get_shard_names(), key=lambda shard: shard != origin)
+        for shard in shards:
+            async with async_session_factory(bind=get_shard_engine(shard)) as todo_repo_session:
+                q = await todo_repo_session.execute(
+                    select(todo_models.TodoRepo.id).where(todo_models.TodoRepo.id == todo_repo_id)
+                )
+                if q.scalar() is not None or shard == shards[-1]:
+                    # Not found anywhere: the last shard answers, and the route reports the TodoRepo as missing
+                    yield todo_repo_session
+                    return
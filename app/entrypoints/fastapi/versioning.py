@@ -0,0 +1,24 @@
+from fastapi import Header, HTTPException, status
+
+
+def parse_if_match(if_match: str) -> int | None:
+    """Version an If-Match header asks for, or None for `*`
+
+    The entity tag is the `version` of the TodoRepo or task, quoted or not: `"3"`, `W/"3"` and `3` all read as 3.
+    """
+    if (tag := if_match.strip()) == "*":
+        return None
+    tag = tag.removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        raise ValueError(f"If-Match must be a single version, got {if_match}")
+    return int(tag)
+
+
+def get_if_match_version(if_match: str | None = Header(None, max_length=64)) -> int | None:
+    # Without If-Match updates apply to whatever version is current
+    if if_match is None:
+        return None
+    try:
+        return parse_if_match(if_match)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,51 @@
+"""Move old DailyTodos and their tasks to the archive
+
+    python -m app.entrypoints.jobs.archive [--before YYYY-MM-DD]
+
+Days before `--before` (default: ARCHIVE_AFTER_DAYS ago) are archived one TodoRepo per transaction.
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+
+from app import settings
+from app.db import dispose_engines, get_shard_engine, get_shard_names, init_mappers, async_session_factory
+from app.adapters.todo.repository import DailyTodoArchiveRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+async def archive(before: datetime.date) -> int:
+    archived = 0
+    for shard in get_shard_names():
+        engine = get_shard_engine(shard)
+        async with async_session_factory(bind=engine) as session:
+            todo_repo_ids = await DailyTodoArchiveRepository(session).get_todo_repo_ids_to_archive(before)
+
+        shard_archived = 0
+        for todo_repo_id in todo_repo_ids:
+            async with async_session_factory(bind=engine) as session:
+                shard_archived += await DailyTodoArchiveRepository(session).archive_daily_todos(todo_repo_id, before)
+        logger.info(
+            "Archived %d days of %d TodoRepos before %s on shard %s", shard_archived, len(todo_repo_ids), before, shard
+        )
+        archived += shard_archived
+    return archived
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_mappers()
+    try:
+        await archive(args.before)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    default_before = datetime.date.today() - datetime.timedelta(days=settings.ARCHIVE_SETTINGS.ARCHIVE_AFTER_DAYS)
+    parser = argparse.ArgumentParser(description="Archive old DailyTodos")
+    parser.add_argument("--before", type=datetime.date.fromisoformat, default=default_before)
+    asyncio.run(main(parser.parse_args()))
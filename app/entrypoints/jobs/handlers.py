@@ -0,0 +1,73 @@
+"""Handlers of the jobs run by app.entrypoints.jobs.worker
+
+Each maintenance CLI of this package is also a job, so it can be scheduled through the jobs table. Workers queue
+the recurring ones, purges included, as set in JOB_SCHEDULE.
+Dates in payloads are ISO strings.
+"""
+import datetime
+import logging
+
+from app import settings
+from app.db import get_engine, async_session_factory
+from app.adapters.auth.repository import RevokedTokenRepository
+from app.adapters.job.repository import JobRepository
+from app.adapters.idempotency.repository import IdempotencyKeyRepository
+from app.domain.idempotency.models import utcnow
+from app.entrypoints.jobs import archive, partitions, shards, stats
+from app.service.job.registry import job_registry
+
+
+logger = logging.getLogger(__name__)
+
+
+@job_registry.register("partitions.create", queue="maintenance")
+async def create_partitions(payload: dict) -> None:
+    await partitions.create(payload.get("ahead", settings.PARTITION_SETTINGS.TASK_PARTITIONS_AHEAD))
+
+
+@job_registry.register("partitions.detach", queue="maintenance")
+async def detach_partitions(payload: dict) -> None:
+    await partitions.detach(datetime.date.fromisoformat(payload["before"]))
+
+
+@job_registry.register("archive", queue="maintenance")
+async def archive_daily_todos(payload: dict) -> None:
+    if before := payload.get("before"):
+        before = datetime.date.fromisoformat(before)
+    else:
+        before = datetime.date.today() - datetime.timedelta(days=settings.ARCHIVE_SETTINGS.ARCHIVE_AFTER_DAYS)
+    await archive.archive(before)
+
+
+@job_registry.register("stats.backfill", queue="maintenance")
+async def backfill_stats(payload: dict) -> None:
+    await stats.backfill(payload.get("todo_repo_ids"))
+
+
+@job_registry.register("shards.rebalance", queue="maintenance")
+async def rebalance_shards(payload: dict) -> None:
+    await shards.rebalance(payload["user_id"], payload["to"])
+
+
+@job_registry.register("revoked_tokens.purge")
+async def purge_revoked_tokens(payload: dict) -> None:
+    async with async_session_factory(bind=get_engine()) as session:
+        deleted = await RevokedTokenRepository(session).delete_expired_revoked_tokens()
+    logger.info("Purged %d expired revoked tokens", deleted)
+
+
+@job_registry.register("idempotency_keys.purge")
+async def purge_idempotency_keys(payload: dict) -> None:
+    async with async_session_factory(bind=get_engine()) as session:
+        deleted = await IdempotencyKeyRepository(session).delete_expired_idempotency_keys(utcnow())
+    logger.info("Purged %d expired idempotency keys", deleted)
+
+
+@job_registry.register("jobs.purge")
+async def purge_jobs(payload: dict) -> None:
+    days = payload.get("days", settings.JOB_SETTINGS.JOB_RETENTION_DAYS)
+    async with async_session_factory(bind=get_engine()) as session:
+        deleted = await JobRepository(session).delete_finished_jobs(
+            datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=days)
+        )
+    logger.info("Purged %d jobs finished more than %d days ago", deleted, days)
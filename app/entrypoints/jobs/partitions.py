@@ -0,0 +1,72 @@
+"""Partition maintenance for daily_todo_tasks
+
+    python -m app.entrypoints.jobs.partitions create [--ahead N]
+    python -m app.entrypoints.jobs.partitions detach --before YYYY-MM-DD
+
+Workers queue `create` daily, as the partitions.create job of JOB_SCHEDULE, so that partitions always exist
+before their rows arrive; the CLI runs it by hand.
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+
+from app import settings
+from app.db import dispose_engines, get_shard_engine, get_shard_names
+from app.adapters.todo.partitioning import (
+    DAILY_TODO_TASKS_PARTITION_SPEC,
+    create_future_partitions,
+    detach_partitions_before,
+    get_copied_columns,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+async def create(ahead: int) -> list[str]:
+    # The job handlers import this module, and app.main leaves the ORM tables unloaded
+    from app.adapters.todo.persistent_orm import daily_todo_tasks
+
+    created = []
+    for shard in get_shard_names():
+        async with get_shard_engine(shard).begin() as conn:
+            shard_created = await create_future_partitions(
+                conn, DAILY_TODO_TASKS_PARTITION_SPEC, ahead, columns=get_copied_columns(daily_todo_tasks)
+            )
+        logger.info("Created partitions on shard %s: %s", shard, shard_created)
+        created += shard_created
+    return created
+
+
+async def detach(before: datetime.date) -> list[str]:
+    detached = []
+    for shard in get_shard_names():
+        # DETACH ... CONCURRENTLY refuses to run inside a transaction block
+        async with get_shard_engine(shard).connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            shard_detached = await detach_partitions_before(conn, DAILY_TODO_TASKS_PARTITION_SPEC, before)
+        logger.info("Detached partitions on shard %s: %s", shard, shard_detached)
+        detached += shard_detached
+    return detached
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        if args.command == "create":
+            await create(args.ahead)
+        else:
+            await detach(args.before)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="daily_todo_tasks partition maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    create_parser = subparsers.add_parser("create", help="create the current and upcoming partitions")
+    create_parser.add_argument("--ahead", type=int, default=settings.PARTITION_SETTINGS.TASK_PARTITIONS_AHEAD)
+    detach_parser = subparsers.add_parser("detach", help="detach partitions that end on or before a date")
+    detach_parser.add_argument("--before", type=datetime.date.fromisoformat, required=True)
+    asyncio.run(main(parser.parse_args()))
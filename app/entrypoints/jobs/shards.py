@@ -0,0 +1,125 @@
+"""Shard maintenance
+
+    python -m app.entrypoints.jobs.shards init
+    python -m app.entrypoints.jobs.shards rebalance --user-id ID --to SHARD
+
+Shards are the databases of SHARD_DSNS; user_shards, on the main database, records the shard of each user.
+Migrate each Postgres shard (`alembic -x shard=NAME upgrade head`) and then run `init`, which interleaves
+their id sequences so that ids stay unique when users move, and creates the tables of SQLite shards.
+"""
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import inspect, text
+
+from app import settings
+from app.db import dispose_engines, get_engine, get_shard_engine, get_shard_names, init_mappers, async_session_factory
+from app.adapters.shard.repository import UserShardRepository
+from app.adapters.shard.shard_map import get_shard_map
+from app.adapters.shard.transfer import USER_MODELS, copy_user_data, delete_user_data
+
+
+logger = logging.getLogger(__name__)
+
+
+def _get_serial_tables() -> list[str]:
+    return [
+        inspect(model).local_table.name
+        for model in USER_MODELS
+        if (column := inspect(model).local_table.c.get("id")) is not None and column.autoincrement is True
+    ]
+
+
+async def init() -> None:
+    from app.adapters.todo.in_memory_orm import metadata as in_memory_metadata
+
+    stride = settings.SHARD_SETTINGS.SHARD_ID_STRIDE
+    shards = get_shard_names()
+    if len(shards) > stride:
+        raise ValueError(f"{len(shards)} shards don't fit in SHARD_ID_STRIDE={stride}")
+
+    for position, shard in enumerate(shards):
+        async with get_shard_engine(shard).begin() as conn:
+            if conn.dialect.name == "sqlite":
+                # SQLite has no sequences, so rows of a moved user may collide with the ids of the target
+                await conn.run_sync(in_memory_metadata.create_all)
+                logger.info("Created the tables of shard %s", shard)
+                continue
+
+            for table in _get_serial_tables():
+                # Each shard issues the ids `position` modulo `stride`, above every id it already has
+                sequence = (await conn.execute(text(f"SELECT pg_get_serial_sequence('{table}', 'id')"))).scalar()
+                current = (
+                    await conn.execute(
+                        text(f"SELECT greatest((SELECT last_value FROM {sequence}), (SELECT max(id) FROM {table}))")
+                    )
+                ).scalar()
+                start = (current // stride + 1) * stride + position
+                await conn.execute(text(f"ALTER SEQUENCE {sequence} INCREMENT BY {stride} RESTART WITH {start}"))
+                logger.info("Shard %s issues ids of %s from %d every %d", shard, table, start, stride)
+
+
+async def rebalance(user_id: int, to: str) -> dict[str, int]:
+    """Moves the rows of a user to the shard `to`
+
+    The move is announced first and its rows are only copied once every cached placement of the user has expired,
+    so requests are turned away with 503 instead of writing to the old shard while it is copied.
+    """
+    if to not in get_shard_names():
+        raise ValueError(f"Unknown shard: {to}")
+
+    async with async_session_factory(bind=get_engine()) as session:
+        repository = UserShardRepository(session)
+        shard, moving_to = await get_shard_map().get(user_id, repository)
+        if shard == to:
+            logger.info("User %d is already on shard %s", user_id, to)
+            return {}
+        if not await repository.start_move(user_id, to):
+            raise RuntimeError(f"User {user_id} is already being moved to {moving_to}")
+
+    await asyncio.sleep(settings.SHARD_SETTINGS.SHARD_MAP_CACHE_TTL + settings.SHARD_SETTINGS.SHARD_MOVE_GRACE)
+
+    try:
+        async with (
+            async_session_factory(bind=get_shard_engine(shard)) as source,
+            async_session_factory(bind=get_shard_engine(to)) as target,
+        ):
+            copied = await copy_user_data(source, target, user_id)
+            await target.commit()
+    except Exception:
+        async with async_session_factory(bind=get_engine()) as session:
+            await UserShardRepository(session).cancel_move(user_id, to)
+        raise
+
+    async with async_session_factory(bind=get_engine()) as session:
+        await UserShardRepository(session).finish_move(user_id, to)
+    get_shard_map().invalidate(user_id)
+
+    async with async_session_factory(bind=get_shard_engine(shard)) as source:
+        await delete_user_data(source, user_id)
+        await source.commit()
+    logger.info("Moved user %d from shard %s to %s: %s", user_id, shard, to, copied)
+    return copied
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_mappers()
+    try:
+        if args.command == "init":
+            await init()
+        else:
+            await rebalance(args.user_id, args.to)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Shard maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("init", help="interleave the id sequences of the shards and create SQLite shards")
+    rebalance_parser = subparsers.add_parser("rebalance", help="move the data of a user to another shard")
+    rebalance_parser.add_argument("--user-id", type=int, required=True)
+    rebalance_parser.add_argument("--to", required=True)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,64 @@
+"""Backfill the weekly, monthly and weekday task rollups
+
+    python -m app.entrypoints.jobs.stats [--todo-repo-id ID ...]
+
+Rollups of every TodoRepo (or of the given ones) are recounted from their live and archived tasks,
+one TodoRepo per transaction. Afterwards they are kept current by the writes that change tasks.
+"""
+import argparse
+import asyncio
+import logging
+
+from app.db import dispose_engines, get_shard_engine, get_shard_names, init_mappers, async_session_factory
+from app.adapters.todo.repository import TodoRepoStatsRepository
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+async def backfill(todo_repo_ids: list[int] | None = None) -> int:
+    rebuilt = 0
+    for shard in get_shard_names():
+        rebuilt += await _backfill_shard(shard, todo_repo_ids)
+    logger.info("Rebuilt the stats of %d TodoRepos", rebuilt)
+    return rebuilt
+
+
+async def _backfill_shard(shard: str, todo_repo_ids: list[int] | None) -> int:
+    # Given ids that live on another shard rebuild nothing here
+    engine = get_shard_engine(shard)
+    rebuilt = 0
+    cursor = None
+    while True:
+        if todo_repo_ids is None:
+            async with async_session_factory(bind=engine) as session:
+                batch = await TodoRepoStatsRepository(session).get_todo_repo_ids(cursor, BATCH_SIZE)
+        else:
+            batch, todo_repo_ids = todo_repo_ids, []
+        if not batch:
+            break
+
+        for todo_repo_id in batch:
+            async with async_session_factory(bind=engine) as session:
+                tasks = await TodoRepoStatsRepository(session).rebuild_todo_repo_stats(todo_repo_id)
+            logger.debug("Rebuilt the stats of TodoRepo %d from %d tasks on shard %s", todo_repo_id, tasks, shard)
+            rebuilt += 1
+        cursor = batch[-1]
+    return rebuilt
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_mappers()
+    try:
+        await backfill(args.todo_repo_id)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Backfill the task rollups of TodoRepos")
+    parser.add_argument("--todo-repo-id", type=int, action="append")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,170 @@
+"""Run queued jobs
+
+    python -m app.entrypoints.jobs.worker [--queue NAME=CONCURRENCY ...]
+
+Queues default to JOB_QUEUES. Any number of workers can poll the same queues; with JOB_WORKER_IN_PROCESS
+the app runs one in its own process instead. Workers also queue the recurring jobs of JOB_SCHEDULE when they
+are due, so the maintenance jobs need no cron entries.
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import random
+import signal
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import settings
+from app.db import dispose_engines, get_engine, init_mappers, async_session_factory
+from app.domain.job import models as job_models
+from app.adapters.job.repository import JobRepository
+from app.service.job.handlers import JobService
+from app.service.job.registry import JobRegistry, job_registry
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ERROR_LENGTH = 2000
+
+
+def get_retry_delay(attempts: int) -> float:
+    # Exponential backoff with jitter, so that jobs failing together don't retry together
+    delay = settings.JOB_SETTINGS.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1)
+    return min(delay, settings.JOB_SETTINGS.JOB_RETRY_MAX_DELAY) * random.uniform(0.5, 1.0)
+
+
+class Worker:
+    """Polls each queue and runs up to its concurrency of jobs at once, and queues the recurring jobs of `schedule`"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        queues: dict[str, int],
+        registry: JobRegistry = job_registry,
+        poll_interval: float | None = None,
+        lock_timeout: int | None = None,
+        schedule: dict[str, int] | None = None,
+        schedule_interval: float | None = None,
+    ):
+        self.session_factory = session_factory
+        self.queues = queues
+        self.registry = registry
+        self.poll_interval = poll_interval or settings.JOB_SETTINGS.JOB_POLL_INTERVAL
+        self.lock_timeout = lock_timeout or settings.JOB_SETTINGS.JOB_LOCK_TIMEOUT
+        self.schedule = schedule or {}
+        self.schedule_interval = schedule_interval or settings.JOB_SETTINGS.JOB_SCHEDULE_INTERVAL
+        if unknown := [name for name in self.schedule if name not in registry]:
+            raise ValueError(f"Scheduled jobs {', '.join(unknown)} are not registered")
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        runs = [self._run_queue(queue, concurrency) for queue, concurrency in self.queues.items()]
+        if self.schedule:
+            runs.append(self._run_schedule())
+        await asyncio.gather(*runs)
+
+    async def _run_schedule(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                async with self.session_factory() as session:
+                    await JobService.schedule_recurring_jobs(
+                        self.schedule, repository=JobRepository(session), registry=self.registry
+                    )
+            except Exception:
+                logger.exception("Failed to queue the recurring jobs")
+            await self._wait(set(), self.schedule_interval)
+
+    async def _run_queue(self, queue: str, concurrency: int) -> None:
+        running: set[asyncio.Task] = set()
+        while not self._stopping.is_set():
+            jobs = []
+            if (free := concurrency - len(running)) > 0:
+                try:
+                    async with self.session_factory() as session:
+                        jobs = await JobRepository(session).dequeue(queue, free, self.lock_timeout)
+                except Exception:
+                    logger.exception("Failed to dequeue from %s", queue)
+
+            for job in jobs:
+                task = asyncio.create_task(self._execute(job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+
+            if len(running) >= concurrency:
+                await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            elif len(jobs) < free:
+                # The queue is drained; poll again later, or as soon as a slot frees up
+                await self._wait(running, self.poll_interval)
+
+        # Jobs in flight are finished rather than left to the lock timeout
+        if running:
+            await asyncio.wait(running)
+
+    async def _wait(self, running: set[asyncio.Task], timeout: float) -> None:
+        stopping = asyncio.create_task(self._stopping.wait())
+        await asyncio.wait([stopping, *running], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        stopping.cancel()
+
+    async def _execute(self, job: job_models.Job) -> None:
+        try:
+            if (spec := self.registry.get(job.name)) is None:
+                raise LookupError(f"Job {job.name!r} is not registered")
+            if job.attempts > job.max_attempts:
+                raise RuntimeError(f"Job {job.name!r} was lost after {job.max_attempts} attempts")
+            await spec.handler(job.payload)
+        except Exception as e:
+            retry = spec is not None and job.attempts < job.max_attempts
+            logger.warning("Job %d (%s) failed on attempt %d", job.id, job.name, job.attempts, exc_info=True)
+            retry_at = job_models.utcnow() + datetime.timedelta(seconds=get_retry_delay(job.attempts))
+            await self._finish(JobRepository.fail_job, job, repr(e)[:MAX_ERROR_LENGTH], retry_at if retry else None)
+        else:
+            await self._finish(JobRepository.complete_job, job)
+
+    async def _finish(self, method, job: job_models.Job, *args) -> None:
+        try:
+            async with self.session_factory() as session:
+                if not await method(JobRepository(session), job, *args):
+                    logger.warning("Job %d (%s) was claimed again before it finished", job.id, job.name)
+        except Exception:
+            # The job stays running and is claimed again once its lock times out
+            logger.exception("Failed to record the result of job %d (%s)", job.id, job.name)
+
+
+def create_worker(queues: dict[str, int] | None = None) -> Worker:
+    # Imported for the registrations they make
+    from app.entrypoints.jobs import handlers  # noqa: F401
+
+    return Worker(
+        session_factory=lambda: async_session_factory(bind=get_engine()),
+        queues=queues or settings.JOB_SETTINGS.JOB_QUEUES,
+        schedule=settings.JOB_SETTINGS.JOB_SCHEDULE,
+    )
+
+
+def parse_queue(value: str) -> tuple[str, int]:
+    name, _, concurrency = value.partition("=")
+    return name, int(concurrency or 1)
+
+
+async def main(args: argparse.Namespace) -> None:
+    init_mappers()
+    worker = create_worker(dict(args.queue) if args.queue else None)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run queued jobs")
+    parser.add_argument("--queue", type=parse_queue, action="append", help="NAME=CONCURRENCY")
+    asyncio.run(main(parser.parse_args()))
@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError, HTTPException
 from fastapi.responses import JSONResponse
@@ -5,12 +7,35 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from starlette.middleware.cors import CORSMiddleware
 
 from app import settings
+from app.db import init_mappers
 from app.entrypoints.fastapi.api_v1.router import api_router as api_v1_router
 from app.entrypoints.fastapi.api_v1 import schemas
+from app.entrypoints.fastapi.encoding import ResponseEncodingMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.STAGE != "testing":
+        init_mappers()
+
+    worker_task = None
+    if settings.JOB_SETTINGS.JOB_WORKER_IN_PROCESS and settings.STAGE != "testing":
+        from app.entrypoints.jobs.worker import create_worker
+
+        worker = create_worker()
+        worker_task = asyncio.create_task(worker.run())
+
+    yield
+
+    if worker_task is not None:
+        worker.stop()
+        await worker_task
+
 
 app = FastAPI(
     title="Commit Today: TODO List with Progress Visualization",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 app.include_router(api_v1_router)
@@ -21,6 +46,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     return JSONResponse(
         status_code=exc.status_code,
         content=schemas.Response(ok=False, message=str(exc.detail), data=None).model_dump(),
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -39,6 +65,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ResponseEncodingMiddleware)
+if settings.PROFILING_SETTINGS.enabled:
+    # Outermost, so that profiles include the other middlewares; not installed at all otherwise
+    from app.entrypoints.fastapi.profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
 
 
 @app.get("/")
@@ -1,5 +1,10 @@
+import datetime
+from typing import Any
+from fastapi import HTTPException
+
 from app.domain.auth import models as auth_models
-from app.adapters.auth.repository import UserRepository
+from app.adapters.auth.repository import UserRepository, RevokedTokenRepository
+from app.adapters.auth.revocation_filter import get_revocation_filter
 from app.service import exceptions
 from app.entrypoints.fastapi.security import JWTAuthorizer
 
@@ -9,14 +14,14 @@ class UserService:
     async def signup_user(
         email: str, password: str, user_name: str, last_name: str, first_name: str, *, repository: UserRepository
     ) -> dict:
-        if await repository.get_user_by_email(email):
-            raise exceptions.UserAlreadyExists(f"User with email ({email}) already exists")
-
         user = auth_models.User(
             email=email, password=password, username=user_name, last_name=last_name, first_name=first_name
         )
         user.hash_password()
-        res = await repository.create_user(user)
+
+        # A single INSERT ... ON CONFLICT DO NOTHING: concurrent signups with the same email can't both succeed
+        if (res := await repository.create_user_if_email_not_exists(user)) is None:
+            raise exceptions.UserAlreadyExists(f"User with email ({email}) already exists")
 
         return res.dict()
 
@@ -33,19 +38,62 @@ class UserService:
         )
 
     @staticmethod
-    async def refresh_login(refresh_token: str | None, *, repository: UserRepository) -> dict:
+    async def refresh_login(
+        refresh_token: str | None,
+        *,
+        repository: UserRepository,
+        revoked_token_repository: RevokedTokenRepository,
+    ) -> dict:
         if refresh_token is None:
             raise exceptions.NoTokenExists(f"Refresh token doesn't exist")
 
         payload = JWTAuthorizer.decode(refresh_token, is_refresh=True)
-        email = payload.get("sub")
+        email, jti = payload.get("sub"), payload.get("jti")
 
-        if not email:
+        if not (email and jti):
             raise exceptions.InvalidToken(f"Refresh token is invalid")
+        if await get_revocation_filter().is_revoked(jti, revoked_token_repository):
+            raise exceptions.InvalidToken(f"Refresh token is revoked")
         if (user := await repository.get_user_by_email(email)) is None:
             raise exceptions.UserNotFound(f"User with email ({email}) not found")
 
+        # Rotation: the refresh token can be exchanged only once
+        await UserService._revoke_tokens([payload], repository=revoked_token_repository)
+
         return dict(
             access_token=JWTAuthorizer.create(user.dict()),
             refresh_token=JWTAuthorizer.create(user.dict(), is_refresh=True),
         )
+
+    @staticmethod
+    async def logout_user(
+        access_token: str | None, refresh_token: str | None, *, repository: RevokedTokenRepository
+    ) -> None:
+        payloads = []
+        for token, is_refresh in [(access_token, False), (refresh_token, True)]:
+            if token is None:
+                continue
+            try:
+                payloads.append(JWTAuthorizer.decode(token, is_refresh=is_refresh))
+            except HTTPException:
+                # Tokens that fail to decode (expired, tampered) can't be used anyway
+                continue
+
+        await UserService._revoke_tokens([p for p in payloads if p.get("jti")], repository=repository)
+
+    @staticmethod
+    async def _revoke_tokens(payloads: list[dict[str, Any]], *, repository: RevokedTokenRepository) -> None:
+        if not payloads:
+            return
+
+        revoked_tokens = [
+            auth_models.RevokedToken(
+                jti=payload["jti"],
+                expires_at=datetime.datetime.fromtimestamp(payload["exp"], tz=datetime.timezone.utc),
+            )
+            for payload in payloads
+        ]
+        await repository.revoke_tokens(revoked_tokens)
+
+        for revoked_token in revoked_tokens:
+            get_revocation_filter().add(revoked_token.jti)
@@ -32,3 +32,27 @@ class DailyTodoNotFound(Exception):
 
 class DailyTodoTaskNotFound(Exception):
     ...
+
+
+class InvalidCursor(Exception):
+    ...
+
+
+class InvalidStatsRange(Exception):
+    ...
+
+
+class InvalidCarryOver(Exception):
+    ...
+
+
+class JobNotRegistered(Exception):
+    ...
+
+
+class JobNotFound(Exception):
+    ...
+
+
+class VersionConflict(Exception):
+    ...
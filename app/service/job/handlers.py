@@ -0,0 +1,71 @@
+import datetime
+
+from app import settings
+from app.domain.job import models as job_models
+from app.adapters.job.repository import JobRepository
+from app.service import exceptions
+from app.service.job.registry import JobRegistry, job_registry
+
+
+class JobService:
+    @staticmethod
+    def build_job(
+        name: str,
+        payload: dict | None = None,
+        run_at: datetime.datetime | None = None,
+        *,
+        registry: JobRegistry = job_registry,
+    ) -> job_models.Job:
+        # Services add the built job to their own session, so that it is queued only if their changes commit.
+        # Workers poll the main database only: a job added to a session of another shard is never run.
+        if (spec := registry.get(name)) is None:
+            raise exceptions.JobNotRegistered(f"Job {name!r} is not registered")
+
+        return job_models.Job(
+            name=name,
+            payload=payload or {},
+            queue=spec.queue,
+            max_attempts=spec.max_attempts or settings.JOB_SETTINGS.JOB_MAX_ATTEMPTS,
+            run_at=run_at or job_models.utcnow(),
+        )
+
+    @staticmethod
+    async def enqueue(
+        name: str,
+        payload: dict | None = None,
+        run_at: datetime.datetime | None = None,
+        *,
+        repository: JobRepository,
+        registry: JobRegistry = job_registry,
+    ) -> dict:
+        job = JobService.build_job(name, payload, run_at, registry=registry)
+        res = await repository.enqueue(job)
+
+        return res.dict()
+
+    @staticmethod
+    async def schedule_recurring_jobs(
+        schedule: dict[str, int],
+        now: datetime.datetime | None = None,
+        *,
+        repository: JobRepository,
+        registry: JobRegistry = job_registry,
+    ) -> int:
+        # Each run is keyed by its name and its start, the last multiple of its interval since the epoch, so that
+        # the workers checking the schedule at once queue it once between them
+        now = now or job_models.utcnow()
+        jobs = []
+        for name, interval in schedule.items():
+            run_at = datetime.datetime.fromtimestamp(now.timestamp() // interval * interval, datetime.timezone.utc)
+            job = JobService.build_job(name, run_at=run_at, registry=registry)
+            job.schedule_key = f"{name}@{run_at.isoformat()}"
+            jobs.append(job)
+
+        return await repository.schedule(jobs)
+
+    @staticmethod
+    async def get_job(id: int, *, repository: JobRepository) -> dict:
+        if (job := await repository.get(id)) is None:
+            raise exceptions.JobNotFound(f"Job with id {id} not found")
+
+        return job.dict()
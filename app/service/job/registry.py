@@ -0,0 +1,47 @@
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+
+JobHandler = Callable[[dict], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    name: str
+    handler: JobHandler
+    queue: str
+    max_attempts: int | None  # None for JOB_MAX_ATTEMPTS
+
+
+class JobRegistry:
+    """Job name -> handler, with the queue and retry budget its jobs are enqueued with
+
+    Handlers take the JSON payload of the job. A job may run more than once (after a retry, or when its worker
+    is lost mid-run), so handlers must be idempotent.
+    """
+
+    def __init__(self):
+        self._specs: dict[str, JobSpec] = {}
+
+    def register(self, name: str, *, queue: str = "default", max_attempts: int | None = None):
+        def decorator(handler: JobHandler) -> JobHandler:
+            if name in self._specs:
+                raise ValueError(f"Job {name!r} is already registered")
+            self._specs[name] = JobSpec(
+                name=name,
+                handler=handler,
+                queue=queue,
+                max_attempts=max_attempts,
+            )
+            return handler
+
+        return decorator
+
+    def get(self, name: str) -> JobSpec | None:
+        return self._specs.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+
+job_registry = JobRegistry()
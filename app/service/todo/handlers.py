@@ -1,52 +1,139 @@
 import datetime
+from operator import attrgetter
+from typing import Sequence
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.domain.todo import models as todo_models
-from app.adapters.todo.repository import TodoRepoRepository, DailyTodoRepository
+from app.adapters.todo import stats
+from app.adapters.todo.repository import (
+    TodoRepoRepository,
+    DailyTodoRepository,
+    TodoRepoStatsRepository,
+    TodoSearchRepository,
+)
 from app.service import exceptions
-from app.utils.pagination import CursorPagination
+from app.utils.pagination import CursorPagination, encode_cursor, decode_cursor
+
+
+def _merge_by_id(items: Sequence, reverse: bool = False) -> list:
+    # Rows of a user being moved are on both shards until the move completes
+    return sorted({item.id: item for item in items}.values(), key=attrgetter("id"), reverse=reverse)
 
 
 class TodoRepoService:
     @staticmethod
     async def create_todo_repo(
-        title: str, description: str, user_id: int, *, repository: TodoRepoRepository
+        title: str, description: str, user_id: int, is_public: bool = False, *, repository: TodoRepoRepository
     ) -> dict:
-        todo_repo = todo_models.TodoRepo(title=title, description=description, user_id=user_id)
+        todo_repo = todo_models.TodoRepo(title=title, description=description, user_id=user_id, is_public=is_public)
         res = await repository.create_todo_repo(todo_repo)
 
         return res.dict()
 
     @staticmethod
     async def update_todo_repo(
-        id: int, title: str | None, description: str | None, *, repository: TodoRepoRepository
+        id: int,
+        title: str | None,
+        description: str | None,
+        version: int | None = None,
+        is_public: bool | None = None,
+        *,
+        repository: TodoRepoRepository,
     ) -> dict:
+        # `version` is the one the client last read; None updates whatever version is current
         if (todo_repo := await repository.get(id)) is None:
             raise exceptions.TodoRepoNotFound(f"TodoRepo with id {id} not found")
+        if version is not None and todo_repo.version != version:
+            raise exceptions.VersionConflict(f"TodoRepo with id {id} is at version {todo_repo.version}, not {version}")
 
         if title:
             todo_repo.title = title
         if description:
             todo_repo.description = description
+        if is_public is not None:
+            todo_repo.is_public = is_public
 
-        res = await repository.update_todo_repo(todo_repo)
+        try:
+            res = await repository.update_todo_repo(todo_repo)
+        except StaleDataError:
+            raise exceptions.VersionConflict(f"TodoRepo with id {id} was updated concurrently")
 
         return res.dict()
 
+    @staticmethod
+    async def delete_todo_repo(id: int, user_id: int, *, repository: TodoRepoRepository) -> dict:
+        if (todo_repo := await repository.get(id)) is None or todo_repo.user_id != user_id:
+            raise exceptions.TodoRepoNotFound(f"TodoRepo with id {id} not found")
+
+        res = todo_repo.dict()
+        await repository.delete_todo_repo(todo_repo)
+
+        return res
+
     @staticmethod
     async def get_todo_repos(
-        user_id: int = 0, cursor: int | None = None, page_size: int = 10, *, repository: TodoRepoRepository
+        user_id: int = 0,
+        cursor: int | None = None,
+        page_size: int = 10,
+        include_total: bool = False,
+        *,
+        repository: TodoRepoRepository,
     ) -> dict:
-        curr_items = await repository.get_todo_repos_by_user_id(user_id, cursor, page_size)
+        curr_items = await repository.get_todo_repo_records_by_user_id(user_id, cursor, page_size)
 
         # Pagination
         cursor_pagination = CursorPagination(cursor=cursor, page_size=page_size, curr_items=curr_items)
         next_cursor = cursor_pagination.next_cursor
 
-        prev_items, next_items = await repository.get_prev_todo_repos_and_next_todo_repos(
+        prev_items, next_items = await repository.get_prev_todo_repo_records_and_next_todo_repo_records(
             user_id=user_id, cursor=cursor, next_cursor=next_cursor, page_size=page_size
         )
 
-        return cursor_pagination.get_pagiantion_response(prev_items=prev_items, next_items=next_items)
+        res = cursor_pagination.get_pagiantion_response(prev_items=prev_items, next_items=next_items)
+        if include_total:
+            # Maintained counter, not COUNT(*)
+            res["paging"]["total"] = await repository.get_todo_repo_count(user_id)
+
+        return res
+
+    @staticmethod
+    async def get_all_todo_repos(
+        cursor: int | None = None,
+        page_size: int = 10,
+        include_total: bool = False,
+        *,
+        repositories: Sequence[TodoRepoRepository],
+    ) -> dict:
+        # One repository per shard. Ids are unique across shards, so a page is the top of the pages of every shard.
+        curr_items = []
+        for repository in repositories:
+            curr_items += await repository.get_todo_repo_records(cursor, page_size)
+        curr_items = _merge_by_id(curr_items, reverse=True)[:page_size]
+
+        # Pagination
+        cursor_pagination = CursorPagination(cursor=cursor, page_size=page_size, curr_items=curr_items)
+        next_cursor = cursor_pagination.next_cursor
+
+        prev_items, next_items = [], []
+        for repository in repositories:
+            shard_prev_items, shard_next_items = await repository.get_prev_todo_repo_ids_and_next_todo_repo_ids(
+                cursor=cursor, next_cursor=next_cursor, page_size=page_size
+            )
+            prev_items += shard_prev_items
+            next_items += shard_next_items
+        prev_items = _merge_by_id(prev_items)[:page_size]
+        next_items = _merge_by_id(next_items, reverse=True)[:1]
+
+        res = cursor_pagination.get_pagiantion_response(prev_items=prev_items, next_items=next_items)
+        if include_total:
+            # Planner estimate; an exact count over every user's TodoRepos would scan the whole table
+            res["paging"]["total"] = sum(
+                [await repository.get_estimated_todo_repo_count() for repository in repositories]
+            )
+            res["paging"]["total_is_estimate"] = True
+
+        return res
 
 
 class DailyTodoService:
@@ -70,6 +157,17 @@ class DailyTodoService:
 
         return daily_todo.dict()
 
+    @staticmethod
+    async def put_daily_todo(
+        todo_repo_id: int, date: datetime.date, *, repository: DailyTodoRepository
+    ) -> tuple[dict, bool]:
+        try:
+            created = await repository.create_daily_todo_if_not_exists(todo_repo_id, date)
+        except IntegrityError:
+            raise exceptions.TodoRepoNotFound(f"TodoRepo with id {todo_repo_id} not found")
+
+        return dict(todo_repo_id=todo_repo_id, date=date), created
+
     @staticmethod
     async def get_daily_todo(todo_repo_id: int, date: datetime.date, *, repository: DailyTodoRepository) -> dict:
         if (daily_todo := await repository.get(todo_repo_id, date)) is None:
@@ -77,11 +175,50 @@ class DailyTodoService:
 
         return daily_todo.dict()
 
+    @staticmethod
+    async def get_daily_todos(
+        todo_repo_id: int, cursor: str | None = None, page_size: int = 10, *, repository: DailyTodoRepository
+    ) -> dict:
+        # Newest first; the opaque cursor wraps the (date,) sort key
+        try:
+            key = decode_cursor(cursor, (datetime.date,)) if cursor else None
+        except ValueError as e:
+            raise exceptions.InvalidCursor(str(e))
+        curr_items = await repository.get_daily_todo_records_by_todo_repo_id(todo_repo_id, key, page_size)
+
+        # Pagination
+        cursor_pagination = CursorPagination(
+            cursor=key, page_size=page_size, curr_items=curr_items, key=lambda r: (r.date,), encode=encode_cursor
+        )
+        next_cursor = cursor_pagination.next_cursor
+
+        prev_items, next_items = await repository.get_prev_daily_todo_records_and_next_daily_todo_records(
+            todo_repo_id, cursor=key, next_cursor=next_cursor, page_size=page_size
+        )
+
+        return cursor_pagination.get_pagiantion_response(prev_items=prev_items, next_items=next_items)
+
     @staticmethod
     async def create_daily_todo_task(
-        todo_repo_id: int, date: datetime.date, content: str, *, repository: DailyTodoRepository
+        todo_repo_id: int,
+        date: datetime.date,
+        content: str,
+        *,
+        repository: DailyTodoRepository,
+        create_daily_todo: bool = False,
     ) -> dict:
-        if (daily_todo := await repository.get(todo_repo_id, date)) is None:
+        if create_daily_todo:
+            daily_todo_task = todo_models.DailyTodoTask(content=content)
+            daily_todo_task.todo_repo_id = todo_repo_id
+            daily_todo_task.date = date
+            try:
+                res = await repository.create_daily_todo_task_with_daily_todo(daily_todo_task)
+            except IntegrityError:
+                raise exceptions.TodoRepoNotFound(f"TodoRepo with id {todo_repo_id} not found")
+
+            return res.dict()
+
+        if (daily_todo := await repository.get_for_update(todo_repo_id, date)) is None:
             raise exceptions.DailyTodoNotFound(f"DailyTodo with id ({todo_repo_id}, {date}) not found")
 
         daily_todo_task = todo_models.DailyTodoTask(content=content)
@@ -91,13 +228,55 @@ class DailyTodoService:
 
         return daily_todo_task.dict()
 
+    @staticmethod
+    async def carry_over_daily_todo_tasks(
+        todo_repo_id: int,
+        date: datetime.date,
+        from_date: datetime.date | None = None,
+        *,
+        repository: DailyTodoRepository,
+    ) -> list[dict]:
+        from_date = from_date or date - datetime.timedelta(days=1)
+        if from_date >= date:
+            raise exceptions.InvalidCarryOver(f"Tasks can only be carried over to a later day than {from_date}")
+
+        try:
+            records = await repository.carry_over_daily_todo_tasks(todo_repo_id, from_date, date)
+        except IntegrityError:
+            raise exceptions.TodoRepoNotFound(f"TodoRepo with id {todo_repo_id} not found")
+        if records is None:
+            raise exceptions.DailyTodoNotFound(f"DailyTodo with id ({todo_repo_id}, {from_date}) not found")
+
+        return [r.dict() for r in records]
+
     @staticmethod
     async def get_daily_todo_tasks(
         todo_repo_id: int, date: datetime.date, *, repository: DailyTodoRepository
     ) -> list[dict]:
-        daily_todo: todo_models.DailyTodo = await repository.get(todo_repo_id, date)
+        records = await repository.get_daily_todo_task_records(todo_repo_id, date)
 
-        return [t.dict() for t in daily_todo.daily_todo_tasks] if daily_todo else []
+        return [r.dict() for r in records]
+
+    @staticmethod
+    async def get_daily_todo_tasks_page(
+        todo_repo_id: int,
+        date: datetime.date,
+        cursor: int | None = None,
+        page_size: int = 10,
+        *,
+        repository: DailyTodoRepository,
+    ) -> dict:
+        curr_items = await repository.get_daily_todo_task_records(todo_repo_id, date, cursor, page_size)
+
+        # Pagination
+        cursor_pagination = CursorPagination(cursor=cursor, page_size=page_size, curr_items=curr_items)
+        next_cursor = cursor_pagination.next_cursor
+
+        prev_items, next_items = await repository.get_prev_daily_todo_task_ids_and_next_daily_todo_task_ids(
+            todo_repo_id, date, cursor=cursor, next_cursor=next_cursor, page_size=page_size
+        )
+
+        return cursor_pagination.get_pagiantion_response(prev_items=prev_items, next_items=next_items)
 
     @staticmethod
     async def update_daily_todo_task_for_content(
@@ -105,18 +284,26 @@ class DailyTodoService:
         date: datetime.date,
         daily_todo_task_id: int,
         content: str,
+        version: int | None = None,
         *,
         repository: DailyTodoRepository,
     ) -> dict:
-        if (daily_todo := await repository.get(todo_repo_id, date)) is None:
+        if (daily_todo := await repository.get_for_update(todo_repo_id, date)) is None:
             raise exceptions.DailyTodoNotFound(f"DailyTodo with id ({todo_repo_id}, {date}) not found")
 
         if (daily_todo_task := daily_todo.get_daily_todo_task_by_id(daily_todo_task_id)) is None:
             raise exceptions.DailyTodoTaskNotFound(f"DailyTodoTask with id {daily_todo_task_id} not found")
+        if version is not None and daily_todo_task.version != version:
+            raise exceptions.VersionConflict(
+                f"DailyTodoTask with id {daily_todo_task_id} is at version {daily_todo_task.version}, not {version}"
+            )
 
         daily_todo_task.content = content
 
-        await repository.update_daily_todo()
+        try:
+            await repository.update_daily_todo()
+        except StaleDataError:
+            raise exceptions.VersionConflict(f"DailyTodoTask with id {daily_todo_task_id} was updated concurrently")
 
         return daily_todo_task.dict()
 
@@ -126,17 +313,134 @@ class DailyTodoService:
         date: datetime.date,
         daily_todo_task_id: int,
         is_completed: bool,
+        version: int | None = None,
         *,
         repository: DailyTodoRepository,
     ) -> dict:
-        if (daily_todo := await repository.get(todo_repo_id, date)) is None:
+        if (daily_todo := await repository.get_for_update(todo_repo_id, date)) is None:
             raise exceptions.DailyTodoNotFound(f"DailyTodo with id ({todo_repo_id}, {date}) not found")
 
         if (daily_todo_task := daily_todo.get_daily_todo_task_by_id(daily_todo_task_id)) is None:
             raise exceptions.DailyTodoTaskNotFound(f"DailyTodoTask with id {daily_todo_task_id} not found")
+        if version is not None and daily_todo_task.version != version:
+            raise exceptions.VersionConflict(
+                f"DailyTodoTask with id {daily_todo_task_id} is at version {daily_todo_task.version}, not {version}"
+            )
 
         daily_todo_task.is_completed = is_completed
 
-        await repository.update_daily_todo()
+        try:
+            await repository.update_daily_todo()
+        except StaleDataError:
+            raise exceptions.VersionConflict(f"DailyTodoTask with id {daily_todo_task_id} was updated concurrently")
 
         return daily_todo_task.dict()
+
+    @staticmethod
+    async def update_daily_todo_tasks_for_is_completed(
+        todo_repo_id: int,
+        date: datetime.date,
+        daily_todo_task_ids: list[int] | None,
+        is_completed: bool,
+        *,
+        repository: DailyTodoRepository,
+    ) -> dict:
+        records = await repository.update_daily_todo_tasks_is_completed(
+            todo_repo_id, date, daily_todo_task_ids, is_completed
+        )
+        if records is None:
+            raise exceptions.DailyTodoNotFound(f"DailyTodo with id ({todo_repo_id}, {date}) not found")
+
+        found_ids = {r.id for r in records}
+        not_found_ids = [id for id in dict.fromkeys(daily_todo_task_ids or []) if id not in found_ids]
+
+        return dict(daily_todo_tasks=[r.dict() for r in records], not_found_ids=not_found_ids)
+
+
+class TodoRepoStatsService:
+    @staticmethod
+    async def get_todo_repo_stats(
+        todo_repo_id: int,
+        user_id: int,
+        period: stats.Period,
+        since: datetime.date | None = None,
+        until: datetime.date | None = None,
+        *,
+        todo_repo_repository: TodoRepoRepository,
+        stats_repository: TodoRepoStatsRepository,
+    ) -> dict:
+        until = until or datetime.date.today()
+        since = since or until - datetime.timedelta(days=365)
+        if since > until:
+            raise exceptions.InvalidStatsRange(f"since {since} is after until {until}")
+        if (todo_repo := await todo_repo_repository.get(todo_repo_id)) is None or todo_repo.user_id != user_id:
+            raise exceptions.TodoRepoNotFound(f"TodoRepo with id {todo_repo_id} not found")
+
+        period_stats = {s.start: s for s in await stats_repository.get_period_stats(todo_repo_id, period, since, until)}
+        weekday_stats = {s.weekday: s for s in await stats_repository.get_weekday_stats(todo_repo_id)}
+
+        # Periods and weekdays without tasks have no rollup row; they are filled in with zeros
+        periods = []
+        for start in stats.iter_period_starts(since, until, period):
+            total, completed = (s.total, s.completed) if (s := period_stats.get(start)) else (0, 0)
+            periods.append(dict(start=start, total=total, completed=completed))
+        weekdays = []
+        for weekday in range(7):
+            total, completed = (s.total, s.completed) if (s := weekday_stats.get(weekday)) else (0, 0)
+            weekdays.append(dict(weekday=weekday, total=total, completed=completed))
+
+        for item in periods + weekdays:
+            item["completion_rate"] = item["completed"] / item["total"] if item["total"] else 0.0
+
+        return dict(todo_repo_id=todo_repo_id, period=period, periods=periods, weekdays=weekdays)
+
+    @staticmethod
+    async def get_public_todo_repo_version(todo_repo_id: int, *, todo_repo_repository: TodoRepoRepository) -> int:
+        # Private TodoRepos are reported missing, so that their ids can't be probed
+        if (todo_repo := await todo_repo_repository.get(todo_repo_id)) is None or not todo_repo.is_public:
+            raise exceptions.TodoRepoNotFound(f"TodoRepo with id {todo_repo_id} not found")
+
+        return todo_repo.version
+
+    @staticmethod
+    async def get_daily_task_counts(
+        todo_repo_id: int,
+        year: int,
+        *,
+        todo_repo_repository: TodoRepoRepository,
+        daily_todo_repository: DailyTodoRepository,
+    ) -> dict[datetime.date, tuple[int, int]]:
+        # Private TodoRepos are reported missing, so that their ids can't be probed
+        if (todo_repo := await todo_repo_repository.get(todo_repo_id)) is None or not todo_repo.is_public:
+            raise exceptions.TodoRepoNotFound(f"TodoRepo with id {todo_repo_id} not found")
+
+        return await daily_todo_repository.get_daily_task_counts(todo_repo_id, year)
+
+
+class TodoSearchService:
+    @staticmethod
+    async def search(
+        user_id: int, query: str, cursor: str | None = None, page_size: int = 10, *, repository: TodoSearchRepository
+    ) -> dict:
+        # Best match first; the opaque cursor wraps the (rank, kind, id) sort key
+        try:
+            key = decode_cursor(cursor, (float, str, int)) if cursor else None
+        except ValueError as e:
+            raise exceptions.InvalidCursor(str(e))
+        curr_items = await repository.search_records(user_id, query, key, page_size)
+
+        # Pagination
+        cursor_pagination = CursorPagination(
+            cursor=key,
+            page_size=page_size,
+            curr_items=curr_items,
+            key=lambda r: (r.rank, r.kind, r.id),
+            encode=encode_cursor,
+        )
+        next_cursor = cursor_pagination.next_cursor
+
+        prev_items, next_items = await repository.get_prev_search_records_and_next_search_records(
+            user_id, query, cursor=key, next_cursor=next_cursor, page_size=page_size
+        )
+
+        return cursor_pagination.get_pagiantion_response(prev_items=prev_items, next_items=next_items)
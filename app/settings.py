@@ -1,5 +1,6 @@
 import os
 import random
+from functools import cache
 
 from pydantic_settings import BaseSettings
 
@@ -52,12 +53,142 @@ class AuthSettings(BaseSettings):
     JWT_ALGORITHM: str = ""
     JWT_EXPIRES_DELTA: int = 0
     JWT_REFRESH_EXPIRES_DELTA: int = 0
+    REVOCATION_FILTER_CAPACITY: int = 100_000
+    REVOCATION_FILTER_ERROR_RATE: float = 0.001
+    REVOCATION_RECENT_SIZE: int = 10_000
+    REVOCATION_SYNC_INTERVAL: float = 5.0  # seconds between pulls of other workers' revocations
+    ADMIN_TOKEN: str = ""  # X-Admin-Token of the internal routes, which are not served while it is empty
 
 
-POSTGRES_SETTINGS = PostgresSettings()
-SQLITE_SETTINGS = SQLiteSettings()
+class RateLimitSettings(BaseSettings):
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_IP_CAPACITY: int = 20
+    RATE_LIMIT_IP_REFILL_RATE: float = 1 / 3  # tokens per second
+    RATE_LIMIT_EMAIL_CAPACITY: int = 5
+    RATE_LIMIT_EMAIL_REFILL_RATE: float = 1 / 60
+    RATE_LIMIT_SHARDS: int = 16
+    RATE_LIMIT_MAX_KEYS_PER_SHARD: int = 10_000
+    RATE_LIMIT_REDIS_URL: str = ""  # Shared bucket store for multi-worker setups
+
+
+class IdempotencySettings(BaseSettings):
+    IDEMPOTENCY_TTL: int = 24 * 60 * 60  # seconds a completed response is replayed
+    IDEMPOTENCY_LOCK_TIMEOUT: int = 60  # seconds a request holds its key, in case its worker is lost
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 10.0  # seconds a duplicate waits for the request in flight
+
+
+class PartitionSettings(BaseSettings):
+    TASK_PARTITIONS_AHEAD: int = 3  # intervals created in advance of the current one
+
+
+class ArchiveSettings(BaseSettings):
+    ARCHIVE_AFTER_DAYS: int = 365  # days older than this are moved to the archive
+    ARCHIVE_COMPRESSION_LEVEL: int = 9
+    ARCHIVE_CACHE_SIZE: int = 256  # decoded (todo_repo_id, year) archives kept per worker
+
+
+class GraphSettings(BaseSettings):
+    GRAPH_CACHE_TTL: int = 60 * 60  # seconds a rendered graph is served without checking other workers' task writes
+    GRAPH_CACHE_SIZE: int = 1024  # rendered (todo_repo_id, year) graphs kept per worker
+    # Cache-Control max-age and stale-while-revalidate. The app checks is_public on every request, but a graph
+    # made private stays visible in shared caches (CDNs, image proxies) for up to the sum of the two, 65 minutes
+    GRAPH_MAX_AGE: int = 60 * 60  # clients revalidate with the ETag afterwards
+    GRAPH_STALE_WHILE_REVALIDATE: int = 5 * 60
+
+
+class JobSettings(BaseSettings):
+    JOB_WORKER_IN_PROCESS: bool = False  # run the workers in the app process instead of app.entrypoints.jobs.worker
+    JOB_QUEUES: dict[str, int] = {"default": 4, "maintenance": 1}  # queue -> jobs run at once per worker
+    JOB_POLL_INTERVAL: float = 1.0  # seconds between polls of an idle queue
+    JOB_LOCK_TIMEOUT: int = 30 * 60  # seconds after which a running job is presumed lost and run again
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_DELAY: float = 10.0  # seconds before the first retry, doubled on every further attempt
+    JOB_RETRY_MAX_DELAY: float = 60 * 60
+    JOB_RETENTION_DAYS: int = 7  # finished jobs are purged after this
+    # Recurring jobs, name -> seconds between runs. Runs are aligned on multiples of the interval since the epoch
+    # (UTC midnight for a day), and each is queued once however many workers run. Intervals can't exceed
+    # JOB_RETENTION_DAYS, or a run would be purged and queued again within its own interval.
+    JOB_SCHEDULE: dict[str, int] = {
+        "revoked_tokens.purge": 60 * 60,
+        "idempotency_keys.purge": 60 * 60,
+        "jobs.purge": 24 * 60 * 60,
+        "partitions.create": 24 * 60 * 60,
+        "archive": 24 * 60 * 60,
+    }
+    JOB_SCHEDULE_INTERVAL: float = 60.0  # seconds between a worker's checks for due recurring jobs
+
+
+class EncodingSettings(BaseSettings):
+    ENCODING_MINIMUM_SIZE: int = 1024  # bytes below which complete bodies are sent uncompressed
+    ENCODING_GZIP_LEVEL: int = 6
+    ENCODING_BROTLI_QUALITY: int = 4  # the higher qualities cost too much CPU for bodies compressed per request
+    ENCODING_MSGPACK_ENABLED: bool = True  # serve MessagePack for `Accept: application/msgpack`
+
+
+class ShardSettings(BaseSettings):
+    # Shard name -> DSN of the database holding the TodoRepos of the users placed on it. Empty: a single shard on
+    # the main database. New shards are appended, since the position of a shard is the offset of its ids.
+    SHARD_DSNS: dict[str, str] = {}
+    SHARD_NEW_USERS: list[str] = []  # shards new users are placed on; empty: all of them
+    SHARD_ID_STRIDE: int = 64  # ids of the shard at position k are k, k + stride, ..., so moved rows keep theirs
+    SHARD_MAP_CACHE_TTL: float = 5.0  # seconds a worker routes a user by its cached shard
+    SHARD_MAP_CACHE_SIZE: int = 100_000
+    SHARD_MOVE_GRACE: float = 10.0  # seconds requests routed before a move are given to finish
+
+
+class ProfilingSettings(BaseSettings):
+    # Off unless a token or a sample rate is set, and then only for the requests picked by either
+    PROFILING_TOKEN: str = ""  # requests with `X-Profile-Token: <token>` are profiled
+    PROFILING_SAMPLE_RATE: float = 0.0  # share of all requests profiled at random
+    PROFILING_INTERVAL: float = 0.005  # seconds between samples; the interpreter switches threads every 5ms anyway
+    PROFILING_DIR: str = "profiles"
+    PROFILING_FORMAT: str = "speedscope"  # or "collapsed", for flamegraph.pl and the like
+    # Profiles kept in PROFILING_DIR, the oldest deleted beyond either limit
+    PROFILING_MAX_FILES: int = 100
+    PROFILING_MAX_BYTES: int = 100 * 1024 * 1024
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.PROFILING_TOKEN) or self.PROFILING_SAMPLE_RATE > 0
+
+
+class SlowQuerySettings(BaseSettings):
+    SLOW_QUERY_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD: float = 0.1  # seconds a statement takes to be logged
+    SLOW_QUERY_MAX_STATEMENTS: int = 500  # normalized statements kept per worker, the least recently slow evicted
+    SLOW_QUERY_MAX_SHAPES: int = 10  # parameter shapes and call sites kept per statement
+    # EXPLAIN the first slow run of each statement; SELECTs are run again by EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_EXPLAIN: bool = False
+
+
+# Settings singletons are parsed from the environment on first access instead of at import time
+_LAZY_SETTINGS = dict(
+    POSTGRES_SETTINGS=PostgresSettings,
+    SQLITE_SETTINGS=SQLiteSettings,
+    AUTH_SETTINGS=AuthSettings,
+    RATE_LIMIT_SETTINGS=RateLimitSettings,
+    IDEMPOTENCY_SETTINGS=IdempotencySettings,
+    PARTITION_SETTINGS=PartitionSettings,
+    ARCHIVE_SETTINGS=ArchiveSettings,
+    GRAPH_SETTINGS=GraphSettings,
+    JOB_SETTINGS=JobSettings,
+    ENCODING_SETTINGS=EncodingSettings,
+    SHARD_SETTINGS=ShardSettings,
+    PROFILING_SETTINGS=ProfilingSettings,
+    SLOW_QUERY_SETTINGS=SlowQuerySettings,
+)
+
+
+@cache
+def _get_settings(name: str) -> BaseSettings:
+    return _LAZY_SETTINGS[name]()
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SETTINGS:
+        return _get_settings(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-AUTH_SETTINGS = AuthSettings()
 
 STAGE = os.environ.get("STAGE", "local")
 API_V1_STR: str = os.environ.get("API_V1_STR", "/api/v1")
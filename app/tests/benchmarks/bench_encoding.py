@@ -0,0 +1,103 @@
+"""Bytes on the wire and CPU cost of each response encoding
+
+    python -m app.tests.benchmarks.bench_encoding [--tasks 1000] [--repeat 20]
+
+Typical response envelopes (a TodoRepo page and the tasks of a busy day) are sent through
+ResponseEncodingMiddleware once per Accept/Accept-Encoding combination; CPU time is the process time per response.
+"""
+import argparse
+import asyncio
+import datetime
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.entrypoints.fastapi.encoding import ResponseEncodingMiddleware, import_optional
+
+
+NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+# (name, Accept, Accept-Encoding)
+VARIANTS = [
+    ("json", "application/json", "identity"),
+    ("json+gzip", "application/json", "gzip"),
+    ("json+br", "application/json", "br"),
+    ("msgpack", "application/msgpack", "identity"),
+    ("msgpack+gzip", "application/msgpack", "gzip"),
+    ("msgpack+br", "application/msgpack", "br"),
+]
+
+
+def get_payloads(n_tasks: int) -> dict[str, dict]:
+    todo_repos = [
+        dict(id=i, created_at=NOW, updated_at=NOW, title=f"repo {i}", description="a" * 40, user_id=1, version=1)
+        for i in range(100)
+    ]
+    tasks = [
+        dict(
+            id=i,
+            created_at=NOW,
+            updated_at=NOW,
+            content=f"task number {i}",
+            is_completed=i % 3 == 0,
+            todo_repo_id=1,
+            date=NOW.date(),
+            version=1,
+        )
+        for i in range(n_tasks)
+    ]
+    paging = dict(cursors=dict(prev=None, next=99), has_prev=False, has_next=True)
+    return {
+        "TodoRepoPaginationResponse": dict(ok=True, message="Success", data=todo_repos, paging=paging),
+        "DailyTodoTasksResponse": dict(ok=True, message="Success", data=tasks),
+    }
+
+
+async def send_through(middleware: ResponseEncodingMiddleware, accept: str, accept_encoding: str) -> int:
+    scope = dict(
+        type="http",
+        method="GET",
+        path="/",
+        headers=[(b"accept", accept.encode()), (b"accept-encoding", accept_encoding.encode())],
+    )
+    size = 0
+
+    async def receive():
+        return dict(type="http.request", body=b"", more_body=False)
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await middleware(scope, receive, send)
+    return size
+
+
+async def main(args: argparse.Namespace) -> None:
+    missing = [name for name in ("brotli", "msgpack") if import_optional(name) is None]
+    print(f"{args.repeat} responses per encoding" + (f"; not installed: {', '.join(missing)}" if missing else ""))
+    print(f"{'payload':<28} {'encoding':<13} {'bytes':>9} {'ratio':>6} {'CPU ms':>8}")
+
+    for name, payload in get_payloads(args.tasks).items():
+        content = jsonable_encoder(payload)
+
+        async def app(scope, receive, send):
+            await JSONResponse(content)(scope, receive, send)
+
+        middleware = ResponseEncodingMiddleware(app, minimum_size=0, msgpack=True)
+        json_size = None
+        for variant, accept, accept_encoding in VARIANTS:
+            start = time.process_time()
+            for _ in range(args.repeat):
+                size = await send_through(middleware, accept, accept_encoding)
+            cpu_ms = (time.process_time() - start) / args.repeat * 1000
+            json_size = json_size or size
+            print(f"{name:<28} {variant:<13} {size:>9} {size / json_size:>6.2f} {cpu_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
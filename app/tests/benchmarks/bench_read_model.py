@@ -0,0 +1,91 @@
+"""Memory and throughput of the ORM read path against the column-row read path
+
+    python -m app.tests.benchmarks.bench_read_model [--tasks 100000] [--repeat 3]
+
+Both paths list the tasks of one DailyTodo and turn them into response dicts, on an in-memory SQLite database.
+"""
+import argparse
+import asyncio
+import datetime
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.adapters.todo import in_memory_orm
+from app.adapters.todo.repository import DailyTodoRepository
+from app.domain.todo import models as todo_models
+
+
+DATE = datetime.date(2026, 1, 1)
+
+
+async def setup(n_tasks: int) -> tuple[AsyncEngine, async_sessionmaker, int]:
+    in_memory_orm.start_mappers()
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(in_memory_orm.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, expire_on_commit=False, autoflush=False, class_=AsyncSession)
+    async with session_factory() as session:
+        todo_repo = todo_models.TodoRepo(title="benchmark", user_id=1)
+        daily_todo = todo_models.DailyTodo(date=DATE)
+        daily_todo.todo_repo = todo_repo
+        session.add(daily_todo)
+        await session.commit()
+
+        rows = [
+            dict(content=f"task {i}", is_completed=i % 2 == 0, todo_repo_id=todo_repo.id, date=DATE)
+            for i in range(n_tasks)
+        ]
+        await session.execute(insert(todo_models.DailyTodoTask), rows)
+        await session.commit()
+    return engine, session_factory, todo_repo.id
+
+
+async def read_orm(session_factory: async_sessionmaker, todo_repo_id: int) -> list[dict]:
+    async with session_factory() as session:
+        daily_todo = await DailyTodoRepository(session).get(todo_repo_id, DATE)
+        return [t.dict() for t in daily_todo.daily_todo_tasks]
+
+
+async def read_lean(session_factory: async_sessionmaker, todo_repo_id: int) -> list[dict]:
+    async with session_factory() as session:
+        records = await DailyTodoRepository(session).get_daily_todo_task_records(todo_repo_id, DATE)
+        return [r.dict() for r in records]
+
+
+async def measure(read, session_factory: async_sessionmaker, todo_repo_id: int, repeat: int) -> tuple[float, float]:
+    # Timing and memory tracing run separately, tracemalloc slows allocations down considerably
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await read(session_factory, todo_repo_id)
+        elapsed.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = await read(session_factory, todo_repo_id)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return min(elapsed), peak / 2**20
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine, session_factory, todo_repo_id = await setup(args.tasks)
+
+    print(f"{args.tasks} tasks, best of {args.repeat}")
+    print(f"{'path':<6} {'seconds':>8} {'tasks/s':>10} {'peak MiB':>9}")
+    for name, read in [("orm", read_orm), ("lean", read_lean)]:
+        seconds, peak = await measure(read, session_factory, todo_repo_id, args.repeat)
+        print(f"{name:<6} {seconds:>8.3f} {args.tasks / seconds:>10.0f} {peak:>9.1f}")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,52 @@
+"""Microbenchmarks of the per-request building blocks, on in-memory domain objects (no database)
+
+    python -m pytest app/tests/benchmarks --benchmark-only \
+        --benchmark-storage=app/tests/benchmarks/baselines --benchmark-compare --benchmark-compare-fail=median:25%
+
+compares each benchmark with the latest baseline committed for this machine id (platform and Python version)
+and fails when its median is 25% slower. After an intended change, or on new hardware, save a new baseline with
+`--benchmark-save=baseline` in place of the compare options. `--benchmark-disable` runs each benchmark once, as a test.
+"""
+import datetime
+
+import pytest
+
+from app.tests import helpers
+
+
+NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+DATE = NOW.date()
+
+
+def persist(obj, id: int):
+    # Sets what the database would on insert
+    obj.id = id
+    obj.created_at = NOW
+    obj.updated_at = NOW
+    obj.version = 1
+    return obj
+
+
+@pytest.fixture
+def todo_repos():
+    return [persist(todo_repo, i) for i, todo_repo in enumerate(helpers.create_todo_repos(n=201), start=1)]
+
+
+@pytest.fixture
+def daily_todo_tasks():
+    todo_repo = persist(helpers.create_todo_repo(), 1)
+    daily_todo = helpers.create_daily_todo(todo_repo, DATE)
+    tasks = [persist(task, i) for i, task in enumerate(helpers.create_daily_todo_tasks(daily_todo, n=100), start=1)]
+    for task in tasks:
+        task.todo_repo_id = todo_repo.id
+        task.date = DATE
+    return tasks
+
+
+@pytest.fixture
+def user():
+    user = helpers.create_user(email=helpers.user["email"])
+    user.id = 1
+    user.created_at = NOW
+    user.updated_at = NOW
+    return user
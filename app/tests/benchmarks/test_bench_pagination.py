@@ -0,0 +1,38 @@
+import pytest
+
+from app.utils.pagination import CursorPagination
+
+
+@pytest.mark.parametrize("page_size", [10, 100])
+def test_get_pagination_response(benchmark, todo_repos, page_size):
+    # GIVEN the second page, as the service has it after its prev/next queries
+    prev_items = todo_repos[:page_size]
+    curr_items = todo_repos[page_size : 2 * page_size]
+    next_items = todo_repos[2 * page_size : 2 * page_size + 1]
+
+    def paginate():
+        cursor_pagination = CursorPagination(cursor=page_size, page_size=page_size, curr_items=curr_items)
+        return cursor_pagination.get_pagiantion_response(prev_items=prev_items, next_items=next_items)
+
+    # WHEN
+    res = benchmark(paginate)
+
+    # THEN
+    assert len(res["data"]) == page_size
+    assert res["paging"]["has_prev"] and res["paging"]["has_next"]
+
+
+def test_todo_repo_dict(benchmark, todo_repos):
+    # WHEN
+    res = benchmark(lambda: [todo_repo.dict() for todo_repo in todo_repos[:100]])
+
+    # THEN
+    assert res[0]["version"] == 1
+
+
+def test_daily_todo_task_dict(benchmark, daily_todo_tasks):
+    # WHEN
+    res = benchmark(lambda: [task.dict() for task in daily_todo_tasks])
+
+    # THEN
+    assert len(res) == 100
@@ -0,0 +1,44 @@
+from fastapi.encoders import jsonable_encoder
+
+from app.entrypoints.fastapi.api_v1 import enums
+from app.entrypoints.fastapi.api_v1.todo import out_schemas
+from app.utils.pagination import CursorPagination
+
+
+def test_todo_repo_pagination_response(benchmark, todo_repos):
+    # GIVEN
+    page = CursorPagination(cursor=None, page_size=10, curr_items=todo_repos[:10])
+    res = page.get_pagiantion_response(prev_items=[], next_items=todo_repos[10:11])
+
+    # WHEN
+    response = benchmark(
+        lambda: out_schemas.TodoRepoPaginationResponse(ok=True, message=enums.ResponseMessage.SUCCESS, **res)
+    )
+
+    # THEN
+    assert response.paging.cursors.next == 10
+
+
+def test_daily_todo_tasks_response(benchmark, daily_todo_tasks):
+    # GIVEN
+    res = [task.dict() for task in daily_todo_tasks]
+
+    # WHEN
+    response = benchmark(
+        lambda: out_schemas.DailyTodoTasksResponse(ok=True, message=enums.ResponseMessage.SUCCESS, data=res)
+    )
+
+    # THEN
+    assert len(response.data) == 100
+
+
+def test_daily_todo_tasks_response_encode(benchmark, daily_todo_tasks):
+    # GIVEN
+    data = [task.dict() for task in daily_todo_tasks]
+    response = out_schemas.DailyTodoTasksResponse(ok=True, message=enums.ResponseMessage.SUCCESS, data=data)
+
+    # WHEN, as FastAPI encodes the return value of an endpoint
+    encoded = benchmark(jsonable_encoder, response)
+
+    # THEN
+    assert encoded["data"][0]["date"] == "2026-01-01"
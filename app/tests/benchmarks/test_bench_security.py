@@ -0,0 +1,46 @@
+import email_validator
+import pytest
+
+from app import settings
+from app.entrypoints.fastapi.security import JWTAuthorizer, OAuth2PasswordRequestFormWithValidation
+
+
+@pytest.fixture(autouse=True)
+def jwt_settings(monkeypatch):
+    # The JWT settings are empty unless the environment provides them; benchmarks run without one
+    auth_settings = settings.AUTH_SETTINGS
+    monkeypatch.setattr(auth_settings, "JWT_SECRET_KEY", "secret")
+    monkeypatch.setattr(auth_settings, "JWT_REFRESH_SECRET_KEY", "refresh-secret")
+    monkeypatch.setattr(auth_settings, "JWT_ALGORITHM", "HS256")
+    monkeypatch.setattr(auth_settings, "JWT_EXPIRES_DELTA", 30)
+    monkeypatch.setattr(auth_settings, "JWT_REFRESH_EXPIRES_DELTA", 60 * 24 * 14)
+
+
+def test_jwt_create(benchmark, user):
+    # WHEN
+    token = benchmark(JWTAuthorizer.create, user.dict())
+
+    # THEN
+    assert JWTAuthorizer.decode(token)["user_id"] == user.id
+
+
+def test_jwt_decode(benchmark, user):
+    # GIVEN
+    token = JWTAuthorizer.create(user.dict())
+
+    # WHEN
+    payload = benchmark(JWTAuthorizer.decode, token)
+
+    # THEN
+    assert payload["sub"] == user.email
+
+
+def test_login_form_email_check(benchmark, monkeypatch):
+    # GIVEN the syntax check only; the MX lookup of deliverability checks is network time
+    monkeypatch.setattr(email_validator, "CHECK_DELIVERABILITY", False)
+
+    # WHEN
+    form = benchmark(OAuth2PasswordRequestFormWithValidation, username="Happy.Puppy@Google.com", password="password")
+
+    # THEN
+    assert form.email == "Happy.Puppy@google.com"
@@ -11,10 +11,17 @@ import pytest_asyncio
 from app.main import app
 from app.adapters.auth.persistent_orm import start_mappers as auth_start_mappers
 from app.adapters.todo.persistent_orm import start_mappers as todo_start_mappers
+from app.adapters.job.persistent_orm import start_mappers as job_start_mappers
+from app.adapters.shard.persistent_orm import start_mappers as shard_start_mappers
+from app.adapters.idempotency.persistent_orm import start_mappers as idempotency_start_mappers
 from app.adapters.auth.persistent_orm import metadata as auth_metadata
 from app.adapters.todo.persistent_orm import metadata as todo_metadata
+from app.adapters.job.persistent_orm import metadata as job_metadata
+from app.adapters.shard.persistent_orm import metadata as shard_metadata
+from app.adapters.idempotency.persistent_orm import metadata as idempotency_metadata
 from app import settings
 from app.db import get_session
+from app.entrypoints.fastapi.sharding import get_user_session
 from app.entrypoints.fastapi.security import JWTAuthorizer
 from app.tests import helpers
 
@@ -56,6 +63,9 @@ async def create_test_db():
 async def mappers(create_test_db):
     auth_start_mappers()
     todo_start_mappers()
+    job_start_mappers()
+    shard_start_mappers()
+    idempotency_start_mappers()
     yield
     clear_mappers()
 
@@ -67,12 +77,18 @@ async def async_engine(mappers):
     async with async_engine.begin() as conn:
         await conn.run_sync(auth_metadata.create_all)
         await conn.run_sync(todo_metadata.create_all)
+        await conn.run_sync(job_metadata.create_all)
+        await conn.run_sync(shard_metadata.create_all)
+        await conn.run_sync(idempotency_metadata.create_all)
 
     yield async_engine
 
     async with async_engine.begin() as conn:
         await conn.run_sync(auth_metadata.drop_all)
         await conn.run_sync(todo_metadata.drop_all)
+        await conn.run_sync(job_metadata.drop_all)
+        await conn.run_sync(shard_metadata.drop_all)
+        await conn.run_sync(idempotency_metadata.drop_all)
 
     await async_engine.dispose()
 
@@ -98,6 +114,12 @@ async def async_session(async_session_factory):
             await session.execute(text(stmt.format(table)))
         for table in reversed(todo_metadata.sorted_tables):
             await session.execute(text(stmt.format(table)))
+        for table in reversed(job_metadata.sorted_tables):
+            await session.execute(text(stmt.format(table)))
+        for table in reversed(shard_metadata.sorted_tables):
+            await session.execute(text(stmt.format(table)))
+        for table in reversed(idempotency_metadata.sorted_tables):
+            await session.execute(text(stmt.format(table)))
 
         await session.commit()
 
@@ -105,6 +127,7 @@ async def async_session(async_session_factory):
 @pytest_asyncio.fixture(scope="function")
 def testing_app(async_session):
     app.dependency_overrides[get_session] = lambda: async_session
+    app.dependency_overrides[get_user_session] = lambda: async_session
     app.dependency_overrides[JWTAuthorizer.get_user_info] = lambda: JWTAuthorizer.UserInfo(**helpers.user)
 
     yield app
@@ -0,0 +1,27 @@
+import pytest
+from httpx import AsyncClient
+from http import HTTPStatus
+
+from app import settings
+
+
+class TestAuth:
+    @pytest.mark.asyncio
+    async def test_login_is_rate_limited_per_email(self, testing_app):
+        # GIVEN
+        capacity = settings.RATE_LIMIT_SETTINGS.RATE_LIMIT_EMAIL_CAPACITY
+        body = {"username": "rate-limited@google.com", "password": "wrong-password"}
+
+        # WHEN
+        URL = testing_app.url_path_for("user_login")
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            responses = [await ac.post(URL, data=body) for _ in range(capacity + 1)]
+
+        # THEN
+        assert all(r.status_code == HTTPStatus.NOT_FOUND for r in responses[:capacity])
+        assert responses[-1].status_code == HTTPStatus.TOO_MANY_REQUESTS
+        assert int(responses[-1].headers["Retry-After"]) > 0
+        res = responses[-1].json()
+        assert res["ok"] is False
+        assert res["data"] is None
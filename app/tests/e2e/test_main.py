@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 
+from app import settings
+
 
 @pytest.mark.asyncio
 async def test_main(testing_app):
@@ -10,3 +12,23 @@ async def test_main(testing_app):
 
     assert response.status_code == 200
     assert response.json() == {"ping": "pong"}
+
+
+@pytest.mark.asyncio
+async def test_internal_routes_require_admin_token(testing_app, monkeypatch):
+    # GIVEN
+    monkeypatch.setattr(settings.AUTH_SETTINGS, "ADMIN_TOKEN", "admin_token")
+    routes = [
+        (method, route.path.replace("{job_id}", "1"))
+        for route in testing_app.routes
+        if "/internal/" in route.path
+        for method in route.methods
+    ]
+
+    # WHEN
+    async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+        responses = [await ac.request(method, path) for method, path in routes]
+
+    # THEN
+    assert routes
+    assert all(response.status_code == 401 for response in responses)
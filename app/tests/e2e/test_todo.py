@@ -1,12 +1,14 @@
+import datetime
 import random
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from http import HTTPStatus
 from copy import deepcopy
 from dateutil.parser import parse
 
+from app import settings
 from app.tests import helpers
 from app.domain.todo import models
 from app.entrypoints.fastapi.api_v1 import enums as api_enums
@@ -39,6 +41,46 @@ class TestTodoRepo:
         assert repo_for_test["title"] == body["title"]
         assert repo_for_test["description"] == body["description"]
         assert repo_for_test["user_id"] == user_id
+        assert repo_for_test["is_public"] is False
+
+    @pytest.mark.asyncio
+    async def test_create_todo_repo_with_idempotency_key(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        body = {"title": helpers.fake.word(), "description": helpers.fake.text()}
+        headers = {"Idempotency-Key": helpers.fake.uuid4()}
+
+        # WHEN
+        URL = testing_app.url_path_for("create_todo_repo")
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.post(URL, json=body, headers=headers)
+            replayed_response = await ac.post(URL, json=body, headers=headers)
+        q = await async_session.execute(select(models.TodoRepo))
+
+        # THEN
+        assert response.status_code == replayed_response.status_code == HTTPStatus.CREATED
+        assert response.json() == replayed_response.json()
+        assert replayed_response.headers["Idempotent-Replayed"] == "true"
+        assert len(q.scalars().all()) == 1
+
+    @pytest.mark.asyncio
+    async def test_create_todo_repo_with_reused_idempotency_key(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        body = {"title": helpers.fake.word(), "description": helpers.fake.text()}
+        headers = {"Idempotency-Key": helpers.fake.uuid4()}
+
+        # WHEN
+        URL = testing_app.url_path_for("create_todo_repo")
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.post(URL, json=body, headers=headers)
+            reused_response = await ac.post(URL, json=dict(body, title="other_title"), headers=headers)
+        q = await async_session.execute(select(models.TodoRepo))
+
+        # THEN
+        assert response.status_code == HTTPStatus.CREATED
+        assert reused_response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert len(q.scalars().all()) == 1
 
     @pytest.mark.asyncio
     async def test_update_todo_repo(self, testing_app, async_session: AsyncSession):
@@ -71,6 +113,151 @@ class TestTodoRepo:
         assert repo_before_update.title != repo_for_test["title"] == body["title"]
         assert repo_before_update.description != repo_for_test["description"] == body["description"]
         assert user_id == repo_for_test["user_id"]
+        assert repo_before_update.version + 1 == repo_for_test["version"]
+
+    @pytest.mark.asyncio
+    async def test_update_todo_repo_if_version_does_not_match(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        repo = helpers.create_todo_repo(user_id=helpers.user["user_id"])
+        async_session.add(repo)
+        await async_session.commit()
+
+        version = repo.version
+        body = {"title": "updated_title", "description": "updated_description"}
+        headers = {"If-Match": f'"{version}"'}
+
+        # WHEN
+        URL = testing_app.url_path_for("update_todo_repo", todo_repo_id=repo.id)
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.patch(URL, json=body, headers=headers)
+            stale_response = await ac.patch(URL, json={**body, "title": "stale_title"}, headers=headers)
+
+        # THEN
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["data"]["version"] == version + 1
+        assert stale_response.status_code == HTTPStatus.CONFLICT
+        assert not stale_response.json()["ok"]
+
+    @pytest.mark.asyncio
+    async def test_delete_todo_repo(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        user_id = helpers.user["user_id"]
+        repo = helpers.create_todo_repo(user_id=user_id)
+        daily_todo = helpers.create_daily_todo(todo_repo=repo)
+        helpers.create_daily_todo_tasks(daily_todo=daily_todo, n=3)
+        async_session.add_all([repo, daily_todo])
+        await async_session.commit()
+        repo_id = repo.id
+
+        # WHEN
+        URL = testing_app.url_path_for("delete_todo_repo", todo_repo_id=repo_id)
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.delete(URL)
+
+        # THEN
+        assert response.status_code == HTTPStatus.OK
+        res = response.json()
+        assert res["ok"]
+        assert res["message"] == api_enums.ResponseMessage.DELETE_SUCCESS
+        assert res["data"]["id"] == repo_id
+
+        q = await async_session.execute(select(models.DailyTodoTask).filter_by(todo_repo_id=repo_id))
+        assert q.scalars().all() == []
+
+    @pytest.mark.asyncio
+    async def test_get_todo_repo_stats(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        user_id = helpers.user["user_id"]
+        repo = helpers.create_todo_repo(user_id=user_id)
+        async_session.add(repo)
+        await async_session.commit()
+
+        # WHEN
+        URL = testing_app.url_path_for("get_todo_repo_stats", todo_repo_id=repo.id)
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.get(URL, params=dict(period="month", since="2026-01-01", until="2026-12-31"))
+
+        # THEN
+        assert response.status_code == HTTPStatus.OK
+        res = response.json()
+        assert res["ok"]
+        assert res["data"]["todo_repo_id"] == repo.id
+        assert [p["start"] for p in res["data"]["periods"]] == [f"2026-{m:02d}-01" for m in range(1, 13)]
+        assert all(p["total"] == 0 for p in res["data"]["periods"])
+        assert len(res["data"]["weekdays"]) == 7
+
+    @pytest.mark.asyncio
+    async def test_get_todo_repo_graph(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        repo = helpers.create_todo_repo(user_id=helpers.user["user_id"])
+        repo.is_public = True
+        daily_todo = helpers.create_daily_todo(todo_repo=repo, date=datetime.date(2026, 3, 2))
+        helpers.create_daily_todo_tasks(daily_todo=daily_todo, n=3)
+        async_session.add_all([repo, daily_todo])
+        await async_session.commit()
+
+        # WHEN
+        URL = testing_app.url_path_for("get_todo_repo_graph", todo_repo_id=repo.id)
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.get(URL, params=dict(year=2026))
+            revalidated = await ac.get(
+                URL, params=dict(year=2026), headers={"If-None-Match": response.headers["ETag"]}
+            )
+
+        # THEN
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["Content-Type"] == "image/svg+xml"
+        assert response.headers["Cache-Control"].startswith("public, max-age=")
+        assert "on 2026-03-02" in response.text
+        assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+        assert revalidated.headers["ETag"] == response.headers["ETag"]
+
+    @pytest.mark.asyncio
+    async def test_get_todo_repo_graph_if_repo_is_private(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        repo = helpers.create_todo_repo(user_id=helpers.user["user_id"])
+        async_session.add(repo)
+        await async_session.commit()
+
+        # WHEN
+        URL = testing_app.url_path_for("get_todo_repo_graph", todo_repo_id=repo.id)
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.get(URL, params=dict(year=2025))
+
+        # THEN
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_get_todo_repo_graph_after_repo_is_made_private(self, testing_app, async_session: AsyncSession):
+        # GIVEN a cached graph
+        repo = helpers.create_todo_repo(user_id=helpers.user["user_id"])
+        repo.is_public = True
+        async_session.add(repo)
+        await async_session.commit()
+
+        URL = testing_app.url_path_for("get_todo_repo_graph", todo_repo_id=repo.id)
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            cached = await ac.get(URL, params=dict(year=2024))
+
+        # WHEN made private without going through this worker, so that its TaskVersions aren't bumped
+        await async_session.execute(
+            update(models.TodoRepo)
+            .where(models.TodoRepo.id == repo.id)
+            .values(is_public=False, version=models.TodoRepo.version + 1)
+        )
+        await async_session.commit()
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.get(URL, params=dict(year=2024))
+
+        # THEN
+        assert cached.status_code == HTTPStatus.OK
+        assert response.status_code == HTTPStatus.NOT_FOUND
 
     @pytest.mark.asyncio
     async def test_update_todo_repo_if_not_sending_request_body(self, testing_app, async_session: AsyncSession):
@@ -232,8 +419,50 @@ class TestTodoRepo:
         assert res["paging"]["has_prev"] is False
         assert res["paging"]["has_next"] is True
 
+    @pytest.mark.asyncio
+    async def test_get_all_todo_repos_requires_admin_token(self, testing_app, async_session: AsyncSession, monkeypatch):
+        # GIVEN
+        monkeypatch.setattr(settings.AUTH_SETTINGS, "ADMIN_TOKEN", "admin_token")
+        async_session.add_all(helpers.create_todo_repos(n=3))
+        await async_session.commit()
+
+        # WHEN
+        URL = testing_app.url_path_for("get_all_todo_repos")
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            anonymous_response = await ac.get(URL)
+            wrong_token_response = await ac.get(URL, headers={"X-Admin-Token": "wrong_token"})
+            response = await ac.get(URL, headers={"X-Admin-Token": "admin_token"})
+
+        # THEN
+        assert anonymous_response.status_code == wrong_token_response.status_code == HTTPStatus.UNAUTHORIZED
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()["data"]) == 3
+
 
 class TestDailyTodo:
+    @pytest.mark.asyncio
+    async def test_carry_over_daily_todo_tasks(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        repo = helpers.create_todo_repo(user_id=helpers.user["user_id"])
+        daily_todo = helpers.create_daily_todo(todo_repo=repo, date=datetime.date(2026, 3, 2))
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo, n=5)
+        async_session.add_all([repo, daily_todo])
+        await async_session.commit()
+
+        # WHEN
+        URL = testing_app.url_path_for("carry_over_daily_todo_tasks", todo_repo_id=repo.id, date="2026-03-03")
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.post(URL, params={"from": "2026-03-02"})
+
+        # THEN
+        assert response.status_code == HTTPStatus.CREATED
+        res = response.json()
+        assert res["ok"]
+        assert len(res["data"]) == len([t for t in daily_todo_tasks if not t.is_completed])
+        assert all(task["date"] == "2026-03-03" for task in res["data"])
+
     @pytest.mark.asyncio
     async def test_create_daily_todo(self, testing_app, async_session: AsyncSession):
         # GIVEN
@@ -411,6 +640,30 @@ class TestDailyTodo:
             assert daily_todo_task.todo_repo_id == daily_todo_task_for_test["todo_repo_id"]
             assert daily_todo_task.date == parse(daily_todo_task_for_test["date"]).date()
 
+    @pytest.mark.asyncio
+    async def test_get_daily_todo_tasks_with_page_size(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo, n=5)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        # WHEN
+        URL = testing_app.url_path_for("get_daily_todo_tasks", todo_repo_id=todo_repo.id, date=date)
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.get(URL, params=dict(page_size=3))
+
+        # THEN
+        assert response.status_code == HTTPStatus.OK
+        res = response.json()
+        assert res["ok"]
+        assert [t["id"] for t in res["data"]] == [t.id for t in daily_todo_tasks[:3]]
+        assert res["paging"]["cursors"]["next"] == daily_todo_tasks[2].id
+        assert res["paging"]["has_next"] is True
+
     @pytest.mark.asyncio
     async def test_get_daily_todo_tasks_if_there_are_no_tasks(self, testing_app):
         # GIVEN
@@ -570,6 +823,34 @@ class TestDailyTodo:
         assert task_before_update["todo_repo_id"] == daily_todo_task_for_test["todo_repo_id"]
         assert task_before_update["date"] == parse(daily_todo_task_for_test["date"]).date()
 
+    @pytest.mark.asyncio
+    async def test_update_daily_todo_tasks_for_is_completed(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        ids = sorted(t.id for t in daily_todo_tasks)[:3]
+        body = {"ids": [*ids, helpers.ID_MAX_LIMIT], "is_completed": True}
+
+        # WHEN
+        URL = testing_app.url_path_for("update_daily_todo_tasks_for_is_completed", todo_repo_id=todo_repo.id, date=date)
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.patch(URL, json=body)
+
+        # THEN
+        assert response.status_code == HTTPStatus.OK
+        res = response.json()
+        assert res["ok"]
+        assert res["message"] == api_enums.ResponseMessage.UPDATE_SUCCESS
+        assert [t["id"] for t in res["data"]["daily_todo_tasks"]] == ids
+        assert all(t["is_completed"] for t in res["data"]["daily_todo_tasks"])
+        assert res["data"]["not_found_ids"] == [helpers.ID_MAX_LIMIT]
+
     @pytest.mark.asyncio
     async def test_update_daily_todo_task_for_is_completed_if_there_is_no_daily_todo(self, testing_app):
         # GIVEN
@@ -629,3 +910,29 @@ class TestDailyTodo:
         assert res["ok"] is False
         assert res["message"]
         assert res["data"] is None
+
+
+class TestTodoSearch:
+    @pytest.mark.asyncio
+    async def test_search(self, testing_app, async_session: AsyncSession):
+        # GIVEN
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=helpers.get_random_date())
+        daily_todo_task = helpers.create_daily_todo_task(daily_todo=daily_todo)
+        daily_todo_task.content = "renew the passport"
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        # WHEN
+        URL = testing_app.url_path_for("search")
+
+        async with AsyncClient(app=testing_app, base_url="http://test") as ac:
+            response = await ac.get(URL, params={"q": "passport"})
+
+        # THEN
+        assert response.status_code == HTTPStatus.OK
+        res = response.json()
+        assert res["ok"]
+        assert res["message"] == api_enums.ResponseMessage.SUCCESS
+        assert any(h["kind"] == "daily_todo_task" and h["id"] == daily_todo_task.id for h in res["data"])
+        assert "cursors" in res["paging"]
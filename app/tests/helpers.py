@@ -2,6 +2,7 @@ import datetime
 from faker import Faker
 from typing import Any
 
+from app.domain.auth import models as auth_models
 from app.domain.todo import models as todo_models
 
 
@@ -61,3 +62,16 @@ def str_to_date(date: str):
 
 def get_random_date():
     return str_to_date(fake.date())
+
+
+def create_user(email: str = "", password: str = "password"):
+    user = auth_models.User(
+        email=email or fake.email(),
+        password=password,
+        username=fake.user_name(),
+        last_name=fake.last_name(),
+        first_name=fake.first_name(),
+    )
+    user.hash_password()
+
+    return user
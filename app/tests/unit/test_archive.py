@@ -0,0 +1,85 @@
+import datetime
+import json
+import zlib
+
+from app.adapters.todo.archive import ArchiveCache, encode_days, decode_days, load_daily_todo
+
+
+class TestArchiveCodec:
+    def test_encode_and_decode_days(self):
+        # GIVEN
+        days = {
+            "2025-01-01": [[1, "2025-01-01T09:00:00+00:00", "2025-01-01T10:00:00+00:00", "할 일", True, 3]],
+            "2025-01-02": [],
+        }
+
+        # WHEN
+        data = encode_days(days)
+
+        # THEN
+        assert isinstance(data, bytes)
+        assert decode_days(data) == days
+
+    def test_decode_days_of_codec_version_1(self):
+        # GIVEN
+        row = [1, "2025-01-01T09:00:00+00:00", "2025-01-01T10:00:00+00:00", "content", False]
+        data = zlib.compress(json.dumps(dict(v=1, days={"2025-01-01": [row]})).encode())
+
+        # WHEN
+        days = decode_days(data)
+
+        # THEN
+        assert days == {"2025-01-01": [[*row, 1]]}
+
+    def test_load_daily_todo(self):
+        # GIVEN
+        date = datetime.date(2025, 1, 1)
+        rows = [[1, "2025-01-01T09:00:00+00:00", "2025-01-01T10:00:00+00:00", "content", True, 2]]
+
+        # WHEN
+        daily_todo = load_daily_todo(7, date, rows)
+
+        # THEN
+        assert daily_todo.dict() == dict(todo_repo_id=7, date=date)
+        assert [t.dict() for t in daily_todo.daily_todo_tasks] == [
+            dict(
+                id=1,
+                created_at=datetime.datetime(2025, 1, 1, 9, tzinfo=datetime.timezone.utc),
+                updated_at=datetime.datetime(2025, 1, 1, 10, tzinfo=datetime.timezone.utc),
+                content="content",
+                is_completed=True,
+                todo_repo_id=7,
+                date=date,
+                version=2,
+            )
+        ]
+
+
+class TestArchiveCache:
+    def test_get_returns_none_for_stale_version(self):
+        # GIVEN
+        cache = ArchiveCache(maxsize=2)
+        cache.put((1, 2025), 1, {"2025-01-01": []})
+
+        # WHEN
+        stale = cache.get((1, 2025), 2)
+        current = cache.get((1, 2025), 1)
+
+        # THEN
+        assert stale is None
+        assert current == {"2025-01-01": []}
+
+    def test_evicts_least_recently_used(self):
+        # GIVEN
+        cache = ArchiveCache(maxsize=2)
+        cache.put((1, 2024), 1, {})
+        cache.put((1, 2025), 1, {})
+
+        # WHEN
+        cache.get((1, 2024), 1)
+        cache.put((2, 2025), 1, {})
+
+        # THEN
+        assert cache.get((1, 2024), 1) == {}
+        assert cache.get((1, 2025), 1) is None
+        assert cache.get((2, 2025), 1) == {}
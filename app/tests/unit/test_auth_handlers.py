@@ -0,0 +1,90 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.tests import helpers
+from app.domain.auth import models
+from app.service.auth.handlers import UserService
+from app.service import exceptions
+from app.adapters.auth.repository import UserRepository, RevokedTokenRepository
+from app.entrypoints.fastapi.security import JWTAuthorizer
+
+
+class TestUser:
+    @pytest.mark.asyncio
+    async def test_signup_user(self, async_session: AsyncSession):
+        # GIVEN
+        email = helpers.fake.email()
+
+        # WHEN
+        repository = UserRepository(async_session)
+        res = await UserService.signup_user(email, "password", "username", "last", "first", repository=repository)
+        q = await async_session.execute(select(models.User).filter_by(id=res["id"]))
+        user = q.scalar()
+
+        # THEN
+        assert res
+        assert user
+
+        assert res["email"] == user.email == email
+        assert res["password"] == user.password != "password"
+        assert res["created_at"] == user.created_at
+
+    @pytest.mark.asyncio
+    async def test_signup_user_if_email_already_exists_in_other_case(self, async_session: AsyncSession):
+        # GIVEN
+        user = helpers.create_user(email="HappyPuppy@google.com")
+        async_session.add(user)
+        await async_session.commit()
+
+        # WHEN
+        repository = UserRepository(async_session)
+        with pytest.raises(exceptions.UserAlreadyExists):
+            # THEN
+            await UserService.signup_user(
+                "happypuppy@GOOGLE.com", "password", "username", "last", "first", repository=repository
+            )
+
+    @pytest.mark.asyncio
+    async def test_refresh_login_revokes_previous_refresh_token(self, async_session: AsyncSession):
+        # GIVEN
+        user = helpers.create_user()
+        async_session.add(user)
+        await async_session.commit()
+        refresh_token = JWTAuthorizer.create(user.dict(), is_refresh=True)
+        jti = JWTAuthorizer.decode(refresh_token, is_refresh=True)["jti"]
+
+        # WHEN
+        repository = UserRepository(async_session)
+        revoked_token_repository = RevokedTokenRepository(async_session)
+        res = await UserService.refresh_login(
+            refresh_token, repository=repository, revoked_token_repository=revoked_token_repository
+        )
+        q = await async_session.execute(select(models.RevokedToken).filter_by(jti=jti))
+
+        # THEN
+        assert res["access_token"]
+        assert res["refresh_token"] != refresh_token
+        assert q.scalar()
+
+        with pytest.raises(exceptions.InvalidToken):
+            await UserService.refresh_login(
+                refresh_token, repository=repository, revoked_token_repository=revoked_token_repository
+            )
+
+    @pytest.mark.asyncio
+    async def test_logout_user(self, async_session: AsyncSession):
+        # GIVEN
+        user = helpers.create_user()
+        async_session.add(user)
+        await async_session.commit()
+        access_token = JWTAuthorizer.create(user.dict())
+        refresh_token = JWTAuthorizer.create(user.dict(), is_refresh=True)
+
+        # WHEN
+        repository = RevokedTokenRepository(async_session)
+        await UserService.logout_user(access_token, refresh_token, repository=repository)
+
+        # THEN
+        assert await repository.is_revoked(JWTAuthorizer.decode(access_token)["jti"])
+        assert await repository.is_revoked(JWTAuthorizer.decode(refresh_token, is_refresh=True)["jti"])
@@ -0,0 +1,120 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from httpx import AsyncClient
+
+from app.entrypoints.fastapi import encoding
+from app.entrypoints.fastapi.encoding import ResponseEncodingMiddleware
+
+
+DATA = {"ok": True, "data": [{"id": i, "content": f"task {i}"} for i in range(100)]}
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ResponseEncodingMiddleware, minimum_size=500, gzip_level=6, brotli_quality=4, msgpack=True)
+
+    @app.get("/large")
+    async def large():
+        return JSONResponse(DATA, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"line {i}\n".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+class TestNegotiation:
+    def test_negotiate_encoding(self):
+        # GIVEN
+        available = ("br", "gzip")
+
+        # WHEN
+        encodings = [
+            encoding.negotiate_encoding(header, available)
+            for header in ("gzip, deflate, br", "gzip;q=1.0, br;q=0.5", "br;q=0, *", "identity", "")
+        ]
+
+        # THEN
+        assert encodings == ["br", "gzip", "gzip", None, None]
+
+    def test_accepts_msgpack(self):
+        # GIVEN
+        headers = ["application/msgpack", "application/json, application/msgpack;q=0.5", "*/*", "application/json"]
+
+        # WHEN
+        accepted = [encoding.accepts_msgpack(header) for header in headers]
+
+        # THEN
+        assert accepted == [True, False, False, False]
+
+
+class TestResponseEncodingMiddleware:
+    @pytest.mark.asyncio
+    async def test_large_body_is_compressed(self):
+        # GIVEN
+        app = create_app()
+
+        # WHEN
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        # THEN
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == 'W/"v1"'
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json() == DATA
+
+    @pytest.mark.asyncio
+    async def test_small_body_is_not_compressed(self):
+        # GIVEN
+        app = create_app()
+
+        # WHEN
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        # THEN
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_msgpack(self):
+        # GIVEN
+        msgpack = pytest.importorskip("msgpack")
+        app = create_app()
+
+        # WHEN
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.get("/small", headers={"Accept": "application/msgpack", "Accept-Encoding": "identity"})
+
+        # THEN
+        assert response.headers["content-type"] == "application/msgpack"
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert msgpack.unpackb(response.content) == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_streamed_body_is_compressed_as_it_is_sent(self):
+        # GIVEN
+        app = create_app()
+
+        # WHEN
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            async with ac.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+                raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+        # THEN
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert gzip.decompress(raw) == b"line 0\nline 1\nline 2\n"
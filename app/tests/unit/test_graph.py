@@ -0,0 +1,67 @@
+import datetime
+
+from app.entrypoints.fastapi import graph
+
+
+class TestRenderContributionGraph:
+    def test_render(self):
+        # GIVEN
+        counts = {datetime.date(2026, 3, 2): (4, 4), datetime.date(2026, 3, 3): (3, 1)}
+
+        # WHEN
+        svg = graph.render_contribution_graph(2026, counts)
+
+        # THEN
+        assert svg.startswith('<svg xmlns="http://www.w3.org/2000/svg"')
+        assert svg.count("<rect") == 365
+        assert "4/4 tasks completed on 2026-03-02" in svg
+        assert "5 tasks completed in 2026" in svg
+
+    def test_get_level(self):
+        # GIVEN
+        max_completed = 8
+
+        # WHEN
+        levels = [graph.get_level(c, max_completed) for c in (0, 1, 2, 3, 8)]
+
+        # THEN
+        assert levels == [0, 1, 1, 2, 4]
+
+
+class TestGraphCache:
+    def test_get_with_another_version_misses(self):
+        # GIVEN
+        cache = graph.GraphCache(ttl=60, maxsize=2)
+        rendered = cache.put((1, 2026), (0, 1), b"<svg/>")
+
+        # WHEN
+        hit = cache.get((1, 2026), (0, 1))
+        miss = cache.get((1, 2026), (0, 2))
+
+        # THEN
+        assert hit is rendered
+        assert miss is None
+
+    def test_expired_entry_misses(self):
+        # GIVEN
+        cache = graph.GraphCache(ttl=0, maxsize=2)
+        cache.put((1, 2026), (0, 1), b"<svg/>")
+
+        # WHEN
+        miss = cache.get((1, 2026), (0, 1))
+
+        # THEN
+        assert miss is None
+
+    def test_etag_matches(self):
+        # GIVEN
+        rendered = graph.GraphCache(ttl=60, maxsize=2).put((1, 2026), (0, 1), b"<svg/>")
+
+        # WHEN
+        matches = [
+            graph.etag_matches(header, rendered.etag)
+            for header in (None, '"other"', rendered.etag, f'"other", W/{rendered.etag}', "*")
+        ]
+
+        # THEN
+        assert matches == [False, False, True, True, True]
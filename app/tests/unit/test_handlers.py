@@ -7,9 +7,15 @@ from copy import deepcopy
 
 from app.tests import helpers
 from app.domain.todo import models
-from app.service.todo.handlers import TodoRepoService, DailyTodoService
+from app.service.todo.handlers import TodoRepoService, DailyTodoService, TodoRepoStatsService, TodoSearchService
 from app.service import exceptions
-from app.adapters.todo.repository import TodoRepoRepository, DailyTodoRepository
+from app.adapters.todo.repository import (
+    TodoRepoRepository,
+    DailyTodoRepository,
+    DailyTodoArchiveRepository,
+    TodoRepoStatsRepository,
+    TodoSearchRepository,
+)
 
 
 class TestTodoRepo:
@@ -65,6 +71,25 @@ class TestTodoRepo:
         assert repo_before_update.title != res["title"]
         assert repo_before_update.description != res["description"]
         assert repo_before_update.user_id == res["user_id"]
+        assert repo_before_update.version + 1 == res["version"]
+
+    @pytest.mark.asyncio
+    async def test_update_todo_repo_if_version_does_not_match(self, async_session: AsyncSession):
+        # GIVEN
+        repo = helpers.create_todo_repo(user_id=helpers.user["user_id"])
+        async_session.add(repo)
+        await async_session.commit()
+
+        title = helpers.fake.word()
+        description = helpers.fake.text()
+
+        # WHEN
+        repository = TodoRepoRepository(async_session)
+        with pytest.raises(exceptions.VersionConflict):
+            # THEN
+            await TodoRepoService.update_todo_repo(
+                repo.id, title, description, repo.version + 1, repository=repository
+            )
 
     @pytest.mark.asyncio
     async def test_update_todo_repo_if_repo_does_not_exist(self, async_session: AsyncSession):
@@ -186,6 +211,57 @@ class TestTodoRepo:
         assert data[-1]["id"] == 11
 
 
+    @pytest.mark.asyncio
+    async def test_get_todo_repos_with_include_total(self, async_session: AsyncSession):
+        # GIVEN
+        user_id = helpers.user["user_id"]
+        repository = TodoRepoRepository(async_session)
+        for _ in range(3):
+            await TodoRepoService.create_todo_repo(
+                title=helpers.fake.word(), description=helpers.fake.text(), user_id=user_id, repository=repository
+            )
+
+        # WHEN
+        res = await TodoRepoService.get_todo_repos(
+            user_id=user_id, cursor=None, page_size=2, include_total=True, repository=repository
+        )
+
+        # THEN
+        assert len(res["data"]) == 2
+        assert res["paging"]["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_delete_todo_repo(self, async_session: AsyncSession):
+        # GIVEN
+        user_id = helpers.user["user_id"]
+        repository = TodoRepoRepository(async_session)
+        created = await TodoRepoService.create_todo_repo(
+            title=helpers.fake.word(), description=helpers.fake.text(), user_id=user_id, repository=repository
+        )
+
+        # WHEN
+        res = await TodoRepoService.delete_todo_repo(created["id"], user_id, repository=repository)
+        q = await async_session.execute(select(models.TodoRepo).filter_by(id=created["id"]))
+
+        # THEN
+        assert res == created
+        assert q.scalar() is None
+        assert await repository.get_todo_repo_count(user_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_todo_repo_of_another_user(self, async_session: AsyncSession):
+        # GIVEN
+        repo = helpers.create_todo_repo(user_id=helpers.user["user_id"] + 1)
+        async_session.add(repo)
+        await async_session.commit()
+
+        # WHEN
+        repository = TodoRepoRepository(async_session)
+        with pytest.raises(exceptions.TodoRepoNotFound):
+            # THEN
+            await TodoRepoService.delete_todo_repo(repo.id, helpers.user["user_id"], repository=repository)
+
+
 class TestDailyTodo:
     @pytest.mark.asyncio
     async def test_create_daily_todo(self, async_session: AsyncSession):
@@ -250,6 +326,58 @@ class TestDailyTodo:
                 daily_todo_repository=daily_todo_repository,
             )
 
+    @pytest.mark.asyncio
+    async def test_put_daily_todo(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        repo = helpers.create_todo_repo()
+        async_session.add(repo)
+        await async_session.commit()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res, created = await DailyTodoService.put_daily_todo(repo.id, date, repository=repository)
+        q = await async_session.execute(select(models.DailyTodo).filter_by(todo_repo_id=repo.id, date=date))
+        daily_todo = q.scalar()
+
+        # THEN
+        assert created is True
+        assert daily_todo
+
+        assert res["todo_repo_id"] == daily_todo.todo_repo_id
+        assert res["date"] == daily_todo.date
+
+    @pytest.mark.asyncio
+    async def test_put_daily_todo_if_daily_todo_already_exists(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res, created = await DailyTodoService.put_daily_todo(todo_repo.id, date, repository=repository)
+
+        # THEN
+        assert created is False
+
+        assert res["todo_repo_id"] == todo_repo.id
+        assert res["date"] == date
+
+    @pytest.mark.asyncio
+    async def test_put_daily_todo_if_todo_repo_does_not_exist(self, async_session: AsyncSession):
+        # GIVEN
+        todo_repo_id = helpers.ID_MAX_LIMIT
+        date = helpers.get_random_date()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        with pytest.raises(exceptions.TodoRepoNotFound):
+            # THEN
+            await DailyTodoService.put_daily_todo(todo_repo_id, date, repository=repository)
+
     @pytest.mark.asyncio
     async def test_get_daily_todo(self, async_session: AsyncSession):
         # GIVEN
@@ -269,6 +397,50 @@ class TestDailyTodo:
         assert daily_todo.todo_repo_id == res["todo_repo_id"]
         assert daily_todo.date == res["date"]
 
+    @pytest.mark.asyncio
+    async def test_get_daily_todos(self, async_session: AsyncSession):
+        # GIVEN
+        page_size = 3
+        todo_repo = helpers.create_todo_repo()
+        dates = [datetime.date(2026, 10, 1) - datetime.timedelta(days=i) for i in range(5)]
+        daily_todos = [helpers.create_daily_todo(todo_repo=todo_repo, date=date) for date in dates]
+        async_session.add_all([todo_repo, *daily_todos])
+        await async_session.commit()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res = await DailyTodoService.get_daily_todos(
+            todo_repo.id, cursor=None, page_size=page_size, repository=repository
+        )
+
+        # THEN
+        assert [r["date"] for r in res["data"]] == dates[:3]
+        assert res["paging"]["has_prev"] is False
+        assert res["paging"]["has_next"] is True
+
+        # WHEN
+        next_cursor = res["paging"]["cursors"]["next"]
+        res = await DailyTodoService.get_daily_todos(
+            todo_repo.id, cursor=next_cursor, page_size=page_size, repository=repository
+        )
+
+        # THEN
+        assert [r["date"] for r in res["data"]] == dates[3:]
+        assert res["paging"]["cursors"]["next"] is None
+        assert res["paging"]["has_prev"] is True
+        assert res["paging"]["has_next"] is False
+
+    @pytest.mark.asyncio
+    async def test_get_daily_todos_with_invalid_cursor(self, async_session: AsyncSession):
+        # GIVEN
+        todo_repo_id = helpers.ID_MAX_LIMIT
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        with pytest.raises(exceptions.InvalidCursor):
+            # THEN
+            await DailyTodoService.get_daily_todos(todo_repo_id, cursor="invalid", repository=repository)
+
     @pytest.mark.asyncio
     async def test_create_daily_todo_task(self, async_session: AsyncSession):
         # GIVEN
@@ -314,6 +486,102 @@ class TestDailyTodo:
             # THEN
             await DailyTodoService.create_daily_todo_task(todo_repo_id, date, content, repository=repository)
 
+    @pytest.mark.asyncio
+    async def test_create_daily_todo_task_with_create_daily_todo(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        async_session.add(todo_repo)
+        await async_session.commit()
+
+        content = helpers.fake.text()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res = await DailyTodoService.create_daily_todo_task(
+            todo_repo.id, date, content, repository=repository, create_daily_todo=True
+        )
+        q = await async_session.execute(select(models.DailyTodo).filter_by(todo_repo_id=todo_repo.id, date=date))
+        daily_todo = q.scalar()
+
+        # THEN
+        assert res
+        assert daily_todo
+
+        assert res["content"] == content
+        assert res["todo_repo_id"] == daily_todo.todo_repo_id
+        assert res["date"] == daily_todo.date
+
+    @pytest.mark.asyncio
+    async def test_create_daily_todo_task_with_create_daily_todo_if_todo_repo_does_not_exist(
+        self, async_session: AsyncSession
+    ):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo_id = helpers.ID_MAX_LIMIT
+
+        content = helpers.fake.text()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        with pytest.raises(exceptions.TodoRepoNotFound):
+            # THEN
+            await DailyTodoService.create_daily_todo_task(
+                todo_repo_id, date, content, repository=repository, create_daily_todo=True
+            )
+
+    @pytest.mark.asyncio
+    async def test_carry_over_daily_todo_tasks(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        next_date = date + datetime.timedelta(days=1)
+        unfinished = [t.content for t in sorted(daily_todo_tasks, key=lambda t: t.id) if not t.is_completed]
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res_list = await DailyTodoService.carry_over_daily_todo_tasks(todo_repo.id, next_date, repository=repository)
+        stats = await TodoRepoStatsRepository(async_session).get_weekday_stats(todo_repo.id)
+
+        # THEN
+        assert [res["content"] for res in res_list] == unfinished
+        assert all(not res["is_completed"] and res["date"] == next_date for res in res_list)
+        assert await repository.get(todo_repo.id, next_date) is not None
+        assert sum(s.total for s in stats) == len(unfinished)
+
+    @pytest.mark.asyncio
+    async def test_carry_over_daily_todo_tasks_to_an_earlier_day(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo_id = helpers.ID_MAX_LIMIT
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        with pytest.raises(exceptions.InvalidCarryOver):
+            # THEN
+            await DailyTodoService.carry_over_daily_todo_tasks(
+                todo_repo_id, date, from_date=date, repository=repository
+            )
+
+    @pytest.mark.asyncio
+    async def test_carry_over_daily_todo_tasks_if_there_is_no_daily_todo(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        async_session.add(todo_repo)
+        await async_session.commit()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        with pytest.raises(exceptions.DailyTodoNotFound):
+            # THEN
+            await DailyTodoService.carry_over_daily_todo_tasks(todo_repo.id, date, repository=repository)
+
     @pytest.mark.asyncio
     async def test_get_daily_todo_tasks(self, async_session: AsyncSession):
         # GIVEN
@@ -355,6 +623,74 @@ class TestDailyTodo:
         # THEN
         assert res_list == []
 
+    @pytest.mark.asyncio
+    async def test_get_daily_todo_tasks_page(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        page_size = 10
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        helpers.create_daily_todo_tasks(daily_todo=daily_todo, n=15)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res = await DailyTodoService.get_daily_todo_tasks_page(
+            todo_repo.id, date, cursor=None, page_size=page_size, repository=repository
+        )
+
+        # THEN
+        assert (data := res["data"])
+        assert res["paging"]["cursors"]["prev"] is None
+        assert res["paging"]["cursors"]["next"] == 10
+        assert res["paging"]["has_prev"] is False
+        assert res["paging"]["has_next"] is True
+
+        assert len(data) == page_size
+        assert data[0]["id"] == 1
+        assert data[-1]["id"] == 10
+
+        # WHEN
+        next_cursor = res["paging"]["cursors"]["next"]
+        res = await DailyTodoService.get_daily_todo_tasks_page(
+            todo_repo.id, date, cursor=next_cursor, page_size=page_size, repository=repository
+        )
+
+        # THEN
+        assert (data := res["data"])
+        assert res["paging"]["cursors"]["prev"] is None
+        assert res["paging"]["cursors"]["next"] is None
+        assert res["paging"]["has_prev"] is True
+        assert res["paging"]["has_next"] is False
+
+        assert len(data) == 5
+        assert data[0]["id"] == 11
+        assert data[-1]["id"] == 15
+
+    @pytest.mark.asyncio
+    async def test_get_daily_todo_tasks_if_daily_todo_is_archived(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        expected = [t.dict() for t in daily_todo_tasks]
+        archive_repository = DailyTodoArchiveRepository(async_session)
+        await archive_repository.archive_daily_todos(todo_repo.id, date + datetime.timedelta(days=1))
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res_list = await DailyTodoService.get_daily_todo_tasks(todo_repo.id, date, repository=repository)
+        q = await async_session.execute(select(models.DailyTodoTask).filter_by(todo_repo_id=todo_repo.id))
+
+        # THEN
+        assert q.scalars().all() == []
+        assert sorted(res_list, key=lambda r: r["id"]) == sorted(expected, key=lambda r: r["id"])
+
     @pytest.mark.asyncio
     async def test_update_daily_todo_task_for_content(self, async_session: AsyncSession):
         # GIVEN
@@ -385,6 +721,29 @@ class TestDailyTodo:
         assert task_before_update["todo_repo_id"] == res["todo_repo_id"]
         assert task_before_update["date"] == res["date"]
 
+    @pytest.mark.asyncio
+    async def test_update_daily_todo_task_for_content_if_version_does_not_match(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_task = helpers.create_daily_todo_task(daily_todo=daily_todo)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        version = daily_todo_task.version
+        repository = DailyTodoRepository(async_session)
+        await DailyTodoService.update_daily_todo_task_for_content(
+            todo_repo.id, date, daily_todo_task.id, "first edit", version, repository=repository
+        )
+
+        # WHEN
+        with pytest.raises(exceptions.VersionConflict):
+            # THEN
+            await DailyTodoService.update_daily_todo_task_for_content(
+                todo_repo.id, date, daily_todo_task.id, "second edit", version, repository=repository
+            )
+
     @pytest.mark.asyncio
     async def test_update_daily_todo_task_for_content_if_there_is_no_daily_todo(self, async_session: AsyncSession):
         # GIVEN
@@ -488,3 +847,254 @@ class TestDailyTodo:
             await DailyTodoService.update_daily_todo_task_for_is_completed(
                 todo_repo.id, date, daily_todo_task_id, is_completed, repository=repository
             )
+
+    @pytest.mark.asyncio
+    async def test_update_daily_todo_task_for_is_completed_if_daily_todo_is_archived(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_task = helpers.create_daily_todo_task(daily_todo=daily_todo)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        task_before_update = daily_todo_task.dict()
+        is_completed = not (daily_todo_task.is_completed)
+        archive_repository = DailyTodoArchiveRepository(async_session)
+        await archive_repository.archive_daily_todos(todo_repo.id, date + datetime.timedelta(days=1))
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res = await DailyTodoService.update_daily_todo_task_for_is_completed(
+            todo_repo.id, date, task_before_update["id"], is_completed, repository=repository
+        )
+        q = await async_session.execute(select(models.DailyTodoArchive).filter_by(todo_repo_id=todo_repo.id))
+
+        # THEN
+        assert res["id"] == task_before_update["id"]
+        assert res["is_completed"] == is_completed
+        assert await repository._get(todo_repo.id, date) is not None
+        assert q.scalar() is None
+
+    @pytest.mark.asyncio
+    async def test_update_daily_todo_tasks_for_is_completed(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        ids = sorted(t.id for t in daily_todo_tasks)[:5]
+        missing_id = helpers.ID_MAX_LIMIT
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res = await DailyTodoService.update_daily_todo_tasks_for_is_completed(
+            todo_repo.id, date, [*ids, missing_id], True, repository=repository
+        )
+        stats = await TodoRepoStatsRepository(async_session).get_weekday_stats(todo_repo.id)
+
+        # THEN
+        assert [t["id"] for t in res["daily_todo_tasks"]] == ids
+        assert all(t["is_completed"] for t in res["daily_todo_tasks"])
+        assert res["not_found_ids"] == [missing_id]
+        assert sum(s.completed for s in stats) == sum(t.is_completed or t.id in ids for t in daily_todo_tasks)
+
+    @pytest.mark.asyncio
+    async def test_update_daily_todo_tasks_for_is_completed_for_all(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        res = await DailyTodoService.update_daily_todo_tasks_for_is_completed(
+            todo_repo.id, date, None, False, repository=repository
+        )
+        stats = await TodoRepoStatsRepository(async_session).get_weekday_stats(todo_repo.id)
+
+        # THEN
+        assert len(res["daily_todo_tasks"]) == len(daily_todo_tasks)
+        assert not any(t["is_completed"] for t in res["daily_todo_tasks"])
+        assert res["not_found_ids"] == []
+        assert sum(s.completed for s in stats) == 0
+
+    @pytest.mark.asyncio
+    async def test_update_daily_todo_tasks_for_is_completed_if_there_is_no_daily_todo(
+        self, async_session: AsyncSession
+    ):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo_id = helpers.ID_MAX_LIMIT
+
+        # WHEN
+        repository = DailyTodoRepository(async_session)
+        with pytest.raises(exceptions.DailyTodoNotFound):
+            # THEN
+            await DailyTodoService.update_daily_todo_tasks_for_is_completed(
+                todo_repo_id, date, [helpers.ID_MAX_LIMIT], True, repository=repository
+            )
+
+
+class TestTodoRepoStats:
+    @pytest.mark.asyncio
+    async def test_get_todo_repo_stats(self, async_session: AsyncSession):
+        # GIVEN
+        date = datetime.date(2026, 10, 19)  # Monday
+        todo_repo = helpers.create_todo_repo()
+        async_session.add(todo_repo)
+        await async_session.commit()
+
+        repository = DailyTodoRepository(async_session)
+        task = await DailyTodoService.create_daily_todo_task(
+            todo_repo.id, date, helpers.fake.word(), repository=repository, create_daily_todo=True
+        )
+        await DailyTodoService.create_daily_todo_task(todo_repo.id, date, helpers.fake.word(), repository=repository)
+        await DailyTodoService.update_daily_todo_task_for_is_completed(
+            todo_repo.id, date, task["id"], True, repository=repository
+        )
+
+        # WHEN
+        res = await TodoRepoStatsService.get_todo_repo_stats(
+            todo_repo.id,
+            helpers.user["user_id"],
+            "week",
+            since=date - datetime.timedelta(days=7),
+            until=date,
+            todo_repo_repository=TodoRepoRepository(async_session),
+            stats_repository=TodoRepoStatsRepository(async_session),
+        )
+
+        # THEN
+        assert res["periods"] == [
+            dict(start=datetime.date(2026, 10, 12), total=0, completed=0, completion_rate=0.0),
+            dict(start=date, total=2, completed=1, completion_rate=0.5),
+        ]
+        assert len(res["weekdays"]) == 7
+        assert res["weekdays"][0] == dict(weekday=0, total=2, completed=1, completion_rate=0.5)
+
+    @pytest.mark.asyncio
+    async def test_get_todo_repo_stats_of_another_user(self, async_session: AsyncSession):
+        # GIVEN
+        todo_repo = helpers.create_todo_repo(user_id=helpers.user["user_id"] + 1)
+        async_session.add(todo_repo)
+        await async_session.commit()
+
+        # WHEN
+        with pytest.raises(exceptions.TodoRepoNotFound):
+            # THEN
+            await TodoRepoStatsService.get_todo_repo_stats(
+                todo_repo.id,
+                helpers.user["user_id"],
+                "month",
+                todo_repo_repository=TodoRepoRepository(async_session),
+                stats_repository=TodoRepoStatsRepository(async_session),
+            )
+
+    @pytest.mark.asyncio
+    async def test_rebuild_todo_repo_stats(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        todo_repo = helpers.create_todo_repo()
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo, n=5)
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        # WHEN
+        repository = TodoRepoStatsRepository(async_session)
+        total = await repository.rebuild_todo_repo_stats(todo_repo.id)
+        month_stats = await repository.get_period_stats(todo_repo.id, "month", date, date)
+
+        # THEN
+        assert total == 5
+        assert len(month_stats) == 1
+        assert month_stats[0].total == 5
+        assert month_stats[0].completed == sum(t.is_completed for t in daily_todo_tasks)
+
+
+class TestTodoSearch:
+    @pytest.mark.asyncio
+    async def test_search(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        user_id = helpers.ID_MAX_LIMIT
+        todo_repo = helpers.create_todo_repo(user_id=user_id)
+        todo_repo.title = "Marathon"
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo, n=3)
+        for daily_todo_task, content in zip(daily_todo_tasks, ["marathon training", "buy shoes", "marathon"]):
+            daily_todo_task.content = content
+        other_todo_repo = helpers.create_todo_repo(user_id=user_id + 1)
+        other_todo_repo.title = "Marathon"
+        async_session.add_all([todo_repo, daily_todo, other_todo_repo])
+        await async_session.commit()
+
+        # WHEN
+        repository = TodoSearchRepository(async_session)
+        res = await TodoSearchService.search(user_id, "marathon", page_size=2, repository=repository)
+        next_res = await TodoSearchService.search(
+            user_id, "marathon", cursor=res["paging"]["cursors"]["next"], page_size=2, repository=repository
+        )
+
+        # THEN
+        hits = res["data"] + next_res["data"]
+        assert [h["rank"] for h in hits] == sorted((h["rank"] for h in hits), reverse=True)
+        assert sorted((h["kind"], h["id"]) for h in hits) == [
+            ("daily_todo_task", daily_todo_tasks[0].id),
+            ("daily_todo_task", daily_todo_tasks[2].id),
+            ("todo_repo", todo_repo.id),
+        ]
+        assert res["paging"]["has_next"]
+        assert not next_res["paging"]["has_next"]
+
+    @pytest.mark.asyncio
+    async def test_search_archived_daily_todo_tasks(self, async_session: AsyncSession):
+        # GIVEN
+        date = helpers.get_random_date()
+        user_id = helpers.ID_MAX_LIMIT
+        todo_repo = helpers.create_todo_repo(user_id=user_id)
+        daily_todo = helpers.create_daily_todo(todo_repo=todo_repo, date=date)
+        daily_todo_tasks = helpers.create_daily_todo_tasks(daily_todo=daily_todo, n=2)
+        daily_todo_tasks[0].content = "renew the passport"
+        daily_todo_tasks[1].content = "buy shoes"
+        async_session.add_all([todo_repo, daily_todo])
+        await async_session.commit()
+
+        todo_repo_id = todo_repo.id
+        passport_task_id, shoes_task_id = (t.id for t in daily_todo_tasks)
+        archive_repository = DailyTodoArchiveRepository(async_session)
+        await archive_repository.archive_daily_todos(todo_repo_id, date + datetime.timedelta(days=1))
+
+        # WHEN
+        repository = TodoSearchRepository(async_session)
+        res = await TodoSearchService.search(user_id, "passport", repository=repository)
+
+        daily_todo_repository = DailyTodoRepository(async_session)
+        await DailyTodoService.update_daily_todo_task_for_is_completed(
+            todo_repo_id, date, shoes_task_id, True, repository=daily_todo_repository
+        )
+        rehydrated_res = await TodoSearchService.search(user_id, "passport", repository=repository)
+
+        # THEN
+        assert [(h["kind"], h["id"], h["date"], h["text"]) for h in res["data"]] == [
+            ("daily_todo_task", passport_task_id, date, "renew the passport")
+        ]
+        assert [(h["kind"], h["id"]) for h in rehydrated_res["data"]] == [("daily_todo_task", passport_task_id)]
+
+    @pytest.mark.asyncio
+    async def test_search_with_invalid_cursor(self, async_session: AsyncSession):
+        # GIVEN
+        cursor = "invalid"
+
+        # WHEN
+        repository = TodoSearchRepository(async_session)
+        with pytest.raises(exceptions.InvalidCursor):
+            # THEN
+            await TodoSearchService.search(0, "marathon", cursor=cursor, repository=repository)
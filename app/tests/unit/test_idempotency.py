@@ -0,0 +1,186 @@
+import asyncio
+import datetime
+import pytest
+from fastapi import HTTPException
+
+from app.domain.idempotency.models import IdempotencyKey
+from app.entrypoints.fastapi.idempotency import IdempotencyStore
+
+
+class FakeIdempotencyKeyRepository:
+    """idempotency_keys shared by the stores of several workers"""
+
+    def __init__(self):
+        self.records: dict[tuple[int, str], IdempotencyKey] = {}
+
+    async def claim(self, user_id, key, fingerprint, expires_at, now):
+        if (record := self.records.get((user_id, key))) is not None and record.expires_at > now:
+            return False
+        self.records[(user_id, key)] = IdempotencyKey(
+            user_id=user_id, key=key, fingerprint=fingerprint, expires_at=expires_at
+        )
+        return True
+
+    async def get(self, user_id, key):
+        return self.records.get((user_id, key))
+
+    async def complete(self, user_id, key, status_code, body, expires_at):
+        record = self.records[(user_id, key)]
+        record.status_code, record.body, record.expires_at = status_code, body, expires_at
+
+    async def release(self, user_id, key):
+        if (record := self.records.get((user_id, key))) is not None and not record.completed:
+            del self.records[(user_id, key)]
+
+
+def create_store(**kwargs) -> IdempotencyStore:
+    return IdempotencyStore(**dict(dict(ttl=60, lock_timeout=60, wait_timeout=1, poll_interval=0.001), **kwargs))
+
+
+class TestIdempotencyStore:
+    @pytest.mark.asyncio
+    async def test_replay_returns_stored_response_without_running_handler(self):
+        # GIVEN
+        repository = FakeIdempotencyKeyRepository()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return {"ok": True, "data": {"id": len(calls)}}
+
+        # WHEN the retry reaches another worker
+        first = await create_store().execute(0, "key", "a", 201, call, repository=repository)
+        replay = await create_store().execute(0, "key", "a", 201, call, repository=repository)
+
+        # THEN
+        assert len(calls) == 1
+        assert first == {"ok": True, "data": {"id": 1}}
+        assert replay.status_code == 201
+        assert replay.body == b'{"ok":true,"data":{"id":1}}'
+        assert replay.headers["Idempotent-Replayed"] == "true"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_wait_for_first_request(self):
+        # GIVEN
+        store = create_store()
+        repository = FakeIdempotencyKeyRepository()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"id": 1}
+
+        # WHEN
+        results = await asyncio.gather(
+            *[store.execute(0, "key", "a", 201, call, repository=repository) for _ in range(5)]
+        )
+
+        # THEN
+        assert len(calls) == 1
+        assert results[0] == {"id": 1}
+        assert all(r.body == b'{"id":1}' for r in results[1:])
+
+    @pytest.mark.asyncio
+    async def test_duplicate_of_a_slow_request_is_rejected(self):
+        # GIVEN
+        store = create_store(wait_timeout=0.01)
+        repository = FakeIdempotencyKeyRepository()
+
+        async def call():
+            await asyncio.sleep(0.1)
+            return {"id": 1}
+
+        # WHEN
+        first = asyncio.create_task(store.execute(0, "key", "a", 201, call, repository=repository))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as e:
+            await store.execute(0, "key", "a", 201, call, repository=repository)
+
+        # THEN
+        assert e.value.status_code == 409
+        assert await first == {"id": 1}
+
+    @pytest.mark.asyncio
+    async def test_key_held_by_a_lost_request_is_claimed_again(self):
+        # GIVEN
+        store = create_store()
+        repository = FakeIdempotencyKeyRepository()
+        expired = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=1)
+        repository.records[(0, "key")] = IdempotencyKey(user_id=0, key="key", fingerprint="a", expires_at=expired)
+
+        async def call():
+            return {"id": 1}
+
+        # WHEN
+        res = await store.execute(0, "key", "a", 201, call, repository=repository)
+
+        # THEN
+        assert res == {"id": 1}
+        assert repository.records[(0, "key")].completed
+
+    @pytest.mark.asyncio
+    async def test_failed_request_is_not_recorded(self):
+        # GIVEN
+        store = create_store()
+        repository = FakeIdempotencyKeyRepository()
+
+        async def fail():
+            raise HTTPException(status_code=404)
+
+        async def call():
+            return {"id": 1}
+
+        # WHEN
+        with pytest.raises(HTTPException):
+            await store.execute(0, "key", "a", 201, fail, repository=repository)
+        res = await store.execute(0, "key", "a", 201, call, repository=repository)
+
+        # THEN
+        assert res == {"id": 1}
+
+    @pytest.mark.asyncio
+    async def test_keys_are_scoped_per_user_and_request(self):
+        # GIVEN
+        store = create_store()
+        repository = FakeIdempotencyKeyRepository()
+
+        async def call():
+            return {"id": 1}
+
+        await store.execute(0, "key", "a", 201, call, repository=repository)
+
+        # WHEN
+        other_user = await store.execute(1, "key", "a", 201, call, repository=repository)
+        with pytest.raises(HTTPException) as e:
+            await store.execute(0, "key", "b", 201, call, repository=repository)
+
+        # THEN
+        assert other_user == {"id": 1}
+        assert e.value.status_code == 422
+
+
+class TestRequestFingerprint:
+    @pytest.mark.asyncio
+    async def test_fingerprint_covers_query_and_body(self):
+        # GIVEN
+        from starlette.requests import Request
+
+        from app.entrypoints.fastapi.idempotency import get_request_fingerprint
+
+        def create_request(query: bytes, body: bytes) -> Request:
+            async def receive():
+                return dict(type="http.request", body=body, more_body=False)
+
+            scope = dict(type="http", method="POST", path="/todo-repos", query_string=query, headers=[])
+            return Request(scope, receive)
+
+        # WHEN
+        same = await get_request_fingerprint(create_request(b"a=1&b=2", b'{"title": "a", "description": "b"}'))
+        reordered = await get_request_fingerprint(create_request(b"b=2&a=1", b'{"description":"b","title":"a"}'))
+        other_body = await get_request_fingerprint(create_request(b"a=1&b=2", b'{"title": "c", "description": "b"}'))
+        other_query = await get_request_fingerprint(create_request(b"a=2&b=2", b'{"title": "a", "description": "b"}'))
+
+        # THEN
+        assert same == reordered
+        assert len({same, other_body, other_query}) == 3
@@ -0,0 +1,61 @@
+import json
+import subprocess
+import sys
+
+from app.utils import import_profile
+
+
+IMPORT_TIME_BUDGET_MS = 3000
+LAZY_MODULES = [
+    "jose",
+    "bcrypt",
+    "asyncpg",
+    "brotli",
+    "msgpack",
+    "app.adapters.auth.persistent_orm",
+    "app.adapters.todo.persistent_orm",
+]
+# The app decides on the profiling middleware when it is built
+SETTINGS_READ_AT_IMPORT = ["PROFILING_SETTINGS"]
+LIST_SETTINGS_READ_AT_IMPORT = """
+import functools, json
+from app import settings
+parsed = []
+settings._get_settings = functools.cache(lambda name: parsed.append(name) or settings._LAZY_SETTINGS[name]())
+import app.main
+print(json.dumps(sorted(parsed)))
+"""
+
+
+class TestImportTime:
+    def test_import_main_within_budget(self):
+        # GIVEN
+        module = "app.main"
+
+        # WHEN
+        records = import_profile.profile_imports(module)
+        total_ms = import_profile.get_total_ms(records, module)
+
+        # THEN
+        assert total_ms < IMPORT_TIME_BUDGET_MS, import_profile.format_report(records)
+
+    def test_heavy_modules_are_loaded_lazily(self):
+        # GIVEN
+        module = "app.main"
+
+        # WHEN
+        records = import_profile.profile_imports(module)
+        imported = {r.module for r in records}
+
+        # THEN
+        for lazy_module in LAZY_MODULES:
+            assert lazy_module not in imported
+
+    def test_settings_are_parsed_lazily(self):
+        # WHEN
+        proc = subprocess.run(
+            [sys.executable, "-c", LIST_SETTINGS_READ_AT_IMPORT], capture_output=True, text=True, check=True
+        )
+
+        # THEN
+        assert json.loads(proc.stdout) == SETTINGS_READ_AT_IMPORT
@@ -0,0 +1,172 @@
+import asyncio
+import datetime
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import settings
+from app.adapters.job.repository import JobRepository
+from app.domain.job.models import JobStatus
+from app.entrypoints.jobs.worker import Worker, create_worker, get_retry_delay
+from app.service import exceptions
+from app.service.job.handlers import JobService
+from app.service.job.registry import JobRegistry
+
+
+class TestJobRegistry:
+    def test_register(self):
+        # GIVEN
+        registry = JobRegistry()
+
+        # WHEN
+        @registry.register("noop", queue="maintenance", max_attempts=2)
+        async def noop(payload: dict) -> None:
+            ...
+
+        # THEN
+        assert "noop" in registry
+        assert registry.get("noop").queue == "maintenance"
+        assert registry.get("noop").max_attempts == 2
+        with pytest.raises(ValueError):
+            registry.register("noop")(noop)
+
+    def test_worker_schedules_the_maintenance_jobs(self):
+        # WHEN
+        worker = create_worker()
+
+        # THEN
+        assert {"revoked_tokens.purge", "idempotency_keys.purge", "jobs.purge", "partitions.create", "archive"} <= set(
+            worker.schedule
+        )
+        retention = settings.JOB_SETTINGS.JOB_RETENTION_DAYS * 24 * 60 * 60
+        assert all(interval <= retention for interval in worker.schedule.values())
+
+    def test_worker_refuses_to_schedule_unregistered_jobs(self):
+        # GIVEN
+        registry = JobRegistry()
+
+        # WHEN
+        with pytest.raises(ValueError):
+            # THEN
+            Worker(lambda: None, dict(default=1), registry=registry, schedule=dict(missing=60))
+
+    def test_retry_delay_is_capped(self):
+        # GIVEN
+        attempts = 100
+
+        # WHEN
+        delay = get_retry_delay(attempts)
+
+        # THEN
+        assert 0 < delay <= settings.JOB_SETTINGS.JOB_RETRY_MAX_DELAY
+
+
+class TestJob:
+    @pytest.mark.asyncio
+    async def test_enqueue_unregistered_job(self, async_session: AsyncSession):
+        # GIVEN
+        registry = JobRegistry()
+
+        # WHEN
+        repository = JobRepository(async_session)
+        with pytest.raises(exceptions.JobNotRegistered):
+            # THEN
+            await JobService.enqueue("missing", repository=repository, registry=registry)
+
+    @pytest.mark.asyncio
+    async def test_dequeue_claims_each_job_once(self, async_session: AsyncSession):
+        # GIVEN
+        registry = JobRegistry()
+        registry.register("noop")(lambda payload: asyncio.sleep(0))
+        repository = JobRepository(async_session)
+        for i in range(3):
+            await JobService.enqueue("noop", dict(i=i), repository=repository, registry=registry)
+
+        # WHEN
+        first = await repository.dequeue("default", 2, lock_timeout=60)
+        second = await repository.dequeue("default", 2, lock_timeout=60)
+        third = await repository.dequeue("default", 2, lock_timeout=60)
+
+        # THEN
+        assert [j.payload["i"] for j in first + second] == [0, 1, 2]
+        assert all(j.status == JobStatus.RUNNING and j.attempts == 1 for j in first + second)
+        assert third == []
+
+    @pytest.mark.asyncio
+    async def test_worker_retries_failed_jobs(self, async_session: AsyncSession, async_session_factory):
+        # GIVEN
+        calls = []
+        registry = JobRegistry()
+
+        @registry.register("flaky", max_attempts=2)
+        async def flaky(payload: dict) -> None:
+            calls.append(payload)
+            raise ValueError("flaky")
+
+        job = await JobService.enqueue("flaky", repository=JobRepository(async_session), registry=registry)
+        settings.JOB_SETTINGS.JOB_RETRY_BASE_DELAY, base_delay = 0.01, settings.JOB_SETTINGS.JOB_RETRY_BASE_DELAY
+
+        # WHEN
+        worker = Worker(async_session_factory, dict(default=1), registry=registry, poll_interval=0.01)
+        task = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.5)
+        worker.stop()
+        await task
+        settings.JOB_SETTINGS.JOB_RETRY_BASE_DELAY = base_delay
+        async with async_session_factory() as session:
+            res = await JobService.get_job(job["id"], repository=JobRepository(session))
+
+        # THEN
+        assert len(calls) == 2
+        assert res["status"] == JobStatus.FAILED
+        assert res["attempts"] == 2
+        assert "flaky" in res["last_error"]
+
+    @pytest.mark.asyncio
+    async def test_schedule_recurring_jobs_once_per_run(self, async_session: AsyncSession):
+        # GIVEN
+        registry = JobRegistry()
+        registry.register("tick")(lambda payload: asyncio.sleep(0))
+        repository = JobRepository(async_session)
+        now = datetime.datetime(2026, 10, 20, 10, 30, tzinfo=datetime.timezone.utc)
+
+        # WHEN the schedule is checked twice within an hour, then in the next hour
+        queued = [
+            await JobService.schedule_recurring_jobs(
+                dict(tick=60 * 60), now + datetime.timedelta(minutes=minutes), repository=repository, registry=registry
+            )
+            for minutes in (0, 20, 40)
+        ]
+
+        # THEN
+        assert queued == [1, 0, 1]
+
+    @pytest.mark.asyncio
+    async def test_workers_queue_each_recurring_run_once(self, async_session_factory):
+        # GIVEN
+        calls = []
+        registry = JobRegistry()
+
+        @registry.register("tick")
+        async def tick(payload: dict) -> None:
+            calls.append(payload)
+
+        # WHEN
+        workers = [
+            Worker(
+                async_session_factory,
+                dict(default=1),
+                registry=registry,
+                poll_interval=0.01,
+                schedule=dict(tick=60 * 60),
+                schedule_interval=0.01,
+            )
+            for _ in range(2)
+        ]
+        tasks = [asyncio.create_task(worker.run()) for worker in workers]
+        await asyncio.sleep(0.5)
+        for worker in workers:
+            worker.stop()
+        await asyncio.gather(*tasks)
+
+        # THEN
+        assert len(calls) == 1
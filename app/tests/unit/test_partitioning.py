@@ -0,0 +1,135 @@
+import datetime
+import pytest
+
+from app.adapters.todo.partitioning import PartitionSpec, create_future_partitions, get_copied_columns
+from app.adapters.todo.persistent_orm import daily_todo_tasks
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def scalar(self):
+        return self.rows[0][0]
+
+
+class FakeConnection:
+    """Records the statements run; partitions and rows of the default partition are given by name and date"""
+
+    def __init__(self, spec: PartitionSpec, partitions: list[str], default_rows: list[datetime.date]):
+        self.spec = spec
+        self.partitions = partitions
+        self.default_rows = default_rows
+        self.statements = []
+
+    async def execute(self, statement, parameters=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if sql.startswith("SELECT c.relname"):
+            return FakeResult([(name,) for name in self.partitions])
+        if sql.startswith("SELECT EXISTS"):
+            return FakeResult([(any(self.spec.get_range_condition(d) in sql for d in self.default_rows),)])
+        return FakeResult([])
+
+
+class TestPartitionSpec:
+    def test_monthly_bounds_and_name(self):
+        # GIVEN
+        spec = PartitionSpec(table="daily_todo_tasks", column="date", interval="month")
+
+        # WHEN
+        bounds = spec.get_bounds(datetime.date(2026, 12, 31))
+        name = spec.get_partition_name(datetime.date(2026, 12, 31))
+
+        # THEN
+        assert bounds == (datetime.date(2026, 12, 1), datetime.date(2027, 1, 1))
+        assert name == "daily_todo_tasks_p2026_12"
+        assert spec.parse_partition_start(name) == datetime.date(2026, 12, 1)
+        assert not spec.is_partition("daily_todo_tasks")
+        assert spec.is_partition("daily_todo_tasks_default")
+
+    def test_yearly_bounds_and_name(self):
+        # GIVEN
+        spec = PartitionSpec(table="daily_todo_tasks", column="date", interval="year")
+
+        # WHEN
+        bounds = spec.get_bounds(datetime.date(2026, 6, 15))
+        name = spec.get_partition_name(datetime.date(2026, 6, 15))
+
+        # THEN
+        assert bounds == (datetime.date(2026, 1, 1), datetime.date(2027, 1, 1))
+        assert name == "daily_todo_tasks_p2026"
+        assert spec.parse_partition_start(name) == datetime.date(2026, 1, 1)
+
+    def test_iter_partition_starts(self):
+        # GIVEN
+        spec = PartitionSpec(table="daily_todo_tasks", column="date", interval="month")
+
+        # WHEN
+        starts = list(spec.iter_partition_starts(datetime.date(2026, 11, 19), datetime.date(2027, 2, 1)))
+
+        # THEN
+        assert starts == [
+            datetime.date(2026, 11, 1),
+            datetime.date(2026, 12, 1),
+            datetime.date(2027, 1, 1),
+            datetime.date(2027, 2, 1),
+        ]
+
+    def test_create_partition_ddl(self):
+        # GIVEN
+        spec = PartitionSpec(table="daily_todo_tasks", column="date", interval="month")
+
+        # WHEN
+        ddl = spec.create_partition_ddl(datetime.date(2026, 10, 19))
+
+        # THEN
+        assert ddl == (
+            "CREATE TABLE IF NOT EXISTS daily_todo_tasks_p2026_10 PARTITION OF daily_todo_tasks "
+            "FOR VALUES FROM ('2026-10-01') TO ('2026-11-01')"
+        )
+
+
+class TestCreateFuturePartitions:
+    @pytest.mark.asyncio
+    async def test_creates_missing_partitions(self):
+        # GIVEN
+        spec = PartitionSpec(table="daily_todo_tasks", column="date", interval="month")
+        conn = FakeConnection(spec, ["daily_todo_tasks_p2026_10", "daily_todo_tasks_default"], [])
+
+        # WHEN
+        created = await create_future_partitions(
+            conn, spec, ahead=1, today=datetime.date(2026, 10, 19), columns=get_copied_columns(daily_todo_tasks)
+        )
+
+        # THEN
+        assert created == ["daily_todo_tasks_p2026_11"]
+        assert not any("DETACH" in sql or "INSERT" in sql for sql in conn.statements)
+
+    @pytest.mark.asyncio
+    async def test_moves_rows_out_of_default_partition(self):
+        # GIVEN
+        spec = PartitionSpec(table="daily_todo_tasks", column="date", interval="month")
+        conn = FakeConnection(spec, ["daily_todo_tasks_default"], [datetime.date(2026, 11, 2)])
+
+        # WHEN
+        created = await create_future_partitions(
+            conn, spec, ahead=1, today=datetime.date(2026, 10, 19), columns=get_copied_columns(daily_todo_tasks)
+        )
+
+        # THEN search_vector is generated, so the partition computes it
+        assert created == ["daily_todo_tasks_p2026_10", "daily_todo_tasks_p2026_11"]
+        condition = "date >= '2026-11-01' AND date < '2026-12-01'"
+        columns = "id, created_at, updated_at, content, is_completed, todo_repo_id, date, version"
+        assert [sql for sql in conn.statements if not sql.startswith("SELECT")] == [
+            "ALTER TABLE daily_todo_tasks DETACH PARTITION daily_todo_tasks_default",
+            spec.create_partition_ddl(datetime.date(2026, 10, 1)),
+            spec.create_partition_ddl(datetime.date(2026, 11, 1)),
+            f"INSERT INTO daily_todo_tasks_p2026_11 ({columns}) "
+            f"SELECT {columns} FROM daily_todo_tasks_default WHERE {condition}",
+            f"DELETE FROM daily_todo_tasks_default WHERE {condition}",
+            "ALTER TABLE daily_todo_tasks ATTACH PARTITION daily_todo_tasks_default DEFAULT",
+        ]
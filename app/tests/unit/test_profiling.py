@@ -0,0 +1,141 @@
+import asyncio
+import json
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from app.entrypoints.fastapi import profiling
+from app.entrypoints.fastapi.profiling import ProfilingMiddleware
+
+
+TOKEN = "secret"
+
+
+def busy_wait(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def create_app(directory, format: str = "speedscope", sample_rate: float = 0.0, **kwargs) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=TOKEN,
+        sample_rate=sample_rate,
+        interval=0.001,
+        directory=str(directory),
+        format=format,
+        **kwargs,
+    )
+
+    @app.get("/work")
+    async def work():
+        busy_wait(0.05)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    return app
+
+
+class TestProfileFormats:
+    def test_to_collapsed(self):
+        # GIVEN
+        stack = (("main", "app.py", 1), profiling.WAITING)
+        samples = [(stack, 0.001), (stack, 0.002), (stack[:1], 0.001)]
+
+        # WHEN
+        collapsed = profiling.to_collapsed(samples)
+
+        # THEN
+        assert collapsed == "main (app.py:1);(waiting) 3000\nmain (app.py:1) 1000\n"
+
+    def test_to_speedscope(self):
+        # GIVEN
+        stack = (("main", "app.py", 1), profiling.WAITING)
+        samples = [(stack, 0.001), (stack[:1], 0.002)]
+
+        # WHEN
+        profile = profiling.to_speedscope(samples, "GET /")
+
+        # THEN
+        assert profile["shared"]["frames"] == [dict(name="main", file="app.py", line=1), dict(name="(waiting)")]
+        assert profile["profiles"][0]["samples"] == [[0, 1], [0]]
+        assert profile["profiles"][0]["weights"] == [0.001, 0.002]
+
+
+class TestProfilingMiddleware:
+    @pytest.mark.asyncio
+    async def test_request_with_token_is_profiled(self, tmp_path):
+        # GIVEN
+        app = create_app(tmp_path)
+
+        # WHEN
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.get("/work", headers={"X-Profile-Token": TOKEN})
+
+        # THEN
+        assert response.json() == {"ok": True}
+        profile = json.loads((tmp_path / response.headers["x-profile"]).read_text())
+        names = {frame["name"] for frame in profile["shared"]["frames"]}
+        assert "busy_wait" in names
+        assert "(waiting)" in names
+
+    @pytest.mark.asyncio
+    async def test_request_without_token_is_not_profiled(self, tmp_path):
+        # GIVEN
+        app = create_app(tmp_path, format="collapsed")
+
+        # WHEN
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.get("/work", headers={"X-Profile-Token": "wrong"})
+
+        # THEN
+        assert "x-profile" not in response.headers
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.asyncio
+    async def test_sampled_request_is_profiled_without_telling_the_client(self, tmp_path):
+        # GIVEN
+        app = create_app(tmp_path, format="collapsed", sample_rate=1.0)
+
+        # WHEN
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.get("/work")
+
+        # THEN
+        assert "x-profile" not in response.headers
+        [path] = tmp_path.iterdir()
+        assert "-GET-work-" in path.name and path.name.endswith(".collapsed.txt")
+        assert "busy_wait" in path.read_text()
+
+    @pytest.mark.asyncio
+    async def test_oldest_profiles_are_deleted_beyond_max_files(self, tmp_path):
+        # GIVEN
+        app = create_app(tmp_path, format="collapsed", max_files=2)
+        (tmp_path / "notes.txt").write_text("not a profile")
+
+        # WHEN
+        names = []
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            for _ in range(3):
+                response = await ac.get("/work", headers={"X-Profile-Token": TOKEN})
+                names.append(response.headers["x-profile"])
+
+        # THEN
+        assert sorted(path.name for path in tmp_path.iterdir()) == sorted(names[1:] + ["notes.txt"])
+
+    @pytest.mark.asyncio
+    async def test_oldest_profiles_are_deleted_beyond_max_bytes(self, tmp_path):
+        # GIVEN the newest profile alone is over the limit
+        app = create_app(tmp_path, format="collapsed", max_bytes=1)
+
+        # WHEN
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            await ac.get("/work", headers={"X-Profile-Token": TOKEN})
+            response = await ac.get("/work", headers={"X-Profile-Token": TOKEN})
+
+        # THEN
+        assert [path.name for path in tmp_path.iterdir()] == [response.headers["x-profile"]]
@@ -0,0 +1,61 @@
+import pytest
+
+from app.adapters.rate_limit.bucket_store import InProcessBucketStore
+
+
+class TestInProcessBucketStore:
+    @pytest.mark.asyncio
+    async def test_consume_until_bucket_is_empty(self):
+        # GIVEN
+        store = InProcessBucketStore(shards=4)
+        capacity, refill_rate = 3, 0.5
+
+        # WHEN
+        retry_afters = [await store.consume("login:ip:127.0.0.1", capacity, refill_rate) for _ in range(capacity + 1)]
+
+        # THEN
+        assert retry_afters[:capacity] == [0] * capacity
+        assert 0 < retry_afters[-1] <= 1 / refill_rate
+
+    @pytest.mark.asyncio
+    async def test_buckets_are_independent_per_key(self):
+        # GIVEN
+        store = InProcessBucketStore(shards=4)
+        await store.consume("login:email:a@example.com", 1, 0.01)
+
+        # WHEN
+        retry_after_same_key = await store.consume("login:email:a@example.com", 1, 0.01)
+        retry_after_other_key = await store.consume("login:email:b@example.com", 1, 0.01)
+
+        # THEN
+        assert retry_after_same_key > 0
+        assert retry_after_other_key == 0
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_buckets_are_evicted(self):
+        # GIVEN
+        store = InProcessBucketStore(shards=1, max_keys_per_shard=10)
+
+        # WHEN
+        for i in range(100):
+            await store.consume(f"signup:ip:{i}", 1, 0.01)
+
+        # THEN
+        assert list(store._shards[0]) == [f"signup:ip:{i}" for i in range(90, 100)]
+
+    @pytest.mark.asyncio
+    async def test_buckets_of_other_limits_are_not_reset(self):
+        # GIVEN an IP bucket holding more tokens than the capacity of the email limit
+        store = InProcessBucketStore(shards=1, max_keys_per_shard=10)
+        for i in range(9):
+            await store.consume(f"login:email:{i}@example.com", 5, 1 / 60)
+        for _ in range(10):
+            await store.consume("login:ip:127.0.0.1", 20, 0.01)
+
+        # WHEN the shard overflows with an email bucket
+        await store.consume("login:email:9@example.com", 5, 1 / 60)
+        retry_afters = [await store.consume("login:ip:127.0.0.1", 20, 0.01) for _ in range(11)]
+
+        # THEN
+        assert retry_afters[:10] == [0] * 10
+        assert retry_afters[-1] > 0
@@ -0,0 +1,49 @@
+import sqlite3
+
+from app.adapters.todo import search
+
+
+class TestFtsQuery:
+    def test_words_are_quoted(self):
+        # GIVEN
+        query = 'run "fast" OR -walk*'
+
+        # WHEN
+        fts_query = search.get_fts_query(query)
+
+        # THEN
+        assert fts_query == '"run" "fast" "OR" "walk"'
+
+    def test_query_without_words(self):
+        # GIVEN
+        query = "!? *"
+
+        # WHEN
+        fts_query = search.get_fts_query(query)
+
+        # THEN
+        assert fts_query is None
+
+
+class TestFtsDdl:
+    def test_triggers_keep_the_fts_table_current(self):
+        # GIVEN
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, content TEXT NOT NULL)")
+        for ddl in search.get_fts_ddl("tasks", ["content"]):
+            conn.execute(ddl)
+
+        def match(query: str) -> list[int]:
+            q = conn.execute("SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?", (search.get_fts_query(query),))
+            return sorted(row[0] for row in q)
+
+        # WHEN
+        conn.executemany("INSERT INTO tasks (content) VALUES (?)", [("run 5km",), ("swim",), ("run again",)])
+        conn.execute("UPDATE tasks SET content = 'walk' WHERE id = 3")
+        conn.execute("DELETE FROM tasks WHERE id = 2")
+
+        # THEN
+        assert match("run") == [1]
+        assert match("walk") == [3]
+        assert match("swim") == []
+        assert match("run OR walk") == []
@@ -0,0 +1,197 @@
+import datetime
+import types
+import pytest
+from sqlalchemy import column, table
+
+from app import settings
+from app.adapters.shard import shard_map
+from app.entrypoints.fastapi import sharding
+from app.domain.todo.read_models import TodoRepoRecord
+from app.service.todo.handlers import TodoRepoService
+
+
+class FakeUserShardRepository:
+    def __init__(self, user_shards: dict[int, tuple[str, str | None]]):
+        self.user_shards = user_shards
+        self.gets = 0
+
+    async def get(self, user_id):
+        self.gets += 1
+        return self.user_shards.get(user_id)
+
+    async def place(self, user_id, shard):
+        self.user_shards.setdefault(user_id, (shard, None))
+        return self.user_shards[user_id]
+
+
+@pytest.fixture
+def shards(monkeypatch):
+    monkeypatch.setattr(settings.SHARD_SETTINGS, "SHARD_DSNS", dict(a="sqlite+aiosqlite://", b="sqlite+aiosqlite://"))
+    monkeypatch.setattr(settings.SHARD_SETTINGS, "SHARD_NEW_USERS", [])
+    monkeypatch.setattr(settings.SHARD_SETTINGS, "SHARD_ID_STRIDE", 64)
+
+
+class TestShardPlacement:
+    def test_get_default_shard(self, shards, monkeypatch):
+        # WHEN
+        placed = [shard_map.get_default_shard(user_id) for user_id in (1, 2, 3)]
+        monkeypatch.setattr(settings.SHARD_SETTINGS, "SHARD_NEW_USERS", ["b"])
+        placed_on_new_users = [shard_map.get_default_shard(user_id) for user_id in (1, 2, 3)]
+
+        # THEN
+        assert placed == ["b", "a", "b"]
+        assert placed_on_new_users == ["b", "b", "b"]
+
+    def test_get_origin_shard(self, shards):
+        # WHEN
+        origins = [shard_map.get_origin_shard(id) for id in (64, 129, 130)]
+
+        # THEN
+        assert origins == ["a", "b", None]
+
+
+class TestShardMap:
+    @pytest.mark.asyncio
+    async def test_get_places_new_user(self, shards):
+        # GIVEN
+        cache = shard_map.ShardMap(ttl=60, maxsize=2)
+        repository = FakeUserShardRepository({})
+
+        # WHEN
+        user_shard = await cache.get(1, repository)
+
+        # THEN
+        assert user_shard == ("b", None)
+        assert repository.user_shards == {1: ("b", None)}
+
+    @pytest.mark.asyncio
+    async def test_get_is_cached_until_invalidated(self, shards):
+        # GIVEN
+        cache = shard_map.ShardMap(ttl=60, maxsize=2)
+        repository = FakeUserShardRepository({1: ("a", None)})
+        await cache.get(1, repository)
+        repository.user_shards[1] = ("a", "b")
+
+        # WHEN
+        cached = await cache.get(1, repository)
+        cache.invalidate(1)
+        reloaded = await cache.get(1, repository)
+
+        # THEN
+        assert cached == ("a", None)
+        assert reloaded == ("a", "b")
+        assert repository.gets == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_reloaded(self, shards):
+        # GIVEN
+        cache = shard_map.ShardMap(ttl=0, maxsize=2)
+        repository = FakeUserShardRepository({1: ("a", None)})
+        await cache.get(1, repository)
+
+        # WHEN
+        await cache.get(1, repository)
+
+        # THEN
+        assert repository.gets == 2
+
+
+class FakeShardSession:
+    """Session on a shard holding the TodoRepos of `todo_repo_ids`"""
+
+    def __init__(self, shard: str, todo_repo_ids: set[int], queried: list[str]):
+        self.shard = shard
+        self.todo_repo_ids = todo_repo_ids
+        self.queried = queried
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def execute(self, statement):
+        self.queried.append(self.shard)
+        todo_repo_id = statement.compile().params["id_1"]
+        return FakeResult(todo_repo_id if todo_repo_id in self.todo_repo_ids else None)
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class TestTodoRepoSessions:
+    @pytest.fixture
+    def queried(self, shards, monkeypatch):
+        queried = []
+        todo_repo_ids = dict(a={129}, b=set())
+        # Unit tests run without mappers
+        todo_repos = table("todo_repos", column("id"))
+        monkeypatch.setattr(sharding, "todo_models", types.SimpleNamespace(TodoRepo=todo_repos.c))
+        monkeypatch.setattr(sharding, "get_shard_engine", lambda shard: shard)
+        monkeypatch.setattr(
+            sharding, "async_session_factory", lambda bind: FakeShardSession(bind, todo_repo_ids[bind], queried)
+        )
+        return queried
+
+    @pytest.mark.asyncio
+    async def test_open_finds_todo_repo_of_moved_user(self, queried):
+        # GIVEN
+        todo_repo_sessions = sharding.TodoRepoSessions(session=None)
+
+        # WHEN
+        async with todo_repo_sessions.open(129) as session:
+            shard = session.shard
+
+        # THEN
+        assert queried == ["b", "a"]
+        assert shard == "a"
+
+
+class FakeShardTodoRepoRepository:
+    """TodoRepos of one shard, by id"""
+
+    def __init__(self, ids: list[int]):
+        self.ids = sorted(ids, reverse=True)
+
+    async def get_todo_repo_records(self, cursor, page_size):
+        now = datetime.datetime.now()
+        return [
+            TodoRepoRecord(id, now, now, f"repo {id}", "", 1, False, 1)
+            for id in self.ids
+            if not cursor or id < cursor
+        ][:page_size]
+
+    async def get_prev_todo_repo_ids_and_next_todo_repo_ids(self, cursor, next_cursor, page_size):
+        prev_ids = [types.SimpleNamespace(id=id) for id in reversed(self.ids) if cursor and id > cursor][:page_size]
+        next_ids = [types.SimpleNamespace(id=id) for id in self.ids if next_cursor and id < next_cursor][:1]
+        return prev_ids, next_ids
+
+    async def get_estimated_todo_repo_count(self):
+        return len(self.ids)
+
+
+class TestGetAllTodoRepos:
+    @pytest.mark.asyncio
+    async def test_pages_span_every_shard(self):
+        # GIVEN the ids of shard a and b interleave, and 7 is on both while its user is moved
+        repositories = [FakeShardTodoRepoRepository([1, 3, 5, 7]), FakeShardTodoRepoRepository([2, 4, 6, 7, 8])]
+
+        # WHEN
+        first = await TodoRepoService.get_all_todo_repos(
+            cursor=None, page_size=3, include_total=True, repositories=repositories
+        )
+        second = await TodoRepoService.get_all_todo_repos(
+            cursor=first["paging"]["cursors"]["next"], page_size=3, repositories=repositories
+        )
+
+        # THEN
+        assert [item["id"] for item in first["data"]] == [8, 7, 6]
+        assert first["paging"]["total"] == 9
+        assert [item["id"] for item in second["data"]] == [5, 4, 3]
+        assert second["paging"]["has_prev"] is True
+        assert second["paging"]["has_next"] is True
@@ -0,0 +1,111 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.adapters.slow_queries import SlowQueryLog, get_parameter_shape, normalize_statement
+
+
+class TestNormalization:
+    def test_normalize_statement(self):
+        # GIVEN
+        statement = """
+            SELECT * FROM daily_todo_tasks
+            WHERE id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER) AND content = 'it''s' LIMIT 10
+        """
+
+        # WHEN
+        normalized = normalize_statement(statement)
+
+        # THEN
+        assert normalized == "SELECT * FROM daily_todo_tasks WHERE id IN (?::INTEGER, ...) AND content = ? LIMIT ?"
+
+    def test_normalize_statement_collapses_values(self):
+        # WHEN
+        normalized = normalize_statement("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)")
+
+        # THEN
+        assert normalized == "INSERT INTO t (a, b) VALUES (?, ...), ..."
+
+    def test_get_parameter_shape(self):
+        # WHEN
+        shape = get_parameter_shape((1, "a", None, [1, 2, 3]))
+        named_shape = get_parameter_shape(dict(id=1, title="a"))
+        many_shape = get_parameter_shape([(1, "a"), (2, "b")], executemany=True)
+
+        # THEN
+        assert shape == "(int, str, null, list[3])"
+        assert named_shape == "(id: int, title: str)"
+        assert many_shape == "2 x (int, str)"
+
+
+class TestSlowQueryLog:
+    def test_record_aggregates_by_normalized_statement(self):
+        # GIVEN
+        log = SlowQueryLog(threshold=0, maxsize=2, max_shapes=1, explain=False)
+
+        # WHEN
+        first = log.record("SELECT * FROM t WHERE id = 1", 0.2, "()", "a")
+        again = log.record("SELECT * FROM t WHERE id = 2", 0.4, "()", "b")
+
+        # THEN
+        [entry] = log.get_entries()
+        assert (first, again) == (True, False)
+        assert entry.statement == "SELECT * FROM t WHERE id = ?"
+        assert (entry.count, entry.total_time, entry.max_time) == (2, pytest.approx(0.6), 0.4)
+        assert entry.call_sites == {"a": 1, "(other)": 1}
+
+    def test_least_recently_slow_statement_is_evicted(self):
+        # GIVEN
+        log = SlowQueryLog(threshold=0, maxsize=2, max_shapes=1, explain=False)
+        for statement in ("SELECT a FROM t", "SELECT b FROM t", "SELECT a FROM t", "SELECT c FROM t"):
+            log.record(statement, 0.1, "()", None)
+
+        # WHEN
+        statements = {entry.statement for entry in log.get_entries()}
+
+        # THEN
+        assert statements == {"SELECT a FROM t", "SELECT c FROM t"}
+
+    @pytest.mark.asyncio
+    async def test_install_records_call_site_and_plan(self):
+        # GIVEN
+        log = SlowQueryLog(threshold=0, maxsize=10, max_shapes=10, explain=True)
+        engine = create_async_engine("sqlite+aiosqlite://")
+        log.install(engine)
+
+        # WHEN
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+                await conn.execute(text("SELECT * FROM t WHERE id = :id"), dict(id=1))
+        finally:
+            await engine.dispose()
+
+        # THEN
+        [entry] = [e for e in log.get_entries() if e.statement.startswith("SELECT")]
+        assert entry.parameter_shapes == {"(int)": 1}
+        [call_site] = entry.call_sites
+        assert call_site.startswith("TestSlowQueryLog.test_install_records_call_site_and_plan (tests/unit/")
+        assert "USING INTEGER PRIMARY KEY" in entry.explain
+
+    @pytest.mark.asyncio
+    async def test_failed_statement_is_not_left_running(self):
+        # GIVEN
+        log = SlowQueryLog(threshold=0, maxsize=10, max_shapes=10, explain=False)
+        engine = create_async_engine("sqlite+aiosqlite://")
+        log.install(engine)
+
+        # WHEN
+        try:
+            async with engine.connect() as conn:
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing"))
+                started = conn.sync_connection.info["slow_query_started"]
+                assert started == []
+                await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+
+        # THEN
+        assert [e.statement for e in log.get_entries()] == ["SELECT ?"]
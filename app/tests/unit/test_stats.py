@@ -0,0 +1,91 @@
+import datetime
+
+from app.adapters.todo import stats
+
+
+class TestPeriods:
+    def test_get_period_start(self):
+        # GIVEN
+        date = datetime.date(2026, 10, 18)  # Sunday
+
+        # WHEN
+        week_start = stats.get_period_start(date, "week")
+        month_start = stats.get_period_start(date, "month")
+
+        # THEN
+        assert week_start == datetime.date(2026, 10, 12)
+        assert month_start == datetime.date(2026, 10, 1)
+
+    def test_iter_period_starts(self):
+        # GIVEN
+        since, until = datetime.date(2026, 11, 19), datetime.date(2027, 1, 1)
+
+        # WHEN
+        months = list(stats.iter_period_starts(since, until, "month"))
+        weeks = list(stats.iter_period_starts(since, datetime.date(2026, 11, 30), "week"))
+
+        # THEN
+        assert months == [datetime.date(2026, 11, 1), datetime.date(2026, 12, 1), datetime.date(2027, 1, 1)]
+        assert weeks == [datetime.date(2026, 11, 16), datetime.date(2026, 11, 23), datetime.date(2026, 11, 30)]
+
+
+class TestTaskStatsDelta:
+    def test_add(self):
+        # GIVEN
+        delta = stats.TaskStatsDelta()
+
+        # WHEN
+        delta.add(1, datetime.date(2026, 10, 19), 1, 0)
+        delta.add(1, datetime.date(2026, 10, 20), 1, 1)
+        delta.add(1, datetime.date(2026, 10, 20), 0, -1)
+
+        # THEN
+        assert delta
+        assert sorted((v["period"], v["start"], v["total"], v["completed"]) for v in delta.get_period_values()) == [
+            ("month", datetime.date(2026, 10, 1), 2, 0),
+            ("week", datetime.date(2026, 10, 19), 2, 0),
+        ]
+        assert sorted((v["weekday"], v["total"], v["completed"]) for v in delta.get_weekday_values()) == [
+            (0, 1, 0),
+            (1, 1, 0),
+        ]
+
+    def test_cancelled_changes_are_empty(self):
+        # GIVEN
+        delta = stats.TaskStatsDelta()
+
+        # WHEN
+        delta.add(1, datetime.date(2026, 10, 19), 0, 1)
+        delta.add(1, datetime.date(2026, 10, 19), 0, -1)
+
+        # THEN
+        assert not delta
+        assert delta.get_period_values() == []
+        assert delta.get_weekday_values() == []
+
+
+class TestTaskVersions:
+    def test_bump(self):
+        # GIVEN
+        versions = stats.TaskVersions(maxsize=2)
+        before = versions.get((1, 2026))
+
+        # WHEN
+        versions.bump((1, 2026))
+
+        # THEN
+        assert versions.get((1, 2026)) > before
+        assert versions.get((2, 2026)) == before
+
+    def test_evicted_key_does_not_go_back_to_an_older_version(self):
+        # GIVEN
+        versions = stats.TaskVersions(maxsize=1)
+        versions.bump((1, 2026))
+        seen = versions.get((1, 2026))
+
+        # WHEN
+        versions.bump((1, 2026))
+        versions.bump((2, 2026))
+
+        # THEN
+        assert versions.get((1, 2026)) != seen
@@ -0,0 +1,72 @@
+import datetime
+from collections import namedtuple
+import pytest
+
+from app.utils.bloom_filter import BloomFilter
+from app.utils.pagination import CursorPagination, encode_cursor, decode_cursor
+
+
+class TestBloomFilter:
+    def test_no_false_negatives(self):
+        # GIVEN
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+
+        # WHEN
+        for item in items:
+            bloom_filter.add(item)
+
+        # THEN
+        assert all(item in bloom_filter for item in items)
+        assert bloom_filter.is_saturated
+
+    def test_false_positive_rate(self):
+        # GIVEN
+        bloom_filter = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom_filter.add(f"jti-{i}")
+
+        # WHEN
+        false_positives = sum(f"other-{i}" in bloom_filter for i in range(10000))
+
+        # THEN
+        assert false_positives < 10000 * 0.03
+
+
+class TestCursorPagination:
+    def test_encode_and_decode_cursor(self):
+        # GIVEN
+        values = (datetime.date(2026, 10, 19), 42)
+
+        # WHEN
+        cursor = encode_cursor(values)
+
+        # THEN
+        assert isinstance(cursor, str)
+        assert "=" not in cursor
+        assert decode_cursor(cursor, (datetime.date, int)) == values
+
+    @pytest.mark.parametrize("cursor", ["garbage!!", encode_cursor((1,)), encode_cursor(("not-a-date", 1))])
+    def test_decode_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, (datetime.date, int))
+
+    def test_composite_key(self):
+        # GIVEN
+        Item = namedtuple("Item", ["date", "id"])
+        curr_items = [Item(datetime.date(2026, 10, 19), 3), Item(datetime.date(2026, 10, 18), 2)]
+        prev_items = [Item(datetime.date(2026, 10, 20), 4), Item(datetime.date(2026, 10, 21), 5)]
+        cursor = (datetime.date(2026, 10, 20), 4)
+
+        # WHEN
+        pagination = CursorPagination(
+            cursor=cursor, page_size=2, curr_items=curr_items, key=lambda i: (i.date, i.id), encode=encode_cursor
+        )
+        paging = pagination._get_paging(prev_items=prev_items, next_items=[Item(datetime.date(2026, 10, 17), 1)])
+
+        # THEN
+        assert pagination.next_cursor == (datetime.date(2026, 10, 18), 2)
+        assert decode_cursor(paging["cursors"]["next"], (datetime.date, int)) == (datetime.date(2026, 10, 18), 2)
+        assert decode_cursor(paging["cursors"]["prev"], (datetime.date, int)) == (datetime.date(2026, 10, 21), 5)
+        assert paging["has_prev"] is True
+        assert paging["has_next"] is True
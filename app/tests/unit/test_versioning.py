@@ -0,0 +1,18 @@
+import pytest
+
+from app.entrypoints.fastapi.versioning import parse_if_match
+
+
+class TestParseIfMatch:
+    def test_parse_if_match(self):
+        # WHEN
+        versions = [parse_if_match(v) for v in ('"3"', 'W/"3"', "3", " * ")]
+
+        # THEN
+        assert versions == [3, 3, 3, None]
+
+    def test_parse_if_match_if_it_is_not_a_version(self):
+        # WHEN
+        with pytest.raises(ValueError):
+            # THEN
+            parse_if_match('"3", "4"')
@@ -0,0 +1,52 @@
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(module: str) -> list[ImportRecord]:
+    """Import `module` in a fresh interpreter with `-X importtime` and parse its report"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    records = []
+    for line in proc.stderr.splitlines():
+        if (match := IMPORT_TIME_LINE.match(line)) is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        records.append(ImportRecord(name, int(self_us), int(cumulative_us), len(indent) // 2))
+
+    return records
+
+
+def get_total_ms(records: list[ImportRecord], module: str) -> float:
+    return next(r.cumulative_us for r in records if r.module == module and r.depth == 0) / 1000
+
+
+def format_report(records: list[ImportRecord], top: int = 20) -> str:
+    lines = [f"{'cumulative(ms)':>15} {'self(ms)':>10}  module"]
+    for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        lines.append(f"{r.cumulative_us / 1000:>15.1f} {r.self_us / 1000:>10.1f}  {r.module}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "app.main"
+    import_records = profile_imports(target)
+    print(f"import {target}: {get_total_ms(import_records, target):.1f}ms")
+    print(format_report(import_records))
@@ -1,20 +1,58 @@
-from typing import TypeVar, Sequence
+import base64
+import datetime
+import json
+from operator import attrgetter
+from typing import Any, Callable, TypeVar, Sequence
 
-from app.domain.base_models import Base
 
+T = TypeVar("T")
 
-T = TypeVar("T", bound=Base)
+
+def encode_cursor(values: Sequence) -> str:
+    """Opaque, URL-safe cursor for a composite sort key"""
+    payload = [v.isoformat() if isinstance(v, (datetime.date, datetime.datetime)) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """Inverse of `encode_cursor`; raises ValueError for a cursor that wasn't issued for `types`"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Malformed cursor {cursor!r}") from e
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise ValueError(f"Malformed cursor {cursor!r}")
+    try:
+        return tuple(
+            t.fromisoformat(v) if t in (datetime.date, datetime.datetime) else t(v) for t, v in zip(types, payload)
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Malformed cursor {cursor!r}") from e
 
 
 class CursorPagination:
-    def __init__(self, cursor: int | None, page_size: int, curr_items: Sequence[T]):
+    """Keyset pagination over items sorted by `key`
+
+    `key` may return a tuple for composite sort keys; `encode` turns the key into the cursor handed to clients.
+    """
+
+    def __init__(
+        self,
+        cursor: Any | None,
+        page_size: int,
+        curr_items: Sequence[T],
+        key: Callable[[T], Any] = attrgetter("id"),
+        encode: Callable[[Any], Any] | None = None,
+    ):
         self.cursor = cursor
         self.page_size = page_size
         self.curr_items = curr_items
+        self.key = key
+        self.encode = encode
         self.prev_items = []
         self.next_items = []
         self.__prev_cursor = None
-        self.__next_cursor = self.curr_items[-1].id if len(self.curr_items) == self.page_size else None
+        self.__next_cursor = self.key(self.curr_items[-1]) if len(self.curr_items) == self.page_size else None
         self.__has_prev = False
         self.__has_next = False
 
@@ -24,7 +62,7 @@ class CursorPagination:
 
     def _set_prev_cursor(self):
         if self.cursor:
-            self.__prev_cursor = self.prev_items[-1].id if len(self.prev_items) == self.page_size else None
+            self.__prev_cursor = self.key(self.prev_items[-1]) if len(self.prev_items) == self.page_size else None
         else:
             self.__prev_cursor = None
     
@@ -41,6 +79,9 @@ class CursorPagination:
     def _set_has_next(self):
         self.__has_next = bool(self.next_items) if self.__next_cursor else False
 
+    def _encode(self, cursor):
+        return self.encode(cursor) if self.encode and cursor is not None else cursor
+
     def _get_paging(self, prev_items: Sequence[T], next_items: Sequence[T]):
         self.prev_items = prev_items
         self.next_items = next_items
@@ -50,7 +91,7 @@ class CursorPagination:
         self._set_has_next()
 
         return dict(
-            cursors=dict(prev=self.__prev_cursor, next=self.__next_cursor),
+            cursors=dict(prev=self._encode(self.__prev_cursor), next=self._encode(self.__next_cursor)),
             has_prev=self.__has_prev,
             has_next=self.__has_next,
         )
@@ -9,6 +9,10 @@ from alembic import context
 
 from app.adapters.auth.persistent_orm import mapper_registry as auth  # NEW
 from app.adapters.todo.persistent_orm import mapper_registry as todo  # NEW
+from app.adapters.job.persistent_orm import mapper_registry as job
+from app.adapters.shard.persistent_orm import mapper_registry as shard
+from app.adapters.idempotency.persistent_orm import mapper_registry as idempotency
+from app.adapters.todo.partitioning import DAILY_TODO_TASKS_PARTITION_SPEC
 from app import settings
 
 # this is the Alembic Config object, which provides
@@ -24,7 +28,17 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = [auth.metadata, todo.metadata]  # UPDATED
+target_metadata = [auth.metadata, todo.metadata, job.metadata, shard.metadata, idempotency.metadata]  # UPDATED
+
+PARTITION_SPECS = [DAILY_TODO_TASKS_PARTITION_SPEC]
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Partitions are managed by app.entrypoints.jobs.partitions, not by autogenerate
+    if type_ == "table" and reflected and any(spec.is_partition(name) for spec in PARTITION_SPECS):
+        return False
+    return True
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -48,6 +62,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -57,7 +72,7 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
     with context.begin_transaction():
         context.run_migrations()
@@ -70,7 +85,11 @@ async def run_async_migrations() -> None:
     """
 
     configuration = config.get_section(config.config_ini_section, {})
-    configuration["sqlalchemy.url"] = settings.POSTGRES_SETTINGS.get_dsn()
+    # `alembic -x shard=NAME upgrade head` migrates a shard of SHARD_DSNS instead of the main database
+    shard = context.get_x_argument(as_dictionary=True).get("shard")
+    configuration["sqlalchemy.url"] = (
+        settings.SHARD_SETTINGS.SHARD_DSNS[shard] if shard else settings.POSTGRES_SETTINGS.get_dsn()
+    )
     connectable = async_engine_from_config(
         configuration,
         prefix="sqlalchemy.",
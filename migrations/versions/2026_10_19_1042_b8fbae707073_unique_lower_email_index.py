@@ -0,0 +1,27 @@
+"""Unique lower(email) index on users
+
+Revision ID: b8fbae707073
+Revises: a8f35ced7b45
+Create Date: 2026-10-19 10:42:37.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8fbae707073'
+down_revision = 'a8f35ced7b45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fails if existing emails collide case-insensitively; those accounts must be merged first
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    op.drop_index('ix_users_email', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_email', 'users', ['email'], unique=False)
+    op.drop_index('ix_users_email_lower', table_name='users')
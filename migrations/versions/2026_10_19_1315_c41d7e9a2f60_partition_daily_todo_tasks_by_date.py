@@ -0,0 +1,92 @@
+"""Partition daily_todo_tasks by date
+
+Revision ID: c41d7e9a2f60
+Revises: b8fbae707073
+Create Date: 2026-10-19 13:15:47.902114
+
+"""
+import datetime
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d7e9a2f60'
+down_revision = 'b8fbae707073'
+branch_labels = None
+depends_on = None
+
+COLUMNS = 'id, created_at, updated_at, content, is_completed, todo_repo_id, date'
+# Monthly partitions named daily_todo_tasks_pYYYY_MM; the partitions job creates the later ones
+PARTITIONS_AHEAD = 3
+
+
+def _get_next_month(date: datetime.date) -> datetime.date:
+    return datetime.date(date.year + date.month // 12, date.month % 12 + 1, 1)
+
+
+def _create_table(name: str, **kw) -> None:
+    # The id sequence of the original SERIAL column is shared so that ids keep increasing across the swap
+    op.create_table(name,
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('daily_todo_tasks_id_seq')"), nullable=False),
+    sa.Column('created_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', postgresql.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('is_completed', sa.Boolean(), nullable=False),
+    sa.Column('todo_repo_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    **kw,
+    )
+
+
+def upgrade() -> None:
+    op.rename_table('daily_todo_tasks', 'daily_todo_tasks_unpartitioned')
+    op.drop_index('fk_daily_todo_task_daily_todo', table_name='daily_todo_tasks_unpartitioned')
+    op.execute('ALTER TABLE daily_todo_tasks_unpartitioned RENAME CONSTRAINT daily_todo_tasks_pkey TO daily_todo_tasks_unpartitioned_pkey')
+    op.execute('ALTER SEQUENCE daily_todo_tasks_id_seq OWNED BY NONE')
+
+    _create_table('daily_todo_tasks', postgresql_partition_by='RANGE (date)')
+    op.create_primary_key('daily_todo_tasks_pkey', 'daily_todo_tasks', ['id', 'date'])
+    op.execute('ALTER SEQUENCE daily_todo_tasks_id_seq OWNED BY daily_todo_tasks.id')
+
+    # Partitions for every existing interval plus the ones ahead, so that no row lands in the default partition
+    today = datetime.date.today()
+    since = op.get_bind().execute(sa.text('SELECT min(date) FROM daily_todo_tasks_unpartitioned')).scalar() or today
+    until = today
+    for _ in range(PARTITIONS_AHEAD):
+        until = _get_next_month(until)
+    op.execute('CREATE TABLE IF NOT EXISTS daily_todo_tasks_default PARTITION OF daily_todo_tasks DEFAULT')
+    start = datetime.date(since.year, since.month, 1)
+    while start <= until:
+        end = _get_next_month(start)
+        name = f'daily_todo_tasks_p{start.year}_{start.month:02d}'
+        op.execute(
+            f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF daily_todo_tasks '
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+    op.execute(f'INSERT INTO daily_todo_tasks ({COLUMNS}) SELECT {COLUMNS} FROM daily_todo_tasks_unpartitioned')
+    op.drop_table('daily_todo_tasks_unpartitioned')
+
+    op.create_foreign_key('fk_daily_todo_task_daily_todo', 'daily_todo_tasks', 'daily_todos', ['todo_repo_id', 'date'], ['todo_repo_id', 'date'])
+    op.create_index('fk_daily_todo_task_daily_todo', 'daily_todo_tasks', ['todo_repo_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.rename_table('daily_todo_tasks', 'daily_todo_tasks_partitioned')
+    op.drop_index('fk_daily_todo_task_daily_todo', table_name='daily_todo_tasks_partitioned')
+    op.execute('ALTER TABLE daily_todo_tasks_partitioned RENAME CONSTRAINT daily_todo_tasks_pkey TO daily_todo_tasks_partitioned_pkey')
+    op.execute('ALTER SEQUENCE daily_todo_tasks_id_seq OWNED BY NONE')
+
+    _create_table('daily_todo_tasks', sa.PrimaryKeyConstraint('id'))
+    op.execute('ALTER SEQUENCE daily_todo_tasks_id_seq OWNED BY daily_todo_tasks.id')
+
+    op.execute(f'INSERT INTO daily_todo_tasks ({COLUMNS}) SELECT {COLUMNS} FROM daily_todo_tasks_partitioned')
+    # Dropping the parent drops every attached partition; detached ones are left to the archive
+    op.drop_table('daily_todo_tasks_partitioned')
+
+    op.create_foreign_key('fk_daily_todo_task_daily_todo', 'daily_todo_tasks', 'daily_todos', ['todo_repo_id', 'date'], ['todo_repo_id', 'date'])
+    op.create_index('fk_daily_todo_task_daily_todo', 'daily_todo_tasks', ['todo_repo_id', 'date'], unique=False)
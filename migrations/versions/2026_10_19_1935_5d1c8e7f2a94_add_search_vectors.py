@@ -0,0 +1,33 @@
+"""Add search vectors
+
+Revision ID: 5d1c8e7f2a94
+Revises: 0b6e2d94a7c1
+Create Date: 2026-10-19 19:35:12.640281
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5d1c8e7f2a94'
+down_revision = '0b6e2d94a7c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Adding a stored generated column rewrites the table; on daily_todo_tasks it cascades to every partition,
+    # and so does the index, which is created on each partition and attached to the parent
+    op.add_column('todo_repos', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', description), 'B')", persisted=True), nullable=True))
+    op.create_index('ix_todo_repos_search_vector', 'todo_repos', ['search_vector'], unique=False, postgresql_using='gin')
+    op.add_column('daily_todo_tasks', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("to_tsvector('simple', content)", persisted=True), nullable=True))
+    op.create_index('ix_daily_todo_tasks_search_vector', 'daily_todo_tasks', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_daily_todo_tasks_search_vector', table_name='daily_todo_tasks', postgresql_using='gin')
+    op.drop_column('daily_todo_tasks', 'search_vector')
+    op.drop_index('ix_todo_repos_search_vector', table_name='todo_repos', postgresql_using='gin')
+    op.drop_column('todo_repos', 'search_vector')
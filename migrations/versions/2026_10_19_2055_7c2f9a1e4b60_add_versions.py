@@ -0,0 +1,27 @@
+"""Add versions
+
+Revision ID: 7c2f9a1e4b60
+Revises: 9e4a7b3c1d58
+Create Date: 2026-10-19 20:55:31.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2f9a1e4b60'
+down_revision = '9e4a7b3c1d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so existing rows aren't rewritten
+    op.add_column('todo_repos', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('daily_todo_tasks', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('daily_todo_tasks', 'version')
+    op.drop_column('todo_repos', 'version')